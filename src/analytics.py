@@ -0,0 +1,271 @@
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("Vote analytics need NumPy: pip install 'llm-arena[analytics]'") from e
+
+from .models import RoundResult
+from .round_log import RoundLog
+
+ELO_START = 1500.0
+ELO_K = 32.0
+
+# Pseudo-wins added both ways between every compared pair, so Bradley-Terry
+# strengths stay finite for agents that never (or always) win
+BT_PRIOR = 0.5
+
+
+class VoteAnalytics:
+    """Vote counts indexed voter × votee × round, plus running aggregates.
+
+    Votes are kept as three parallel index arrays (a sparse tensor); the
+    voter × votee totals, pairwise wins and Elo ratings are updated as each
+    round is added, so following a growing log costs one round at a time.
+    A vote for w in a round counts as w beating every other candidate on
+    the voter's ballot.
+    """
+
+    def __init__(self) -> None:
+        self.agent_ids: list[str] = []
+        self.names: list[str] = []
+        self.models: list[str] = []
+        self._index: dict[str, int] = {}
+        self.round_numbers: list[int] = []
+
+        self._capacity = 0
+        self.votes = np.zeros((0, 0), dtype=np.int64)  # voter × votee totals
+        self.wins = np.zeros((0, 0), dtype=np.float64)  # i chosen over j
+        self.appearances = np.zeros(0, dtype=np.int64)  # rounds answered
+        self.elo = np.zeros(0, dtype=np.float64)
+
+        # Sparse tensor: one entry per vote
+        self._round_idx: list[np.ndarray] = []
+        self._voter_idx: list[np.ndarray] = []
+        self._votee_idx: list[np.ndarray] = []
+
+    @classmethod
+    def from_log(cls, log: RoundLog | None = None) -> "VoteAnalytics":
+        """Build from every round in the log (the run's own log by default)."""
+        analytics = cls()
+        analytics.update(log or RoundLog.open())
+        return analytics
+
+    def update(self, log: RoundLog) -> int:
+        """Add rounds logged since the last update. Returns how many were added."""
+        start = self.round_numbers[-1] + 1 if self.round_numbers else None
+        added = 0
+        for result in log.rounds(start=start):
+            self.add_round(result)
+            added += 1
+        return added
+
+    def add_round(self, result: RoundResult) -> None:
+        """Fold one round into the tensor and every running aggregate."""
+        for response in result.responses:
+            self._agent(response.agent_id, response.agent_name, response.model)
+        for vote in result.votes:
+            self._agent(vote.voter_id, vote.voter_name)
+            self._agent(vote.voted_for_id, vote.voted_for_name)
+
+        slot = len(self.round_numbers)
+        self.round_numbers.append(result.round_number)
+        participants = np.array([self._index[r.agent_id] for r in result.responses], dtype=np.int64)
+        self.appearances[participants] += 1
+        if not result.votes:
+            return
+
+        voters = np.array([self._index[v.voter_id] for v in result.votes], dtype=np.int64)
+        votees = np.array([self._index[v.voted_for_id] for v in result.votes], dtype=np.int64)
+        self._round_idx.append(np.full(len(voters), slot, dtype=np.int64))
+        self._voter_idx.append(voters)
+        self._votee_idx.append(votees)
+        np.add.at(self.votes, (voters, votees), 1)
+
+        # Work on the block of agents in this round only: each vote means the
+        # votee beat every other answer on the voter's ballot (every
+        # participant when the round has no ballots)
+        members = np.unique(np.concatenate([participants, voters]))
+        local_voters = np.searchsorted(members, voters)
+        local_votees = np.searchsorted(members, votees)
+        if result.ballots:
+            on_ballot = np.zeros((len(voters), len(members)))
+            for row, vote in enumerate(result.votes):
+                candidates = [self._index[c] for c in result.ballots.get(vote.voter_id, [])]
+                on_ballot[row, np.searchsorted(members, candidates)] = 1.0
+        else:
+            on_ballot = np.tile(np.isin(members, participants).astype(np.float64), (len(voters), 1))
+        on_ballot[np.arange(len(voters)), local_voters] = 0.0
+
+        round_wins = np.zeros((len(members), len(members)))
+        np.add.at(round_wins, local_votees, on_ballot)
+        np.fill_diagonal(round_wins, 0)
+
+        block = np.ix_(members, members)
+        self.wins[block] += round_wins
+        self.elo[members] += self._elo_delta(self.elo[members], round_wins, len(result.votes))
+
+    def tensor(self, start: int | None = None, stop: int | None = None) -> np.ndarray:
+        """Dense voter × votee × round counts for logged rounds in [start, stop)."""
+        rounds = np.array(self.round_numbers, dtype=np.int64)
+        keep = np.ones(len(rounds), dtype=bool)
+        if start is not None:
+            keep &= rounds >= start
+        if stop is not None:
+            keep &= rounds < stop
+        slots = np.flatnonzero(keep)
+
+        n = len(self.agent_ids)
+        dense = np.zeros((n, n, len(slots)), dtype=np.int32)
+        if self._round_idx:
+            round_idx, voters, votees = self._sparse()
+            position = np.full(len(rounds), -1, dtype=np.int64)
+            position[slots] = np.arange(len(slots))
+            selected = position[round_idx] >= 0
+            np.add.at(dense, (voters[selected], votees[selected], position[round_idx[selected]]), 1)
+        return dense
+
+    def received_by_round(self) -> np.ndarray:
+        """round × votee vote counts."""
+        n = len(self.agent_ids)
+        counts = np.zeros((len(self.round_numbers), n), dtype=np.int64)
+        if self._round_idx:
+            round_idx, _, votees = self._sparse()
+            np.add.at(counts, (round_idx, votees), 1)
+        return counts
+
+    def fitness(self) -> dict[str, float]:
+        """Votes received per round answered, by personality."""
+        n = len(self.agent_ids)
+        received = self.votes[:n, :n].sum(axis=0)
+        rate = received / np.maximum(self.appearances[:n], 1)
+        return dict(zip(self.agent_ids, rate.tolist()))
+
+    def model_fitness(self) -> dict[str, float]:
+        """Votes received per agent-round, pooled over every agent on a model."""
+        n = len(self.agent_ids)
+        models = sorted(set(self.models))
+        model_idx = np.array([models.index(m) for m in self.models], dtype=np.int64)
+        received = np.bincount(model_idx, weights=self.votes[:n, :n].sum(axis=0), minlength=len(models))
+        rounds = np.bincount(model_idx, weights=self.appearances[:n], minlength=len(models))
+        return dict(zip(models, (received / np.maximum(rounds, 1)).tolist()))
+
+    def reciprocity(self) -> float:
+        """Share of all votes that are matched by a vote back (0 = none, 1 = all mutual)."""
+        n = len(self.agent_ids)
+        votes = self.votes[:n, :n]
+        total = votes.sum()
+        return float(np.minimum(votes, votes.T).sum() / total) if total else 0.0
+
+    def blocs(self, threshold: float = 0.5) -> list[list[str]]:
+        """Groups linked by strong mutual voting, largest first.
+
+        Two agents are linked when each gives the other at least `threshold`
+        of all the votes they cast.
+        """
+        n = len(self.agent_ids)
+        votes = self.votes[:n, :n].astype(np.float64)
+        share = votes / np.maximum(votes.sum(axis=1, keepdims=True), 1)
+        linked = np.minimum(share, share.T) >= threshold
+        np.fill_diagonal(linked, False)
+
+        # Connected components of the link graph (few edges, so union-find is cheap)
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(*np.nonzero(np.triu(linked))):
+            parent[find(int(i))] = find(int(j))
+
+        groups: dict[int, list[str]] = {}
+        for i in np.flatnonzero(linked.any(axis=1)):
+            groups.setdefault(find(int(i)), []).append(self.agent_ids[i])
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def convergence(self) -> np.ndarray:
+        """Per round, the share of votes won by that round's top agent."""
+        counts = self.received_by_round()
+        totals = counts.sum(axis=1)
+        return np.where(totals > 0, counts.max(axis=1, initial=0) / np.maximum(totals, 1), 0.0)
+
+    def bradley_terry(self, iterations: int = 200, tol: float = 1e-8) -> dict[str, float]:
+        """Bradley-Terry strengths from pairwise wins, on an Elo-like scale.
+
+        Fitted with the MM algorithm (Hunter, 2004), all agents updated at once.
+        """
+        n = len(self.agent_ids)
+        if n == 0:
+            return {}
+        wins = self.wins[:n, :n]
+        compared = (wins + wins.T) > 0
+        wins = wins + BT_PRIOR * compared
+        games = wins + wins.T
+        total_wins = wins.sum(axis=1)
+
+        strength = np.ones(n)
+        for _ in range(iterations):
+            denom = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+            updated = np.where(denom > 0, total_wins / np.maximum(denom, 1e-12), strength)
+            updated /= np.exp(np.log(np.maximum(updated, 1e-12)).mean())
+            done = np.abs(updated - strength).max() < tol
+            strength = updated
+            if done:
+                break
+
+        ratings = ELO_START + 400 * np.log10(np.maximum(strength, 1e-12))
+        return dict(zip(self.agent_ids, ratings.tolist()))
+
+    def elo_ratings(self) -> dict[str, float]:
+        """Elo ratings, updated round by round as rounds were added."""
+        return dict(zip(self.agent_ids, self.elo[: len(self.agent_ids)].tolist()))
+
+    @staticmethod
+    def _elo_delta(ratings: np.ndarray, round_wins: np.ndarray, n_votes: int) -> np.ndarray:
+        """One simultaneous Elo update over all of a round's pairwise outcomes."""
+        games = round_wins + round_wins.T
+        expected = 1 / (1 + 10 ** ((ratings[None, :] - ratings[:, None]) / 400))
+        score = (round_wins - games * expected).sum(axis=1)
+        return ELO_K * score / max(n_votes, 1)
+
+    def _sparse(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The sparse tensor as three flat arrays, concatenated once per new round."""
+        if len(self._round_idx) > 1:
+            self._round_idx = [np.concatenate(self._round_idx)]
+            self._voter_idx = [np.concatenate(self._voter_idx)]
+            self._votee_idx = [np.concatenate(self._votee_idx)]
+        return self._round_idx[0], self._voter_idx[0], self._votee_idx[0]
+
+    def _agent(self, agent_id: str, name: str, model: str | None = None) -> int:
+        if agent_id in self._index:
+            i = self._index[agent_id]
+            if model is not None:
+                self.models[i] = model
+            return i
+        i = len(self.agent_ids)
+        self._index[agent_id] = i
+        self.agent_ids.append(agent_id)
+        self.names.append(name)
+        self.models.append(model or "unknown")
+        if i >= self._capacity:
+            self._grow(max(8, 2 * self._capacity))
+        self.elo[i] = ELO_START
+        return i
+
+    def _grow(self, capacity: int) -> None:
+        """Resize the per-agent arrays, doubling so growth stays amortised O(1)."""
+        old = self._capacity
+
+        def grown(array: np.ndarray) -> np.ndarray:
+            shape = (capacity,) * array.ndim
+            bigger = np.zeros(shape, dtype=array.dtype)
+            bigger[(slice(0, old),) * array.ndim] = array
+            return bigger
+
+        self.votes = grown(self.votes)
+        self.wins = grown(self.wins)
+        self.appearances = grown(self.appearances)
+        self.elo = grown(self.elo)
+        self._capacity = capacity
+
@@ -0,0 +1,496 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Protocol
+
+import httpx
+import ollama
+
+# "ollama": a real Ollama server, or the stub server via OLLAMA_HOST
+# "fake": simulated in-process, no server needed
+BACKEND = os.environ.get("ARENA_BACKEND", "ollama")
+
+# Several Ollama servers, as "url=model,model;url" (no models: whatever the
+# server has installed). When set, the "ollama" backend becomes a PoolBackend.
+OLLAMA_ENDPOINTS = os.environ.get("OLLAMA_ENDPOINTS", "")
+
+# Pool routing: an endpoint that would have to load the model counts as this
+# many extra queued calls; an unreachable one is skipped for this long
+POOL_LOAD_PENALTY = 2
+POOL_RETRY_SECONDS = 30.0
+
+_FILLER = (
+    "the question turns on what we mean by it and whether the usual framing holds up "
+    "once we look at the incentives involved so any answer has to weigh competing views"
+).split()
+
+
+class LLMBackend(Protocol):
+    """What the arena needs from an LLM server. Chat results are plain dicts in Ollama's shape."""
+
+    async def chat(self, model: str, messages: list[dict], **kwargs) -> dict: ...
+
+    def chat_stream(self, model: str, messages: list[dict], **kwargs) -> AsyncIterator[dict]:
+        """Yield chunks whose message.content are successive pieces; the last has done=True and the metrics."""
+        ...
+
+    async def load(self, model: str, keep_alive: str | int | None = None, num_ctx: int | None = None) -> float:
+        """Load a model (with a context of num_ctx tokens, if given); return load seconds."""
+        ...
+
+    async def unload(self, model: str) -> None: ...
+
+    async def running_models(self) -> list[str]: ...
+
+    async def model_sizes(self) -> dict[str, int]: ...
+
+
+class OllamaBackend:
+    """Ollama's HTTP API via ollama.AsyncClient (honours OLLAMA_HOST when host is None)."""
+
+    def __init__(self, host: str | None = None) -> None:
+        self._client = ollama.AsyncClient(host=host)
+
+    async def chat(self, model: str, messages: list[dict], **kwargs) -> dict:
+        result = await self._client.chat(model=model, messages=messages, **kwargs)
+        return result.model_dump()
+
+    async def chat_stream(self, model: str, messages: list[dict], **kwargs) -> AsyncIterator[dict]:
+        stream = await self._client.chat(model=model, messages=messages, stream=True, **kwargs)
+        try:
+            async for chunk in stream:
+                yield chunk.model_dump()
+        finally:
+            # Closing the HTTP stream makes Ollama stop generating
+            await stream.aclose()
+
+    async def load(self, model: str, keep_alive: str | int | None = None, num_ctx: int | None = None) -> float:
+        """Load a model without generating anything; return load seconds."""
+        options = {"num_ctx": num_ctx} if num_ctx else None
+        result = await self._client.generate(model=model, keep_alive=keep_alive, options=options)
+        return (result.load_duration or 0) / 1e9
+
+    async def unload(self, model: str) -> None:
+        await self._client.generate(model=model, keep_alive=0)
+
+    async def running_models(self) -> list[str]:
+        result = await self._client.ps()
+        return [m.model for m in result.models]
+
+    async def model_sizes(self) -> dict[str, int]:
+        result = await self._client.list()
+        return {m.model: m.size or 0 for m in result.models}
+
+
+class FakeLLM:
+    """Deterministic simulation of an Ollama server, shared by FakeBackend and the stub server.
+
+    Output text is derived from a hash of the request, so identical requests
+    get identical answers. Timings follow the configured latency and token
+    rates, and loading a non-resident model costs load_seconds, as does a
+    call with another num_ctx than the model was loaded with (Ollama reloads
+    it). JSON-schema
+    formats are honoured, picking from `enum` where one is given.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        tokens_per_second: float = 200.0,
+        prompt_tokens_per_second: float = 2000.0,
+        response_tokens: tuple[int, int] = (40, 200),
+        load_seconds: float = 0.5,
+        failure_rate: float = 0.0,
+        model_sizes: dict[str, int] | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.response_tokens = response_tokens
+        self.load_seconds = load_seconds
+        self.failure_rate = failure_rate
+        self.model_sizes = model_sizes or {}
+        self.seed = seed
+        self.resident: list[str] = []
+        self.contexts: dict[str, int] = {}  # model -> num_ctx it was loaded with
+        self.calls = 0
+        self._failures = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def complete(
+        self,
+        model: str,
+        messages: list[dict],
+        format: dict | str | None = None,
+        options: dict | None = None,
+    ) -> tuple[dict, float]:
+        """Return an Ollama-shaped chat response and how long it should take, in seconds."""
+        with self._lock:
+            self.calls += 1
+            if self._failures.random() < self.failure_rate:
+                raise ollama.ResponseError("injected failure", 500)
+            load = self._touch(model, (options or {}).get("num_ctx"))
+
+        digest = hashlib.sha256(
+            json.dumps([self.seed, model, messages, format, options], sort_keys=True, default=str).encode()
+        ).digest()
+        rng = random.Random(digest)
+
+        limit = (options or {}).get("num_predict")
+        n_tokens = rng.randint(*self.response_tokens)
+        if limit is not None and limit > 0:
+            n_tokens = min(n_tokens, limit)
+
+        if isinstance(format, dict):
+            content = json.dumps(self._from_schema(format, rng, n_tokens))
+        elif format == "json":
+            content = json.dumps({"text": self._text(rng, n_tokens)})
+        else:
+            content = self._text(rng, n_tokens)
+
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        prompt_seconds = prompt_tokens / self.prompt_tokens_per_second
+        eval_seconds = n_tokens / self.tokens_per_second
+        total = self.latency + load + prompt_seconds + eval_seconds
+
+        response = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "done_reason": "length" if limit is not None and n_tokens == limit else "stop",
+            "total_duration": int(total * 1e9),
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": n_tokens,
+            "eval_duration": int(eval_seconds * 1e9),
+        }
+        return response, total
+
+    def pieces(self, response: dict, seconds: float) -> list[tuple[dict, float]]:
+        """Split a completed response into stream chunks, each with the delay before it.
+
+        The first chunk waits for latency, load and prompt evaluation; the
+        rest arrive at the token rate. The final chunk carries the metrics.
+        """
+        words = re.findall(r"\S+\s*", response["message"]["content"])
+        first_delay = seconds - response["eval_duration"] / 1e9
+        per_word = response["eval_duration"] / 1e9 / max(len(words), 1)
+
+        chunks = []
+        for i, word in enumerate(words):
+            chunk = {
+                "model": response["model"],
+                "message": {"role": "assistant", "content": word},
+                "done": False,
+            }
+            chunks.append((chunk, first_delay if i == 0 else per_word))
+        final = {**response, "message": {"role": "assistant", "content": ""}}
+        chunks.append((final, per_word if words else first_delay))
+        return chunks
+
+    def load(self, model: str, num_ctx: int | None = None) -> float:
+        """Make a model resident; return the simulated load time."""
+        with self._lock:
+            return self._touch(model, num_ctx)
+
+    def unload(self, model: str) -> None:
+        with self._lock:
+            if model in self.resident:
+                self.resident.remove(model)
+            self.contexts.pop(model, None)
+
+    def _touch(self, model: str, num_ctx: int | None = None) -> float:
+        """Mark a model most-recently used, (re)loading it if needed. Caller holds the lock.
+
+        A num_ctx of None takes whatever context the model has.
+        """
+        loaded = model in self.resident and (num_ctx is None or num_ctx == self.contexts.get(model))
+        if model in self.resident:
+            self.resident.remove(model)
+        self.resident.append(model)
+        if num_ctx is not None:
+            self.contexts[model] = num_ctx
+        return 0.0 if loaded else self.load_seconds
+
+    def _text(self, rng: random.Random, n_tokens: int) -> str:
+        return " ".join(rng.choice(_FILLER) for _ in range(n_tokens)).capitalize() + "."
+
+    def _from_schema(self, schema: dict, rng: random.Random, n_tokens: int):
+        """Build a value that validates against a (simple) JSON schema."""
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+        kind = schema.get("type", "string")
+        if kind == "object":
+            properties = schema.get("properties", {})
+            share = max(n_tokens // max(len(properties), 1), 1)
+            return {name: self._from_schema(sub, rng, share) for name, sub in properties.items()}
+        if kind == "array":
+            return [self._from_schema(schema.get("items", {}), rng, n_tokens) for _ in range(2)]
+        if kind == "integer":
+            return rng.randint(0, 10)
+        if kind == "number":
+            return rng.random()
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return self._text(rng, n_tokens)
+
+
+class FakeBackend:
+    """In-process backend that sleeps for FakeLLM's simulated timings."""
+
+    def __init__(self, llm: FakeLLM | None = None) -> None:
+        self.llm = llm or get_fake_llm()
+
+    async def chat(self, model: str, messages: list[dict], **kwargs) -> dict:
+        response, seconds = self.llm.complete(
+            model, messages, kwargs.get("format"), kwargs.get("options")
+        )
+        await asyncio.sleep(seconds)
+        return response
+
+    async def chat_stream(self, model: str, messages: list[dict], **kwargs) -> AsyncIterator[dict]:
+        response, seconds = self.llm.complete(
+            model, messages, kwargs.get("format"), kwargs.get("options")
+        )
+        for piece, delay in self.llm.pieces(response, seconds):
+            await asyncio.sleep(delay)
+            yield piece
+
+    async def load(self, model: str, keep_alive: str | int | None = None, num_ctx: int | None = None) -> float:
+        seconds = self.llm.load(model, num_ctx)
+        await asyncio.sleep(seconds)
+        return seconds
+
+    async def unload(self, model: str) -> None:
+        self.llm.unload(model)
+
+    async def running_models(self) -> list[str]:
+        return list(self.llm.resident)
+
+    async def model_sizes(self) -> dict[str, int]:
+        return dict(self.llm.model_sizes)
+
+
+class Endpoint:
+    """One Ollama server in a pool, with the routing and health state kept about it."""
+
+    def __init__(self, url: str, models: list[str] | None = None) -> None:
+        self.url = url.rstrip("/")
+        self.models = set(models) if models else None  # Configured; None = anything installed
+        self.installed: set[str] | None = None  # From /api/tags at the last health check
+        self.resident: set[str] = set()
+        self.in_flight = 0
+        self.healthy = True
+        self.down_until = 0.0  # monotonic time; skipped until then after a failure
+        self.checked = False
+
+    def serves(self, model: str) -> bool:
+        if self.models is not None:
+            return model in self.models
+        return self.installed is None or model in self.installed
+
+    def mark_down(self) -> None:
+        self.healthy = False
+        self.down_until = time.monotonic() + POOL_RETRY_SECONDS
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r}, in_flight={self.in_flight}, healthy={self.healthy})"
+
+
+def parse_endpoints(spec: str) -> list[Endpoint]:
+    """Parse "url=model,model;url" into endpoints."""
+    endpoints = []
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        url, _, models = part.partition("=")
+        endpoints.append(Endpoint(url.strip(), [m.strip() for m in models.split(",") if m.strip()]))
+    return endpoints
+
+
+class NoEndpointError(ConnectionError):
+    """No healthy endpoint in the pool serves the requested model."""
+
+
+# url -> Endpoint, so health and residency survive across rounds (each round
+# builds a new backend, since HTTP connections can't outlive its event loop)
+_endpoints: dict[str, Endpoint] = {}
+
+
+def configure_endpoints(endpoints: list[Endpoint]) -> None:
+    """Use these endpoints for every PoolBackend created from now on."""
+    _endpoints.clear()
+    _endpoints.update((e.url, e) for e in endpoints)
+
+
+class PoolBackend:
+    """Spreads calls over several Ollama servers.
+
+    Each call goes to a healthy endpoint serving the model, preferring one
+    where the model is already loaded and then the shortest queue. Each
+    endpoint keeps one HTTP client, so connections are reused for the life
+    of the backend. An endpoint that can't be reached is marked down,
+    probed again after POOL_RETRY_SECONDS, and the call fails over to the
+    next candidate.
+    """
+
+    def __init__(self, endpoints: list[Endpoint] | None = None) -> None:
+        self.endpoints = endpoints if endpoints is not None else list(_endpoints.values())
+        if not self.endpoints:
+            raise ValueError("PoolBackend needs at least one endpoint")
+        self._clients = {e.url: OllamaBackend(e.url) for e in self.endpoints}
+
+    async def check_health(self, endpoint: Endpoint) -> bool:
+        """Probe an endpoint, refreshing what it has installed and loaded."""
+        client = self._clients[endpoint.url]
+        try:
+            endpoint.installed = set(await client.model_sizes()) or None
+            endpoint.resident = set(await client.running_models())
+        except (ConnectionError, httpx.TransportError, ollama.ResponseError):
+            endpoint.mark_down()
+        else:
+            endpoint.healthy = True
+        endpoint.checked = True
+        return endpoint.healthy
+
+    async def _candidates(self, model: str) -> list[Endpoint]:
+        """Endpoints that can take a call for model, best first."""
+        now = time.monotonic()
+        stale = [
+            e for e in self.endpoints
+            if not e.checked or (not e.healthy and now >= e.down_until)
+        ]
+        if stale:
+            await asyncio.gather(*(self.check_health(e) for e in stale))
+
+        candidates = [e for e in self.endpoints if e.healthy and e.serves(model)]
+        if not candidates:
+            raise NoEndpointError(f"No healthy endpoint serves {model}")
+        return sorted(
+            candidates,
+            key=lambda e: e.in_flight + (0 if model in e.resident else POOL_LOAD_PENALTY),
+        )
+
+    @staticmethod
+    def _fail_over(endpoint: Endpoint, model: str, error: Exception) -> bool:
+        """Record why a call failed on endpoint; True if the next endpoint may take it."""
+        if isinstance(error, ollama.ResponseError):
+            if error.status_code != 404:
+                return False
+            # Model not installed there after all
+            if endpoint.installed is not None:
+                endpoint.installed.discard(model)
+            return True
+        endpoint.mark_down()
+        return True
+
+    async def _route(self, model: str, call):
+        """Run call(client) on the best endpoint, failing over on connection errors and 404s."""
+        for endpoint in await self._candidates(model):
+            endpoint.in_flight += 1
+            try:
+                result = await call(self._clients[endpoint.url])
+            except (ConnectionError, httpx.TransportError, ollama.ResponseError) as e:
+                if not self._fail_over(endpoint, model, e):
+                    raise
+                continue
+            finally:
+                endpoint.in_flight -= 1
+            endpoint.resident.add(model)
+            return result
+        raise NoEndpointError(f"Every endpoint serving {model} failed")
+
+    async def chat(self, model: str, messages: list[dict], **kwargs) -> dict:
+        return await self._route(model, lambda client: client.chat(model, messages, **kwargs))
+
+    async def chat_stream(self, model: str, messages: list[dict], **kwargs) -> AsyncIterator[dict]:
+        # Failover is only possible until the first chunk has been passed on
+        for endpoint in await self._candidates(model):
+            endpoint.in_flight += 1
+            stream = self._clients[endpoint.url].chat_stream(model, messages, **kwargs)
+            try:
+                try:
+                    first = await anext(stream)
+                except (ConnectionError, httpx.TransportError, ollama.ResponseError) as e:
+                    if not self._fail_over(endpoint, model, e):
+                        raise
+                    continue
+                endpoint.resident.add(model)
+                yield first
+                async for chunk in stream:
+                    yield chunk
+                return
+            finally:
+                endpoint.in_flight -= 1
+                await stream.aclose()
+        raise NoEndpointError(f"Every endpoint serving {model} failed")
+
+    async def load(self, model: str, keep_alive: str | int | None = None, num_ctx: int | None = None) -> float:
+        return await self._route(model, lambda client: client.load(model, keep_alive, num_ctx))
+
+    async def unload(self, model: str) -> None:
+        holders = [e for e in self.endpoints if e.healthy and model in e.resident]
+        for endpoint in holders:
+            endpoint.resident.discard(model)
+        await asyncio.gather(
+            *(self._clients[e.url].unload(model) for e in holders),
+            return_exceptions=True,
+        )
+
+    async def running_models(self) -> list[str]:
+        """Models resident on any healthy endpoint."""
+        for endpoint in self.endpoints:
+            if endpoint.healthy:
+                await self.check_health(endpoint)
+        return sorted(set().union(*(e.resident for e in self.endpoints if e.healthy)))
+
+    async def model_sizes(self) -> dict[str, int]:
+        sizes: dict[str, int] = {}
+        for endpoint in self.endpoints:
+            if not endpoint.healthy:
+                continue
+            try:
+                sizes.update(await self._clients[endpoint.url].model_sizes())
+            except (ConnectionError, httpx.TransportError):
+                endpoint.mark_down()
+        return sizes
+
+
+_fake_llm: FakeLLM | None = None
+
+
+def get_fake_llm() -> FakeLLM:
+    """Process-wide FakeLLM, so residency persists across rounds."""
+    global _fake_llm
+    if _fake_llm is None:
+        _fake_llm = FakeLLM()
+    return _fake_llm
+
+
+def configure_fake(**kwargs) -> FakeLLM:
+    """Replace the process-wide FakeLLM, e.g. FakeLLM(latency=..., failure_rate=...)."""
+    global _fake_llm
+    _fake_llm = FakeLLM(**kwargs)
+    return _fake_llm
+
+
+def make_backend() -> LLMBackend:
+    """Backend selected by BACKEND (or the ARENA_BACKEND environment variable).
+
+    With endpoints configured (OLLAMA_ENDPOINTS or configure_endpoints),
+    "ollama" means a pool over all of them.
+    """
+    if BACKEND == "fake":
+        return FakeBackend()
+    if BACKEND == "ollama":
+        if OLLAMA_ENDPOINTS and not _endpoints:
+            configure_endpoints(parse_endpoints(OLLAMA_ENDPOINTS))
+        return PoolBackend() if _endpoints else OllamaBackend()
+    raise ValueError(f"Unknown backend: {BACKEND}")
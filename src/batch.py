@@ -0,0 +1,200 @@
+import argparse
+import contextlib
+import multiprocessing
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from . import utils
+from .main import TOTAL_ROUNDS
+from .models import ArenaState
+from .persistence import load_state
+
+console = Console()
+
+# Calls in flight across all worker processes combined
+SHARED_MAX_CONCURRENT_CALLS = 8
+
+
+def load_questions(path: Path) -> list[str]:
+    """One question per non-empty line; lines starting with # are ignored."""
+    lines = [line.strip() for line in path.read_text().splitlines()]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _init_worker(slots) -> None:
+    """Runs once in each worker process before it takes arenas."""
+    from .ollama_client import set_shared_slots
+    set_shared_slots(slots)
+
+
+def use_arena_dir(arena_dir: Path, starters_dir: Path) -> None:
+    """Give an arena its own data/log directory (with the starters) and switch this process to it."""
+    data_dir = arena_dir / "data"
+    (data_dir / "personalities").mkdir(parents=True, exist_ok=True)
+    for starter in starters_dir.glob("starter-*.json"):
+        target = data_dir / "personalities" / starter.name
+        if not target.exists():
+            shutil.copy(starter, target)
+    utils.configure_paths(data_dir, arena_dir / "logs")
+
+
+def arena_summary(state: ArenaState) -> dict:
+    """Survivors and eliminations of a finished arena, as plain JSON-able data."""
+    return {
+        "rounds": state.current_round,
+        "survivors": [
+            {
+                "personality_id": a.personality_id,
+                "name": a.name,
+                "model": a.model,
+                "total_votes": a.total_votes_received,
+            }
+            for a in state.agents
+        ],
+        "eliminations": [e.model_dump() for e in state.elimination_history],
+    }
+
+
+def run_single_arena(
+    seed: int,
+    questions: list[str],
+    arena_dir: Path,
+    starters_dir: Path,
+    total_rounds: int = TOTAL_ROUNDS,
+) -> dict:
+    """Run one headless arena in its own data/log directory and return a summary."""
+    from .main import run_arena
+
+    use_arena_dir(arena_dir, starters_dir)
+
+    # Cycle questions so the arena never blocks on console input; a resumed
+    # arena picks up where its question list left off
+    done = load_state().current_round
+    schedule = [questions[r % len(questions)] for r in range(done, total_rounds)]
+
+    with open(arena_dir / "console.log", "a") as out, contextlib.redirect_stdout(out):
+        state = run_arena(schedule, seed=seed, total_rounds=total_rounds)
+
+    return {"seed": seed, **arena_summary(state)}
+
+
+def run_batch(
+    questions: list[str],
+    seeds: list[int],
+    out_dir: Path,
+    workers: int,
+    total_rounds: int = TOTAL_ROUNDS,
+    max_concurrent_calls: int = SHARED_MAX_CONCURRENT_CALLS,
+) -> list[dict]:
+    """Run one arena per seed across a process pool sharing one LLM call budget."""
+    if not questions:
+        raise ValueError("Question file contains no questions")
+
+    ctx = multiprocessing.get_context("spawn")
+    slots = ctx.BoundedSemaphore(max_concurrent_calls)
+    summaries = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(slots,),
+    ) as pool:
+        futures = {
+            pool.submit(
+                run_single_arena,
+                seed,
+                questions,
+                out_dir / f"arena-{seed:04d}",
+                utils.PERSONALITIES_DIR,
+                total_rounds,
+            ): seed
+            for seed in seeds
+        }
+        for future in as_completed(futures):
+            seed = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                console.print(f"[red]✗ Arena {seed} failed: {e}[/red]")
+                continue
+            summaries.append(summary)
+            console.print(f"[green]✓ Arena {seed} finished[/green] ({len(summaries)}/{len(seeds)})")
+
+    return sorted(summaries, key=lambda s: s["seed"])
+
+
+def show_batch_summary(summaries: list[dict]) -> None:
+    """Aggregate survival and votes across arenas, by personality and by model."""
+    if not summaries:
+        console.print("[red]No arenas completed.[/red]")
+        return
+
+    survived: dict[str, int] = defaultdict(int)
+    names: dict[str, str] = {}
+    votes: dict[str, int] = defaultdict(int)
+    model_survivors: dict[str, int] = defaultdict(int)
+    model_eliminations: dict[str, int] = defaultdict(int)
+
+    for summary in summaries:
+        for agent in summary["survivors"]:
+            survived[agent["personality_id"]] += 1
+            names[agent["personality_id"]] = agent["name"]
+            votes[agent["personality_id"]] += agent["total_votes"]
+            model_survivors[agent["model"]] += 1
+        for e in summary["eliminations"]:
+            names.setdefault(e["agent_id"], e["agent_name"])
+            model_eliminations[e["model"]] += 1
+
+    n = len(summaries)
+    table = Table(title=f"Survival across {n} arenas")
+    table.add_column("Personality")
+    table.add_column("Survived", justify="right")
+    table.add_column("Rate", justify="right")
+    table.add_column("Votes (survivors)", justify="right")
+    for pid in sorted(survived, key=lambda p: survived[p], reverse=True):
+        table.add_row(names[pid], str(survived[pid]), f"{survived[pid] / n:.0%}", str(votes[pid]))
+    console.print(table)
+
+    table = Table(title="Model fitness")
+    table.add_column("Model")
+    table.add_column("Survivors", justify="right")
+    table.add_column("Eliminations", justify="right")
+    for model in sorted(set(model_survivors) | set(model_eliminations)):
+        table.add_row(model, str(model_survivors[model]), str(model_eliminations[model]))
+    console.print(table)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run many headless arenas in parallel.")
+    parser.add_argument("questions", type=Path, help="Question file, one per line")
+    parser.add_argument("--seeds", type=int, default=4, help="Number of arenas (seeds 0..N-1)")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument("--rounds", type=int, default=TOTAL_ROUNDS, help="Rounds per arena")
+    parser.add_argument("--out", type=Path, default=Path("runs"), help="Output directory")
+    parser.add_argument(
+        "--max-concurrent-calls",
+        type=int,
+        default=SHARED_MAX_CONCURRENT_CALLS,
+        help="LLM calls in flight across all workers",
+    )
+    args = parser.parse_args()
+
+    summaries = run_batch(
+        load_questions(args.questions),
+        list(range(args.seeds)),
+        args.out,
+        args.workers,
+        total_rounds=args.rounds,
+        max_concurrent_calls=args.max_concurrent_calls,
+    )
+    show_batch_summary(summaries)
+
+
+if __name__ == "__main__":
+    main()
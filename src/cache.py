@@ -0,0 +1,136 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from . import utils
+
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# "off": always call the model
+# "read_write": serve hits from the cache, store every miss
+# "replay": serve only from the cache; a miss raises CacheMiss
+CACHE_MODE = "read_write"
+
+_caches: dict[Path, "ResponseCache"] = {}
+
+
+class CacheMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class ResponseCache:
+    """Content-addressed store of chat responses, keyed on a hash of the full request.
+
+    Entries are evicted least-recently-used once the stored bodies exceed max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = CACHE_MAX_BYTES,
+        mode: str = CACHE_MODE,
+    ) -> None:
+        if mode not in ("off", "read_write", "replay"):
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        path = path or utils.CACHE_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses (last_used)")
+        self._db.commit()
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def key(model: str, messages: list[dict], **request) -> str:
+        """Hash everything that determines the output: model, messages, format, options."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "format": request.get("format"),
+            "options": request.get("options"),
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return a stored response, or None. Raises CacheMiss in replay mode."""
+        if self.mode == "off":
+            return None
+
+        row = self._db.execute("SELECT body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            if self.mode == "replay":
+                raise CacheMiss(f"No cached response for request {key[:12]}")
+            return None
+
+        self.hits += 1
+        self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, response: dict) -> None:
+        """Store a response, evicting least-recently-used entries if over budget."""
+        if self.mode != "read_write":
+            return
+
+        body = json.dumps(response, default=str)
+        size = len(body.encode())
+        old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, model, body, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, model, body, size, time.time()),
+        )
+        self._total_bytes += size - (old[0] if old else 0)
+        self._evict()
+        self._db.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters plus current size."""
+        entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
+
+    def _evict(self) -> None:
+        """Drop oldest entries until the store fits max_bytes."""
+        while self._total_bytes > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._total_bytes -= row[1]
+            self.evictions += 1
+
+
+def get_cache() -> ResponseCache:
+    """Cache for the current data directory, opened on first use with the module settings."""
+    path = utils.CACHE_FILE
+    if path not in _caches:
+        _caches[path] = ResponseCache(path, CACHE_MAX_BYTES, CACHE_MODE)
+    return _caches[path]
@@ -0,0 +1,102 @@
+import math
+from typing import Callable
+
+from .feedback import render_history
+from .models import FeedbackEntry
+
+# Size num_ctx per call and trim arena history to fit. Off: prompts are
+# sent as built and Ollama uses its default context (truncating silently)
+CONTEXT_BUDGET = True
+
+# Rough characters per token; errs on the high side of token counts for English
+CHARS_PER_TOKEN = 3.5
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and template tokens around each message
+
+# Context windows of the arena models; others get DEFAULT_CONTEXT
+MODEL_CONTEXT = {
+    "llama3.2": 131072,
+    "gemma3": 131072,
+    "qwen3": 40960,
+    "mistral": 32768,
+    "phi4": 16384,
+}
+DEFAULT_CONTEXT = 8192
+# Largest num_ctx ever requested, whatever the model allows; bounds KV cache memory
+MAX_NUM_CTX = 16384
+# num_ctx is rounded up to one of these, and is never below BASE_NUM_CTX
+# (or the model's limit, if smaller). Models are preloaded with the base
+# size, so only prompts that outgrow it make Ollama reload the model
+NUM_CTX_STEPS = (2048, 4096, 8192, 16384, 32768, 65536, 131072)
+BASE_NUM_CTX = 8192
+
+# Output room reserved per call kind (responses use RESPONSE_MAX_TOKENS when set)
+DEFAULT_OUTPUT_TOKENS = 1024
+VOTE_OUTPUT_TOKENS = 256
+META_OUTPUT_TOKENS = 512
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Approximate prompt tokens of chat messages, without a tokenizer."""
+    return sum(
+        math.ceil(len(m["content"]) / CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS
+        for m in messages
+    )
+
+
+def context_limit(model: str) -> int:
+    """Tokens of context a call to model may use."""
+    family = model.split(":")[0]
+    return min(MODEL_CONTEXT.get(model, MODEL_CONTEXT.get(family, DEFAULT_CONTEXT)), MAX_NUM_CTX)
+
+
+def preload_num_ctx(model: str) -> int | None:
+    """num_ctx to load a model with, so its first calls don't reload it (None: budgeter off)."""
+    if not CONTEXT_BUDGET:
+        return None
+    return min(BASE_NUM_CTX, context_limit(model))
+
+
+def fit_prompt(
+    model: str,
+    build: Callable[[str], list[dict]],
+    feedback: str,
+    history: list[FeedbackEntry] | None,
+    output_tokens: int,
+) -> tuple[list[dict], dict, int]:
+    """Build a prompt that fits the model's context, leaving room for output_tokens.
+
+    build turns history text into chat messages. When the prompt is too
+    long, the oldest rounds of history lose their vote reasons first, then
+    are dropped. Returns (messages, options with num_ctx, estimated tokens
+    trimmed). Without history entries only num_ctx is sized.
+    """
+    messages = build(feedback)
+    if not CONTEXT_BUDGET:
+        return messages, {}, 0
+
+    limit = context_limit(model)
+    tokens = estimate_tokens(messages)
+    full_tokens = tokens
+    if history and tokens + output_tokens > limit:
+        # Cheapest cut first: reasons of the oldest rounds, then whole rounds
+        for omitted, brief in _trim_steps(len(history)):
+            messages = build(render_history(history[omitted:], brief=brief, omitted=omitted))
+            tokens = estimate_tokens(messages)
+            if tokens + output_tokens <= limit:
+                break
+
+    return messages, {"num_ctx": _choose_num_ctx(tokens + output_tokens, limit)}, full_tokens - tokens
+
+
+def _trim_steps(n: int):
+    """(omitted, brief) pairs in order of how much history they keep."""
+    for brief in range(1, n + 1):
+        yield 0, brief
+    for omitted in range(1, n + 1):
+        yield omitted, n - omitted
+
+
+def _choose_num_ctx(needed: int, limit: int) -> int:
+    """The step that fits needed tokens, depending only on the prompt, so cache keys are stable."""
+    step = next((s for s in NUM_CTX_STEPS if s >= max(needed, BASE_NUM_CTX)), NUM_CTX_STEPS[-1])
+    return min(step, limit)
@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import re
+import time
+from collections import Counter
+
+from .metrics import call_metrics
+from .models import CallMetrics, Digest, Response
+from .ollama_client import ArenaClient
+from .tracing import traced
+
+# None: voters read full answers. "extractive": keep the answer's most
+# representative sentences, no LLM call. "model": DIGEST_MODEL condenses
+# each answer, one extra call per agent.
+DIGEST_MODE: str | None = None
+DIGEST_MODEL = "llama3.2:latest"
+DIGEST_MAX_CHARS = 600  # Answers shorter than this are shown in full
+REASON_MAX_CHARS = 200  # Vote reasons in arena history, when digests are on
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z']+")
+
+# (method, limit, sha256 of text) -> digest text, shared by every round in the process
+_digests: dict[tuple[str, int, str], str] = {}
+
+
+def extractive_digest(text: str, max_chars: int = DIGEST_MAX_CHARS) -> str:
+    """Shorten text to max_chars by keeping its most representative sentences, in order.
+
+    The first sentence (usually the thesis) is always kept; the rest are
+    ranked by how common their words are across the whole answer.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+
+    sentences = _SENTENCE_END.split(text)
+    frequency = Counter(w for w in _WORD.findall(text.lower()) if len(w) > 3)
+
+    def score(sentence: str) -> float:
+        words = _WORD.findall(sentence.lower())
+        return sum(frequency[w] for w in words) / (len(words) + 1)
+
+    keep = {0}
+    used = len(sentences[0])
+    for i in sorted(range(1, len(sentences)), key=lambda i: score(sentences[i]), reverse=True):
+        if used + 1 + len(sentences[i]) <= max_chars:
+            keep.add(i)
+            used += 1 + len(sentences[i])
+
+    digest = " ".join(sentences[i] for i in sorted(keep))
+    if len(digest) > max_chars:
+        # A single opening sentence longer than the budget
+        digest = digest[: max_chars - 1].rsplit(" ", 1)[0] + "…"
+    return digest
+
+
+@traced
+async def digest_responses(client: ArenaClient, responses: list[Response]) -> list[Response]:
+    """Attach a digest to each answer longer than DIGEST_MAX_CHARS, concurrently.
+
+    Digests are cached by the answer's hash, so a resumed round or a
+    repeated answer costs nothing.
+    """
+    if DIGEST_MODE is None:
+        return responses
+    digests = await asyncio.gather(*(_digest(client, r.content) for r in responses))
+    return [
+        r.model_copy(update={"digest": d}) if d is not None else r
+        for r, d in zip(responses, digests)
+    ]
+
+
+def shown_to_voters(response: Response) -> Response:
+    """The response as it appears in vote prompts: its digest if it has one."""
+    if response.digest is None:
+        return response
+    return response.model_copy(update={"content": response.digest.text})
+
+
+async def _digest(client: ArenaClient, text: str) -> Digest | None:
+    if len(text) <= DIGEST_MAX_CHARS:
+        return None
+
+    method = DIGEST_MODEL if DIGEST_MODE == "model" else "extractive"
+    key = (method, DIGEST_MAX_CHARS, hashlib.sha256(text.encode()).hexdigest())
+    if key in _digests:
+        return Digest(text=_digests[key], method=method)
+
+    if DIGEST_MODE == "model":
+        digest, metrics = await _model_digest(client, text)
+    elif DIGEST_MODE == "extractive":
+        digest, metrics = extractive_digest(text, DIGEST_MAX_CHARS), CallMetrics()
+    else:
+        raise ValueError(f"Unknown digest mode: {DIGEST_MODE}")
+
+    _digests[key] = digest
+    return Digest(text=digest, method=method, metrics=metrics)
+
+
+async def _model_digest(client: ArenaClient, text: str) -> tuple[str, CallMetrics]:
+    words = DIGEST_MAX_CHARS // 6
+    start = time.monotonic()
+    result = await client.chat(
+        model=DIGEST_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": "You condense debate answers. Keep the main claim, the key reasons "
+                "and the author's voice. Reply with the condensed answer only.",
+            },
+            {"role": "user", "content": f"Condense this answer to at most {words} words:\n\n{text}"},
+        ],
+        options={"num_predict": DIGEST_MAX_CHARS // 3},
+    )
+    metrics = call_metrics(result, time.monotonic() - start, result.get("cached", False))
+    # The model may overrun; the bound is a promise to the vote prompt
+    return extractive_digest(result["message"]["content"], DIGEST_MAX_CHARS), metrics
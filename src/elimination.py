@@ -1,17 +1,27 @@
+import asyncio
 import json
 import random
 
-import ollama
 from rich.console import Console
 
-from .models import Agent, ArenaState, Elimination, Personality
-from .utils import PERSONALITIES_DIR
+from .context_budget import META_OUTPUT_TOKENS, fit_prompt
+from .events import AgentEliminated, AgentReplaced, flush, publish
+from .feedback import render_feedback
+from .models import Agent, ArenaState, Elimination, FeedbackEntry, Personality
+from .ollama_client import ArenaClient
+from .personality_store import get_store
+from .tracing import traced
+from .voting import average_votes
 
 console = Console()
 
 # Model used for generating new personas
 META_MODEL = "phi4:14b"
 
+# Agents this many rounds without votes get a replacement drafted during
+# the voting phase of an elimination round, one round short of elimination
+SPECULATE_AFTER_VOTELESS_ROUNDS = 2
+
 
 def check_eliminations(state: ArenaState) -> list[Agent]:
     """Return agents that should be eliminated (3+ rounds without votes)."""
@@ -23,8 +33,6 @@ def eliminate_agents(state: ArenaState, to_eliminate: list[Agent]) -> list[Elimi
     eliminations = []
     
     for agent in to_eliminate:
-        console.print(f"[red]☠ {agent.name} eliminated after {agent.rounds_participated} rounds[/red]")
-        
         elimination = Elimination(
             agent_id=agent.personality_id,
             agent_name=agent.name,
@@ -33,9 +41,10 @@ def eliminate_agents(state: ArenaState, to_eliminate: list[Agent]) -> list[Elimi
         )
         eliminations.append(elimination)
         state.elimination_history.append(elimination)
+        publish(AgentEliminated(round_number=state.current_round, elimination=elimination))
         
-        # Mark death in personality file
-        _mark_personality_dead(agent.personality_id, state.current_round)
+        # Record death in the personality store
+        get_store().mark_dead(agent.personality_id, state.current_round)
     
     # Remove from active agents
     state.agents = [a for a in state.agents if a not in to_eliminate]
@@ -43,28 +52,38 @@ def eliminate_agents(state: ArenaState, to_eliminate: list[Agent]) -> list[Elimi
     return eliminations
 
 
-def generate_replacement(
-    state: ArenaState,
-    eliminated: list[Elimination],
-    replacement_index: int = 0,
-) -> Agent:
-    """Generate a new persona using the meta-LLM and create an agent."""
-    
-    from .utils import load_feedback
+@traced
+async def draft_persona(
+    client: ArenaClient,
+    survivors: list[Agent],
+    eliminated_info: list[dict],
+    feedback: str,
+    replacing: str,
+    parent: Agent | None = None,
+    history: list[FeedbackEntry] | None = None,
+    inherit: bool = False,
+) -> dict:
+    """Ask the meta-LLM for a new persona (name, persona, voting_criteria, strategy_notes).
+
+    parent's id is returned as parent_id, for the lineage. With inherit,
+    the prompt also asks the persona to take after parent.
+    history lets the oldest rounds be trimmed to fit the meta-model's context.
+    """
     
     survivors_info = [
         {"name": a.name, "persona": a.persona, "voting_criteria": a.voting_criteria}
-        for a in state.agents
+        for a in survivors
     ]
     
-    eliminated_info = [
-        {"name": e.agent_name, "rounds_survived": e.rounds_survived}
-        for e in eliminated
-    ]
-    
-    feedback = load_feedback()
+    inheritance = ""
+    if inherit and parent is not None:
+        inheritance = (
+            f" It descends from {parent.name}, currently the strongest contestant, "
+            "and should inherit something recognisable from that approach."
+        )
     
-    prompt = f"""You are designing a new contestant for a debate arena.
+    def build(history_text: str) -> list[dict]:
+        prompt = f"""You are designing a new contestant for a debate arena.
 
 Current survivors:
 {json.dumps(survivors_info, indent=2)}
@@ -73,7 +92,9 @@ Recently eliminated:
 {json.dumps(eliminated_info, indent=2)}
 
 Recent arena history (what's been winning and why):
-{feedback if feedback else "(No history yet)"}
+{history_text if history_text else "(No history yet)"}
+
+This contestant takes the place of {replacing}.{inheritance}
 
 Create a new personality that could compete effectively. You may:
 - Remix traits from survivors
@@ -81,12 +102,12 @@ Create a new personality that could compete effectively. You may:
 - Deliberately counter the current meta
 
 The personality should be distinctive and have a clear voting philosophy."""
-
-    result = ollama.chat(
+        return [{"role": "user", "content": prompt}]
+    
+    messages, options, _ = fit_prompt(META_MODEL, build, feedback, history, output_tokens=META_OUTPUT_TOKENS)
+    result = await client.chat(
         model=META_MODEL,
-        messages=[
-            {"role": "user", "content": prompt},
-        ],
+        messages=messages,
         format={
             "type": "object",
             "properties": {
@@ -97,30 +118,45 @@ The personality should be distinctive and have a clear voting philosophy."""
             },
             "required": ["name", "persona", "voting_criteria", "strategy_notes"]
         },
+        options=options or None,
     )
     
-    content = result["message"]["content"]
-    persona_data = json.loads(content)
-    
-    console.print(f"[green]✦ New challenger: {persona_data['name']}[/green]")
-    console.print(f"  Strategy: {persona_data['strategy_notes']}")
+    persona_data = json.loads(result["message"]["content"])
+    persona_data["parent_id"] = parent.personality_id if parent else None
+    return persona_data
+
+
+@traced
+def create_replacement(
+    state: ArenaState,
+    persona_data: dict,
+    eliminated: list[Elimination],
+    replacement_index: int = 0,
+) -> Agent:
+    """Turn a drafted persona into a saved personality and a new agent."""
     
     # Create personality ID
     base_count = len(state.elimination_history) - len(eliminated)
-    personality_id = f"gen-{base_count + replacement_index + 1}"
+    personality_id = f"{state.id_prefix}gen-{base_count + replacement_index + 1}"
+    
+    # A child is one generation after its parent
+    store = get_store()
+    parent_id = persona_data.get("parent_id")
+    parent = store.get(parent_id) if parent_id else None
+    generation = parent.generation + 1 if parent else _get_next_generation(state)
     
-    # Save personality to file
+    # Save personality to the store
     personality = Personality(
         id=personality_id,
         name=persona_data["name"],
         persona=persona_data["persona"],
         voting_criteria=persona_data["voting_criteria"],
-        generation=_get_next_generation(state),
-        parent_id=None,
+        generation=generation,
+        parent_id=parent.id if parent else None,
         born_round=state.current_round,
         died_round=None,
     )
-    _save_personality(personality)
+    store.put(personality)
     
     # Assign random model and create agent
     model = random.choice(state.models)
@@ -132,51 +168,122 @@ The personality should be distinctive and have a clear voting philosophy."""
         voting_criteria=persona_data["voting_criteria"],
         generation=personality.generation,
     )
-    
-    console.print(f"  Assigned model: {model}")
+    publish(AgentReplaced(
+        round_number=state.current_round,
+        agent=agent,
+        strategy_notes=persona_data.get("strategy_notes", ""),
+    ))
     
     return agent
 
 
+def choose_parent(agents: list[Agent]) -> Agent | None:
+    """The agent a replacement descends from: the one with the most votes per round."""
+    return max(agents, key=average_votes, default=None)
+
+
+def speculation_candidates(state: ArenaState) -> list[Agent]:
+    """Agents who will be eliminated if this round brings them no votes."""
+    return [a for a in state.agents if a.rounds_without_votes >= SPECULATE_AFTER_VOTELESS_ROUNDS]
+
+
+async def draft_replacements(client: ArenaClient, state: ArenaState, candidates: list[Agent]) -> dict[str, dict]:
+    """Speculatively draft a replacement persona for each candidate, concurrently.
+
+    Runs during a round's voting phase, so the prompt sees the arena as it
+    stood before the round. Not every candidate need go, so each draft is
+    written as if its agent were the only one eliminated. Returns
+    personality_id -> persona data; failed drafts are left out and
+    regenerated if the agent is eliminated.
+    """
+    feedback = render_feedback(state)
+    history = list(state.feedback)
+    
+    def draft(candidate: Agent):
+        survivors = [a for a in state.agents if a.personality_id != candidate.personality_id]
+        eliminated_info = [{"name": candidate.name, "rounds_survived": candidate.rounds_participated + 1}]
+        return draft_persona(
+            client, survivors, eliminated_info, feedback,
+            replacing=candidate.name, parent=choose_parent(survivors), history=history,
+            inherit=state.inherit_from_parent,
+        )
+    
+    drafts = await asyncio.gather(*(draft(a) for a in candidates), return_exceptions=True)
+    
+    results = {}
+    for agent, draft in zip(candidates, drafts):
+        if isinstance(draft, Exception):
+            console.print(f"[dim]Speculative replacement for {agent.name} failed: {draft}[/dim]")
+        else:
+            results[agent.personality_id] = draft
+    return results
+
+
+@traced
 def run_elimination_phase(state: ArenaState) -> None:
     """Check for eliminations and generate replacements."""
     
     to_eliminate = check_eliminations(state)
     
+    # Replacements drafted during the round; those for survivors are discarded
+    drafts, state._replacement_drafts = state._replacement_drafts, {}
+    
     if not to_eliminate:
         console.print("[dim]No eliminations this round.[/dim]")
+        if drafts:
+            console.print(f"[dim]Discarded {len(drafts)} speculative replacement(s).[/dim]")
         return
     
     console.print(f"\n[bold red]═══ Elimination Phase ═══[/bold red]")
     
     eliminations = eliminate_agents(state, to_eliminate)
     
+    unused = len(set(drafts) - {e.agent_id for e in eliminations})
+    flush("console")
+    if unused:
+        console.print(f"[dim]Discarded {unused} speculative replacement(s) for survivors.[/dim]")
+    
     # Generate replacements
-    for i, _ in enumerate(eliminations):
-        new_agent = generate_replacement(state, eliminations, replacement_index=i)
-        state.agents.append(new_agent)
-
+    asyncio.run(_generate_replacements(state, eliminations, drafts))
 
-def _mark_personality_dead(personality_id: str, round_num: int) -> None:
-    """Update personality file with death round."""
-    filepath = PERSONALITIES_DIR / f"{personality_id}.json"
-    if filepath.exists():
-        with open(filepath) as f:
-            data = json.load(f)
-        data["died_round"] = round_num
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
 
-
-def _save_personality(personality: Personality) -> None:
-    """Save a new personality to file."""
-    filepath = PERSONALITIES_DIR / f"{personality.id}.json"
-    with open(filepath, "w") as f:
-        f.write(personality.model_dump_json(indent=2))
+async def _generate_replacements(
+    state: ArenaState,
+    eliminations: list[Elimination],
+    drafts: dict[str, dict],
+) -> None:
+    """One replacement per elimination, in order; personas not drafted already are generated concurrently."""
+    client = ArenaClient()
+    missing = [i for i, e in enumerate(eliminations) if e.agent_id not in drafts]
+    if missing:
+        eliminated_info = [
+            {"name": e.agent_name, "rounds_survived": e.rounds_survived}
+            for e in eliminations
+        ]
+        feedback = render_feedback(state)
+        parent = choose_parent(state.agents)
+        generated = await asyncio.gather(*(
+            draft_persona(
+                client, state.agents, eliminated_info, feedback,
+                replacing=eliminations[i].agent_name, parent=parent, history=list(state.feedback),
+                inherit=state.inherit_from_parent,
+            )
+            for i in missing
+        ))
+        drafts = {**drafts, **{eliminations[i].agent_id: d for i, d in zip(missing, generated)}}
+    
+    for i, elimination in enumerate(eliminations):
+        new_agent = create_replacement(state, drafts[elimination.agent_id], eliminations, replacement_index=i)
+        state.agents.append(new_agent)
+    await asyncio.to_thread(flush, "console")
+    console.print(
+        f"[dim]{len(eliminations) - len(missing)} of {len(eliminations)} replacement(s) "
+        f"drafted during voting[/dim]"
+    )
 
 
 def _get_next_generation(state: ArenaState) -> int:
-    """Get the next generation number based on current agents."""
+    """Generation for a replacement without a known parent, from the current agents."""
     if not state.agents:
         return 1
     return max(a.generation for a in state.agents) + 1
\ No newline at end of file
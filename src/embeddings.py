@@ -0,0 +1,342 @@
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("Response embeddings need NumPy: pip install 'llm-arena[analytics]'") from e
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Iterable, Protocol
+
+import ollama
+from rich.console import Console
+from rich.table import Table
+
+from . import utils
+from .models import RoundDiversity, RoundResult
+from .round_log import RoundLog
+from .tracing import traced
+
+console = Console()
+
+# Ollama embedding model, e.g. "nomic-embed-text". Empty: the hashing
+# stand-in, which needs no server and measures shared wording, not meaning
+EMBED_MODEL = os.environ.get("ARENA_EMBED_MODEL", "")
+EMBED_BATCH = 64  # Texts per embedding request
+HASHING_DIM = 1024
+
+# Logged rounds folded in per batch when catching up with a log
+UPDATE_CHUNK = 256
+# Rounds compared at the start and end of a run in the final stats
+TREND_WINDOW = 10
+
+_KEY_BYTES = 32  # sha256 of the text
+
+
+class Embedder(Protocol):
+    """Turns texts into vectors. name identifies the vector space, so caches never mix two."""
+
+    name: str
+
+    def embed(self, texts: list[str]) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """Word unigrams and bigrams hashed into a fixed number of signed buckets.
+
+    Deterministic and model-free: answers score as alike when they share
+    phrasing, which is what stock consultant vocabulary looks like.
+    """
+
+    def __init__(self, dim: int = HASHING_DIM) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"[a-z0-9']+", text.lower())
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            hashes = np.array([zlib.crc32(f.encode()) for f in features], dtype=np.uint32)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+            np.add.at(vectors[row], hashes % self.dim, signs)
+        # Damp repeated words so one refrain doesn't dominate the vector
+        return np.sign(vectors) * np.log1p(np.abs(vectors))
+
+
+class OllamaEmbedder:
+    """An Ollama embedding model (honours OLLAMA_HOST)."""
+
+    def __init__(self, model: str, host: str | None = None) -> None:
+        self.model = model
+        self.name = f"ollama-{model}"
+        self._client = ollama.Client(host=host)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        rows = []
+        for i in range(0, len(texts), EMBED_BATCH):
+            result = self._client.embed(model=self.model, input=texts[i:i + EMBED_BATCH])
+            rows.extend(result.embeddings)
+        return np.array(rows, dtype=np.float32)
+
+
+def make_embedder() -> Embedder:
+    """The embedder selected by EMBED_MODEL (or ARENA_EMBED_MODEL)."""
+    return OllamaEmbedder(EMBED_MODEL) if EMBED_MODEL else HashingEmbedder()
+
+
+class EmbeddingStore:
+    """Embeddings cached by content hash in a memory-mapped float32 array.
+
+    Each embedder gets data/embeddings/<name>.f32 (one row per text),
+    <name>.keys (the sha256 of each row's text, in row order) and
+    <name>.json (the dimension). Only texts never seen before are embedded.
+    The array file grows by doubling; keys are appended only after their
+    rows are flushed, so an interrupted write leaves unused rows, never
+    keys pointing at missing vectors.
+    """
+
+    def __init__(self, embedder: Embedder, directory: Path | None = None) -> None:
+        self.embedder = embedder
+        directory = directory or utils.EMBEDDINGS_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = re.sub(r"[^A-Za-z0-9_-]+", "-", embedder.name)
+        self._vectors_path = directory / f"{stem}.f32"
+        self._keys_path = directory / f"{stem}.keys"
+        self._meta_path = directory / f"{stem}.json"
+
+        self.dim: int | None = None
+        if self._meta_path.exists():
+            self.dim = json.loads(self._meta_path.read_text())["dim"]
+        keys = self._keys_path.read_bytes() if self._keys_path.exists() and self.dim else b""
+        self._rows = len(keys) // _KEY_BYTES
+        self._index = {keys[i * _KEY_BYTES:(i + 1) * _KEY_BYTES]: i for i in range(self._rows)}
+        self._capacity = 0
+        self._map: np.memmap | None = None
+        if self.dim:
+            self._capacity = self._vectors_path.stat().st_size // (self.dim * 4) if self._vectors_path.exists() else 0
+            if self._capacity < self._rows:
+                # Vectors lost behind their keys: start the cache over
+                self._index.clear()
+                self._rows = 0
+                self._keys_path.write_bytes(b"")
+            if self._capacity:
+                self._map = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dim))
+        self.embedded = 0  # Texts embedded by this instance (cache misses)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @traced
+    def vectors(self, texts: list[str]) -> np.ndarray:
+        """Embeddings of texts, one row each, embedding only those not cached yet."""
+        keys = [hashlib.sha256(text.encode()).digest() for text in texts]
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self._index:
+                missing.setdefault(key, text)
+        if missing:
+            self._append(list(missing), self.embedder.embed(list(missing.values())))
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self._map[[self._index[key] for key in keys]])
+
+    def _append(self, keys: list[bytes], vectors: np.ndarray) -> None:
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            utils.atomic_write_text(self._meta_path, json.dumps({"embedder": self.embedder.name, "dim": self.dim}))
+        needed = self._rows + len(keys)
+        if needed > self._capacity:
+            self._grow(max(needed, 2 * self._capacity, 1024))
+        self._map[self._rows:needed] = vectors
+        self._map.flush()
+        with open(self._keys_path, "ab") as f:
+            f.write(b"".join(keys))
+        self._index.update((key, self._rows + i) for i, key in enumerate(keys))
+        self._rows = needed
+        self.embedded += len(keys)
+
+    def _grow(self, capacity: int) -> None:
+        if self._map is not None:
+            self._map.flush()
+            self._map = None
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._map = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to length 1 (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class DiversityIndex:
+    """Per-round similarity of the arena's answers, updated as rounds arrive.
+
+    Rounds are folded in batches: their answers are embedded through the
+    store (so past answers cost a cache lookup), packed into a padded
+    round × agent × dim array, and every round's pairwise cosine
+    similarities come from one einsum. The last centroid and each agent's
+    last answer are carried over, so the next batch continues from them.
+    """
+
+    def __init__(self, store: EmbeddingStore | None = None) -> None:
+        self.store = store if store is not None else EmbeddingStore(make_embedder())
+        self.round_numbers: list[int] = []
+        self.rounds: list[RoundDiversity] = []
+        self._centroid: np.ndarray | None = None
+        self._last_answer: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_log(cls, log: RoundLog | None = None, store: EmbeddingStore | None = None) -> "DiversityIndex":
+        """Build from every round in the log (the run's own log by default)."""
+        index = cls(store)
+        index.update(log or RoundLog.open())
+        return index
+
+    def update(self, log: RoundLog) -> int:
+        """Add rounds logged since the last update. Returns how many were added."""
+        start = self.round_numbers[-1] + 1 if self.round_numbers else None
+        added = 0
+        chunk: list[RoundResult] = []
+        for result in log.rounds(start=start):
+            chunk.append(result)
+            if len(chunk) == UPDATE_CHUNK:
+                added += len(self.add_rounds(chunk))
+                chunk = []
+        if chunk:
+            added += len(self.add_rounds(chunk))
+        return added
+
+    def add_round(self, result: RoundResult) -> RoundDiversity:
+        """Fold in one round and return its metrics."""
+        return self.add_rounds([result])[0]
+
+    def add_rounds(self, results: list[RoundResult]) -> list[RoundDiversity]:
+        """Fold in consecutive rounds at once and return their metrics, in order."""
+        if not results:
+            return []
+        vectors = _unit(self.store.vectors([r.content for result in results for r in result.responses]))
+        counts = np.array([len(result.responses) for result in results])
+        width = max(int(counts.max()), 1)
+        dim = vectors.shape[1] if len(vectors) else (self.store.dim or 1)
+
+        present = np.arange(width)[None, :] < counts[:, None]
+        answers = np.zeros((len(results), width, dim), dtype=np.float32)
+        answers[present] = vectors
+        gram = np.einsum("rad,rbd->rab", answers, answers)
+        pairs = present[:, :, None] & present[:, None, :] & ~np.eye(width, dtype=bool)
+        n_pairs = pairs.sum(axis=(1, 2))
+        mean = (gram * pairs).sum(axis=(1, 2)) / np.maximum(n_pairs, 1)
+        highest = np.where(pairs, gram, -np.inf).reshape(len(results), -1)
+        lowest = np.where(pairs, gram, np.inf).min(axis=(1, 2))
+        best_pair = highest.argmax(axis=1)
+
+        centroids = _unit(answers.sum(axis=1))
+        previous = np.vstack([
+            self._centroid[None, :] if self._centroid is not None else np.zeros((1, dim), dtype=np.float32),
+            centroids[:-1],
+        ])
+        centroid_similarity = (centroids * previous).sum(axis=1)
+        has_previous = np.ones(len(results), dtype=bool)
+        has_previous[0] = self._centroid is not None
+
+        diversities = []
+        for r, result in enumerate(results):
+            # Agents carry over between rounds, so this part stays sequential
+            repeats = []
+            for a, response in enumerate(result.responses):
+                last = self._last_answer.get(response.agent_id)
+                if last is not None:
+                    repeats.append(float(last @ answers[r, a]))
+                self._last_answer[response.agent_id] = answers[r, a].copy()
+
+            diversity = RoundDiversity(embedder=self.store.embedder.name)
+            if n_pairs[r]:
+                i, j = divmod(int(best_pair[r]), width)
+                diversity.similarity = float(mean[r])
+                diversity.min_similarity = float(lowest[r])
+                diversity.max_similarity = float(highest[r, best_pair[r]])
+                diversity.most_similar = [result.responses[i].agent_id, result.responses[j].agent_id]
+            if has_previous[r] and counts[r]:
+                diversity.centroid_similarity = float(centroid_similarity[r])
+            if repeats:
+                diversity.self_similarity = float(np.mean(repeats))
+            diversities.append(diversity)
+            if counts[r]:
+                self._centroid = centroids[r]
+
+        self.round_numbers.extend(result.round_number for result in results)
+        self.rounds.extend(diversities)
+        return diversities
+
+    def series(self, field: str = "similarity") -> np.ndarray:
+        """One RoundDiversity field per round, NaN where it is unset."""
+        values = (getattr(d, field) for d in self.rounds)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+    def drift(self, window: int = TREND_WINDOW) -> tuple[float, float] | None:
+        """Mean answer similarity over the first and the last window rounds, or None if too few."""
+        series = self.series()
+        series = series[~np.isnan(series)]
+        if len(series) < 2:
+            return None
+        window = min(window, len(series) // 2)
+        return float(series[:window].mean()), float(series[-window:].mean())
+
+
+_FIELDS = ("similarity", "centroid_similarity", "self_similarity")
+
+
+def _windows(index: DiversityIndex, window: int) -> Iterable[tuple[int, int, list[float | None]]]:
+    """(first round, last round, mean of each of _FIELDS) per block of window rounds."""
+    series = np.stack([index.series(field) for field in _FIELDS])
+    for start in range(0, series.shape[1], window):
+        block = series[:, start:start + window]
+        set_count = (~np.isnan(block)).sum(axis=1)
+        means = np.nansum(block, axis=1) / np.maximum(set_count, 1)
+        last = min(start + window, series.shape[1]) - 1
+        yield index.round_numbers[start], index.round_numbers[last], [
+            float(m) if n else None for m, n in zip(means, set_count)
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Answer similarity over the logged rounds.")
+    parser.add_argument("--window", type=int, default=TREND_WINDOW, help="Rounds per table row")
+    parser.add_argument("--embed-model", help="Ollama embedding model (default: EMBED_MODEL, else hashing)")
+    parser.add_argument(
+        "--arena", type=Path, help="Arena directory with data/ and logs/, e.g. runs/arena-0003 (default: this project)"
+    )
+    args = parser.parse_args()
+    if args.window < 1:
+        parser.error("--window must be at least 1")
+
+    if args.arena:
+        utils.configure_paths(args.arena / "data", args.arena / "logs")
+    embedder = OllamaEmbedder(args.embed_model) if args.embed_model else make_embedder()
+    store = EmbeddingStore(embedder)
+    index = DiversityIndex.from_log(store=store)
+    if not index.rounds:
+        console.print("[red]No logged rounds.[/red]")
+        return
+
+    table = Table(title=f"Answer similarity ({embedder.name})")
+    table.add_column("Rounds")
+    table.add_column("Similarity", justify="right")
+    table.add_column("Vs previous round", justify="right")
+    table.add_column("Self", justify="right")
+    for first, last, means in _windows(index, args.window):
+        table.add_row(f"{first}–{last}", *("" if m is None else f"{m:.2f}" for m in means))
+    console.print(table)
+    console.print(f"[dim]{len(store)} embeddings cached, {store.embedded} new[/dim]")
+
+
+if __name__ == "__main__":
+    main()
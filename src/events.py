@@ -0,0 +1,258 @@
+import atexit
+import queue
+import threading
+from typing import Callable
+
+from pydantic import BaseModel
+from rich.console import Console
+from rich.panel import Panel
+
+from . import feedback
+from .journal import clear_journal
+from .metrics import export_metrics
+from .models import Agent, ArenaState, Elimination, Response, RoundResult, Vote
+from .persistence import save_state
+from .round_log import append_round
+from .tracing import span
+
+console = Console()
+
+
+class ArenaEvent(BaseModel):
+    """Something the arena did, published on the event bus."""
+    round_number: int
+
+
+class ResponseReady(ArenaEvent):
+    response: Response
+
+
+class VoteCast(ArenaEvent):
+    vote: Vote
+
+
+class PhaseCompleted(ArenaEvent):
+    """Every answer ("responses") or vote ("votes") of a round is in; order lists the agents in arena order."""
+    phase: str
+    order: list[str]
+
+
+class RoundTallied(ArenaEvent):
+    """A finished round, with its votes counted."""
+    result: RoundResult
+
+
+class AgentEliminated(ArenaEvent):
+    elimination: Elimination
+
+
+class AgentReplaced(ArenaEvent):
+    agent: Agent
+    strategy_notes: str = ""
+
+
+class RoundCompleted(ArenaEvent):
+    """The arena after a round and its eliminations. state is a copy, safe to use on another thread."""
+    state: ArenaState
+
+
+class SubscriberError(RuntimeError):
+    """A subscriber failed to handle an event; raised on the next publish or flush."""
+
+
+_STOP = object()
+
+
+class _Subscriber:
+    """One worker thread draining its own queue, so a slow subscriber holds up no other."""
+
+    def __init__(self, name: str, handlers: dict[type[ArenaEvent], Callable]) -> None:
+        self.name = name
+        self.handlers = handlers
+        self.queue: queue.Queue = queue.Queue()
+        self.error: BaseException | None = None
+        # Daemon, so an unclosed bus can't keep the interpreter alive; atexit flushes it
+        self.thread = threading.Thread(target=self._run, name=f"events-{name}", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            event = self.queue.get()
+            try:
+                if event is _STOP:
+                    return
+                handler = self.handlers[type(event)]
+                with span(f"events.{self.name}", event=type(event).__name__):
+                    handler(event)
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+            finally:
+                self.queue.task_done()
+
+
+class EventBus:
+    """Fans events out to subscribers running on background threads.
+
+    Each subscriber sees its events in publish order. publish never waits,
+    so the round engine keeps its LLM calls going while subscribers
+    render and write. flush waits for subscribers to catch up; close
+    flushes and stops them. The first exception a subscriber raises is
+    re-raised as SubscriberError on the next publish, flush or close.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, _Subscriber] = {}
+        self.closed = False
+
+    def subscribe(self, name: str, handlers: dict[type[ArenaEvent], Callable]) -> None:
+        """Handle the given event types, in order, on a thread of their own."""
+        if name in self._subscribers:
+            raise ValueError(f"Subscriber already registered: {name}")
+        self._subscribers[name] = _Subscriber(name, handlers)
+
+    def publish(self, event: ArenaEvent) -> None:
+        if self.closed:
+            raise RuntimeError("Event bus is closed")
+        self._raise_errors()
+        for subscriber in self._subscribers.values():
+            if type(event) in subscriber.handlers:
+                subscriber.queue.put(event)
+
+    def flush(self, *names: str) -> None:
+        """Wait until the named subscribers (default: all) have handled everything published so far."""
+        for name, subscriber in self._subscribers.items():
+            if not names or name in names:
+                subscriber.queue.join()
+        self._raise_errors()
+
+    def close(self) -> None:
+        """Flush every subscriber, then stop their threads."""
+        if self.closed:
+            return
+        self.closed = True
+        for subscriber in self._subscribers.values():
+            subscriber.queue.put(_STOP)
+        for subscriber in self._subscribers.values():
+            subscriber.thread.join()
+        self._raise_errors()
+
+    def _raise_errors(self) -> None:
+        for subscriber in self._subscribers.values():
+            if subscriber.error is not None:
+                error, subscriber.error = subscriber.error, None
+                raise SubscriberError(f"{subscriber.name} subscriber failed: {error}") from error
+
+
+def show_response(response: Response) -> None:
+    title = response.agent_name
+    if response.truncated:
+        title += f" [red](truncated: {response.truncation_reason} budget)[/red]"
+    console.print(Panel(response.content, title=title, border_style="green"))
+
+
+def show_vote(vote: Vote) -> None:
+    console.print(f"    → {vote.voter_name} votes for [cyan]{vote.voted_for_name}[/cyan]: {vote.reasoning}")
+
+
+class ConsoleView:
+    """Console rendering of arena events.
+
+    Answers and votes arrive in the order they finish; they are held until
+    their phase completes and then printed in arena order, so a round's
+    output reads the same from run to run.
+    """
+
+    def __init__(self) -> None:
+        self._responses: dict[str, Response] = {}  # agent id -> answer, until the phase completes
+        self._votes: dict[str, Vote] = {}  # voter id -> vote
+
+    def handlers(self) -> dict[type[ArenaEvent], Callable]:
+        return {
+            ResponseReady: self.hold_response,
+            VoteCast: self.hold_vote,
+            PhaseCompleted: self.show_phase,
+            AgentEliminated: show_elimination,
+            AgentReplaced: show_replacement,
+        }
+
+    def hold_response(self, event: ResponseReady) -> None:
+        self._responses[event.response.agent_id] = event.response
+
+    def hold_vote(self, event: VoteCast) -> None:
+        self._votes[event.vote.voter_id] = event.vote
+
+    def show_phase(self, event: PhaseCompleted) -> None:
+        held, show = (self._responses, show_response) if event.phase == "responses" else (self._votes, show_vote)
+        for agent_id in event.order:
+            if agent_id in held:
+                show(held.pop(agent_id))
+        held.clear()
+
+
+def show_elimination(event: AgentEliminated) -> None:
+    e = event.elimination
+    console.print(f"[red]☠ {e.agent_name} eliminated after {e.rounds_survived} rounds[/red]")
+
+
+def show_replacement(event: AgentReplaced) -> None:
+    console.print(f"[green]✦ New challenger: {event.agent.name}[/green]")
+    console.print(f"  Strategy: {event.strategy_notes}")
+    console.print(f"  Assigned model: {event.agent.model}")
+
+
+def log_round(event: RoundTallied) -> None:
+    append_round(event.result)
+
+
+def record_metrics(event: RoundTallied) -> None:
+    export_metrics(event.result)
+
+
+def save_round(event: RoundCompleted) -> None:
+    """Save the state, then drop the journal entries it now covers."""
+    if feedback.EXPORT_FEEDBACK_MD:
+        feedback.export_feedback(event.state)
+    save_state(event.state)
+    clear_journal(through_round=event.round_number)
+
+
+def standard_bus() -> EventBus:
+    """A bus with the arena's own subscribers: console, round log, metrics and persistence."""
+    bus = EventBus()
+    bus.subscribe("console", ConsoleView().handlers())
+    bus.subscribe("logs", {RoundTallied: log_round})
+    bus.subscribe("metrics", {RoundTallied: record_metrics})
+    bus.subscribe("persistence", {RoundCompleted: save_round})
+    return bus
+
+
+_bus: EventBus | None = None
+
+
+def get_bus() -> EventBus:
+    """The process-wide bus, started with the standard subscribers on first use (or after a close)."""
+    global _bus
+    if _bus is None or _bus.closed:
+        _bus = standard_bus()
+    return _bus
+
+
+def publish(event: ArenaEvent) -> None:
+    """Publish on the process-wide bus."""
+    get_bus().publish(event)
+
+
+def flush(*names: str) -> None:
+    """Wait for subscribers of the process-wide bus, if one is running."""
+    if _bus is not None and not _bus.closed:
+        _bus.flush(*names)
+
+
+def shutdown() -> None:
+    """Flush and stop the process-wide bus. Runs at exit too, so queued writes aren't lost."""
+    if _bus is not None:
+        _bus.close()
+
+
+atexit.register(shutdown)
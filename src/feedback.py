@@ -0,0 +1,109 @@
+from . import utils
+from .models import ArenaState, FeedbackEntry, RoundResult, VoteReason
+from .tracing import traced
+
+# Also write the history to data/feedback.md after each round, for humans.
+# Nothing reads it back.
+EXPORT_FEEDBACK_MD = True
+
+_HEADER = "# Arena Feedback\n\nRecent voting patterns and eliminations.\n\n"
+
+
+def build_feedback_entry(result: RoundResult, state: ArenaState) -> FeedbackEntry:
+    """Summarise a finished round as a typed history entry."""
+    return _entry(result, [(agent.name, agent.personality_id) for agent in state.agents])
+
+
+def logged_feedback_entry(result: RoundResult) -> FeedbackEntry:
+    """The history entry for a logged round, without the arena state: its agents are those who answered."""
+    return _entry(result, [(r.agent_name, r.agent_id) for r in result.responses])
+
+
+def _entry(result: RoundResult, agents: list[tuple[str, str]]) -> FeedbackEntry:
+    vote_counts = [(name, result.vote_tally.get(agent_id, 0)) for name, agent_id in agents]
+    vote_counts.sort(key=lambda x: x[1], reverse=True)
+
+    reasons = [
+        VoteReason(voter_name=v.voter_name, voted_for_name=v.voted_for_name, reasoning=_shorten(v.reasoning))
+        for v in result.votes
+    ]
+
+    return FeedbackEntry(
+        round_number=result.round_number,
+        question=result.question,
+        vote_counts=vote_counts,
+        reasons=reasons,
+    )
+
+
+def _shorten(reasoning: str | None) -> str | None:
+    """With digests on, long vote reasons are cut down the same way before entering history."""
+    # Imported here: digest needs the LLM client, whose prompts are budgeted with this module
+    from . import digest
+    if reasoning is None or digest.DIGEST_MODE is None:
+        return reasoning
+    return digest.extractive_digest(reasoning, digest.REASON_MAX_CHARS)
+
+
+@traced
+def record_feedback(state: ArenaState, entry: FeedbackEntry) -> None:
+    """Add a round to the history; the oldest round drops off past FEEDBACK_ROUNDS.
+
+    data/feedback.md is rewritten when the round is saved (see events.save_round).
+    """
+    state.feedback.append(entry)
+
+
+def render_entry(entry: FeedbackEntry) -> str:
+    """Markdown for one round. Rendered once per entry, then reused."""
+    if entry._rendered is None:
+        votes_str = ", ".join(f"{name}→{count}" for name, count in entry.vote_counts)
+        reasons_str = "\n".join(
+            f"- {r.voter_name}→{r.voted_for_name}: \"{r.reasoning or '(no reason given)'}\""
+            for r in entry.reasons
+        )
+        entry._rendered = f"""## Round {entry.round_number}
+Question: {entry.question}
+Votes: {votes_str}
+
+Why agents voted:
+{reasons_str}
+"""
+    return entry._rendered
+
+
+def render_brief_entry(entry: FeedbackEntry) -> str:
+    """One round without its vote reasons, for history trimmed to fit a context window."""
+    votes_str = ", ".join(f"{name}→{count}" for name, count in entry.vote_counts)
+    return f"""## Round {entry.round_number}
+Question: {entry.question}
+Votes: {votes_str}
+"""
+
+
+def render_history(entries: list[FeedbackEntry], brief: int = 0, omitted: int = 0) -> str:
+    """History text for entries, the oldest `brief` of them without vote reasons.
+
+    omitted is how many older rounds were left out, noted at the top.
+    """
+    if not entries:
+        return ""
+    note = f"({omitted} older round(s) omitted to fit the context window.)\n\n" if omitted else ""
+    parts = [render_brief_entry(e) if i < brief else render_entry(e) for i, e in enumerate(entries)]
+    return _HEADER + note + "\n".join(parts)
+
+
+@traced
+def render_feedback(state: ArenaState) -> str:
+    """The arena history shown in prompts, memoised until the next round is recorded."""
+    if not state.feedback:
+        return ""
+    latest = state.feedback[-1].round_number
+    if state._feedback_text is None or state._feedback_text[0] != latest:
+        state._feedback_text = (latest, render_history(list(state.feedback)))
+    return state._feedback_text[1]
+
+
+def export_feedback(state: ArenaState) -> None:
+    """Write the current history to data/feedback.md."""
+    utils.atomic_write_text(utils.FEEDBACK_FILE, render_feedback(state))
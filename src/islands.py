@@ -0,0 +1,268 @@
+import argparse
+import contextlib
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from . import utils
+from .batch import (
+    SHARED_MAX_CONCURRENT_CALLS,
+    _init_worker,
+    arena_summary,
+    load_questions,
+    show_batch_summary,
+    use_arena_dir,
+)
+from .main import TOTAL_ROUNDS
+from .models import Agent, ArenaState, Elimination, Personality
+from .persistence import load_state, save_state
+from .personality_store import PersonalityStore, get_store
+from .voting import average_votes
+
+console = Console()
+
+# Rounds each island plays between migrations
+MIGRATION_INTERVAL = 6
+# Best agents each island sends to the next one at every migration
+MIGRANTS_PER_ISLAND = 1
+
+
+def run_island(
+    island: int,
+    seed: int,
+    questions: list[str],
+    island_dir: Path,
+    starters_dir: Path,
+    until_round: int,
+) -> dict:
+    """Play one island up to until_round in its own data/log directory and return a summary."""
+    from .main import initialize_arena, run_arena
+
+    use_arena_dir(island_dir, starters_dir)
+    with open(island_dir / "console.log", "a") as out, contextlib.redirect_stdout(out):
+        state = load_state()
+        if not state.agents:
+            random.seed(seed)
+            state = initialize_arena()
+            state.id_prefix = f"i{island:03d}-"
+            state.inherit_from_parent = True
+            save_state(state)
+
+        done = state.current_round
+        schedule = [questions[r % len(questions)] for r in range(done, until_round)]
+        # Reseed per epoch, so later epochs don't replay the first one's model draws
+        state = run_arena(schedule, seed=seed * 1000 + done, total_rounds=until_round)
+
+    return {
+        "island": island,
+        "seed": seed,
+        "immigrants": state.immigrants,
+        "max_generation": max((a.generation for a in state.agents), default=0),
+        **arena_summary(state),
+    }
+
+
+def migrate(island_dirs: list[Path], starters_dir: Path, round_num: int, migrants: int) -> int:
+    """Ring migration after round_num: every island sends copies of its best agents to the next.
+
+    Emigrants are picked before anyone arrives, skipping names the
+    destination already has. Each arrival displaces the destination's
+    weakest agent. Islands that didn't reach round_num (a failed worker)
+    sit the migration out. Returns the number of migrants moved.
+    """
+    islands: list[tuple[Path, ArenaState, PersonalityStore]] = []
+    for island_dir in island_dirs:
+        use_arena_dir(island_dir, starters_dir)
+        state = load_state()
+        if state.current_round == round_num and state.migrated_at < round_num:
+            islands.append((island_dir, state, get_store()))
+    if len(islands) < 2:
+        return 0
+
+    ranked = [sorted(state.agents, key=average_votes, reverse=True) for _, state, _ in islands]
+    moved = 0
+    for i, (island_dir, state, store) in enumerate(islands):
+        origin_dir, _, origin_store = islands[i - 1]
+        present = {a.name for a in state.agents}
+        arrivals = [a for a in ranked[i - 1] if a.name not in present][:min(migrants, len(state.agents) // 2)]
+
+        use_arena_dir(island_dir, starters_dir)
+        for migrant, displaced in receive_migrants(state, arrivals, origin_store, store):
+            console.print(f"  {origin_dir.name} → {island_dir.name}: {migrant.name} replaces {displaced.name}")
+        state.migrated_at = round_num
+        save_state(state)
+        moved += len(arrivals)
+    return moved
+
+
+def receive_migrants(
+    state: ArenaState,
+    arrivals: list[Agent],
+    origin_store: PersonalityStore,
+    store: PersonalityStore,
+) -> list[tuple[Agent, Agent]]:
+    """Swap the island's weakest agents for copies of arriving ones. Returns (arrival, displaced) pairs.
+
+    Each copy is a new personality whose parent is the original, in the
+    same generation: migration copies, it doesn't breed. The original's
+    ancestry is copied into this island's store so lineage queries work here.
+    """
+    displaced = sorted(state.agents, key=average_votes)[:len(arrivals)]
+    pairs = list(zip(arrivals, displaced))
+    for migrant, loser in pairs:
+        state.immigrants += 1
+        personality = Personality(
+            id=f"{state.id_prefix}mig-{state.immigrants}",
+            name=migrant.name,
+            model=migrant.model,
+            persona=migrant.persona,
+            voting_criteria=migrant.voting_criteria,
+            generation=migrant.generation,
+            parent_id=migrant.personality_id,
+            born_round=state.current_round,
+        )
+        original = origin_store.get(migrant.personality_id)
+        lineage = origin_store.ancestors(migrant.personality_id) + ([original] if original else [])
+        store.put_many(lineage, replace=False)
+        store.put(personality)
+
+        state.elimination_history.append(Elimination(
+            agent_id=loser.personality_id,
+            agent_name=loser.name,
+            model=loser.model,
+            rounds_survived=loser.rounds_participated,
+            displaced_by=personality.id,
+        ))
+        store.mark_dead(loser.personality_id, state.current_round)
+
+        state.agents = [a for a in state.agents if a.personality_id != loser.personality_id]
+        state.agents.append(Agent(
+            personality_id=personality.id,
+            name=personality.name,
+            model=migrant.model,
+            persona=personality.persona,
+            voting_criteria=personality.voting_criteria,
+            generation=personality.generation,
+        ))
+    return pairs
+
+
+def run_islands(
+    questions: list[str],
+    islands: int,
+    out_dir: Path,
+    workers: int,
+    total_rounds: int = TOTAL_ROUNDS,
+    migration_interval: int = MIGRATION_INTERVAL,
+    migrants: int = MIGRANTS_PER_ISLAND,
+    max_concurrent_calls: int = SHARED_MAX_CONCURRENT_CALLS,
+) -> list[dict]:
+    """Run islands concurrently in epochs of migration_interval rounds, migrating between epochs.
+
+    Islands are independent arenas in a process pool sharing one LLM call
+    budget, as in batch runs. An interrupted run resumes from each
+    island's saved state.
+    """
+    if not questions:
+        raise ValueError("Question file contains no questions")
+
+    island_dirs = [out_dir / f"island-{i:03d}" for i in range(islands)]
+    starters_dir = utils.PERSONALITIES_DIR
+    ctx = multiprocessing.get_context("spawn")
+    slots = ctx.BoundedSemaphore(max_concurrent_calls)
+    summaries: list[dict] = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(slots,),
+    ) as pool:
+        for epoch_end in range(migration_interval, total_rounds + migration_interval, migration_interval):
+            until = min(epoch_end, total_rounds)
+            futures = {
+                pool.submit(run_island, i, i, questions, island_dir, starters_dir, until): i
+                for i, island_dir in enumerate(island_dirs)
+            }
+            summaries = []
+            for future in as_completed(futures):
+                island = futures[future]
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    console.print(f"[red]✗ Island {island} failed: {e}[/red]")
+            console.print(f"[green]✓ Round {until}: {len(summaries)}/{islands} islands[/green]")
+
+            if until < total_rounds:
+                moved = migrate(island_dirs, starters_dir, until, migrants)
+                console.print(f"[cyan]⇄ {moved} migrant(s) moved[/cyan]")
+
+    return sorted(summaries, key=lambda s: s["island"])
+
+
+def show_island_summary(summaries: list[dict]) -> None:
+    """Per-island turnover and lineage depth, then the batch survival tables."""
+    if summaries:
+        table = Table(title=f"{len(summaries)} islands")
+        table.add_column("Island", justify="right")
+        table.add_column("Survivors")
+        table.add_column("Eliminated", justify="right")
+        table.add_column("Displaced", justify="right")
+        table.add_column("Immigrants", justify="right")
+        table.add_column("Deepest generation", justify="right")
+        for s in summaries:
+            displaced = sum(1 for e in s["eliminations"] if e["displaced_by"])
+            table.add_row(
+                str(s["island"]),
+                ", ".join(a["name"] for a in s["survivors"]),
+                str(len(s["eliminations"]) - displaced),
+                str(displaced),
+                str(s["immigrants"]),
+                str(s["max_generation"]),
+            )
+        console.print(table)
+    show_batch_summary(summaries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run an island-model tournament with migration.")
+    parser.add_argument("questions", type=Path, help="Question file, one per line")
+    parser.add_argument("--islands", type=int, default=8, help="Number of islands (5 agents each)")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--rounds", type=int, default=TOTAL_ROUNDS, help="Rounds per island")
+    parser.add_argument(
+        "--migration-interval", type=int, default=MIGRATION_INTERVAL, help="Rounds between migrations"
+    )
+    parser.add_argument(
+        "--migrants", type=int, default=MIGRANTS_PER_ISLAND, help="Agents each island sends per migration"
+    )
+    parser.add_argument("--out", type=Path, default=Path("runs/islands"), help="Output directory")
+    parser.add_argument(
+        "--max-concurrent-calls",
+        type=int,
+        default=SHARED_MAX_CONCURRENT_CALLS,
+        help="LLM calls in flight across all islands",
+    )
+    args = parser.parse_args()
+    if args.migration_interval < 1:
+        parser.error("--migration-interval must be at least 1")
+
+    summaries = run_islands(
+        load_questions(args.questions),
+        args.islands,
+        args.out,
+        args.workers,
+        total_rounds=args.rounds,
+        migration_interval=args.migration_interval,
+        migrants=args.migrants,
+        max_concurrent_calls=args.max_concurrent_calls,
+    )
+    show_island_summary(summaries)
+
+
+if __name__ == "__main__":
+    main()
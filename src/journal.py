@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+
+from . import utils
+from .models import Response, Vote
+from .tracing import traced
+
+# The journal (utils.JOURNAL_FILE) is an append-only record of every
+# finished call in the round in progress
+
+# Held while the journal file is read or written, since rounds are cleared
+# from it on the persistence subscriber's thread while the next round runs
+_lock = threading.Lock()
+
+
+def append_journal(round_number: int, kind: str, payload: dict) -> None:
+    """Durably append one entry ("question", "response" or "vote") for a round."""
+    line = json.dumps({"round": round_number, "kind": kind, "data": payload}, default=str)
+    with _lock, open(utils.JOURNAL_FILE, "a") as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(round_number: int) -> tuple[str | None, dict[str, Response], dict[str, Vote]]:
+    """Return the question, responses and votes already recorded for a round.
+
+    Responses are keyed by agent_id, votes by voter_id. A torn final line
+    from a crash mid-write is ignored.
+    """
+    question = None
+    responses: dict[str, Response] = {}
+    votes: dict[str, Vote] = {}
+
+    with _lock:
+        if not utils.JOURNAL_FILE.exists():
+            return question, responses, votes
+        with open(utils.JOURNAL_FILE) as f:
+            lines = f.readlines()
+
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if entry["round"] != round_number:
+            continue
+
+        if entry["kind"] == "question":
+            question = entry["data"]["question"]
+        elif entry["kind"] == "response":
+            response = Response(**entry["data"])
+            responses[response.agent_id] = response
+        elif entry["kind"] == "vote":
+            vote = Vote(**entry["data"])
+            votes[vote.voter_id] = vote
+
+    return question, responses, votes
+
+
+@traced
+def clear_journal(through_round: int | None = None) -> None:
+    """Drop journal entries once the rounds they cover are safely in the saved state.
+
+    With through_round, entries of later rounds (already under way) are kept.
+    """
+    with _lock:
+        if through_round is None or not utils.JOURNAL_FILE.exists():
+            utils.JOURNAL_FILE.unlink(missing_ok=True)
+            return
+        keep = []
+        with open(utils.JOURNAL_FILE) as f:
+            for line in f:
+                try:
+                    if json.loads(line)["round"] > through_round:
+                        keep.append(line)
+                except json.JSONDecodeError:
+                    continue
+        if keep:
+            utils.atomic_write_text(utils.JOURNAL_FILE, "".join(keep))
+        else:
+            utils.JOURNAL_FILE.unlink()
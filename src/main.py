@@ -2,17 +2,17 @@ import random
 
 from rich.console import Console
 
-from .elimination import run_elimination_phase
+from . import tracing
+from .cache import get_cache
+from .elimination import META_MODEL, run_elimination_phase
+from .events import RoundCompleted, RoundTallied, publish, shutdown
+from .feedback import build_feedback_entry, record_feedback
+from .journal import read_journal
 from .models import ArenaState, RoundResult
+from .persistence import load_state
+from .personality_store import get_store
 from .round_runner import run_round
-from .utils import (
-    create_agents,
-    load_personalities,
-    load_state,
-    save_feedback,
-    save_round_log,
-    save_state,
-)
+from .utils import create_agents
 
 console = Console()
 
@@ -25,10 +25,7 @@ def initialize_arena() -> ArenaState:
     console.print("[bold]Initializing Arena...[/bold]")
     
     state = ArenaState()
-    personalities = load_personalities()
-    
-    # Filter to starter personalities only
-    starters = [p for p in personalities if p.id.startswith("starter-")]
+    starters = get_store().starters()
     
     if len(starters) < 5:
         raise ValueError(f"Need 5 starter personalities, found {len(starters)}")
@@ -42,74 +39,123 @@ def initialize_arena() -> ArenaState:
     return state
 
 
-def build_round_summary(result: RoundResult, state: ArenaState) -> str:
-    """Build a summary string for the feedback file."""
-    
-    # Vote counts (sorted by votes descending)
-    vote_counts = []
-    for agent in state.agents:
-        count = result.vote_tally.get(agent.personality_id, 0)
-        vote_counts.append((agent.name, count))
-    vote_counts.sort(key=lambda x: x[1], reverse=True)
-    votes_str = ", ".join([f"{name}→{count}" for name, count in vote_counts])
-    
-    # Voting reasons
-    reasons = []
-    for vote in result.votes:
-        reason = vote.reasoning or "(no reason given)"
-        reasons.append(f"- {vote.voter_name}→{vote.voted_for_name}: \"{reason}\"")
-    reasons_str = "\n".join(reasons)
-    
-    summary = f"""## Round {result.round_number}
-Question: {result.question}
-Votes: {votes_str}
-
-Why agents voted:
-{reasons_str}
-"""
-    return summary
-
+def run_arena(
+    questions: list[str] | None = None,
+    seed: int | None = None,
+    total_rounds: int = TOTAL_ROUNDS,
+) -> ArenaState:
+    """Run the full arena for total_rounds and return the final state.
 
-def run_arena(questions: list[str] | None = None) -> None:
-    """Run the full arena for TOTAL_ROUNDS."""
+    Pass a seed to make model assignment reproducible, e.g. when replaying
+    a recorded arena from the response cache.
+    """
+    
+    if seed is not None:
+        random.seed(seed)
+    tracing.reset()
     
     # Try to resume existing state, or initialize fresh
     state = load_state()
     if not state.agents:
         state = initialize_arena()
     
-    console.print(f"\n[bold green]Starting Arena — {TOTAL_ROUNDS} rounds[/bold green]\n")
-    
-    rounds_to_run = TOTAL_ROUNDS - state.current_round
-    
-    for i in range(rounds_to_run):
-        # Get question
-        if questions and i < len(questions):
-            question = questions[i]
-        else:
-            question = console.input("\n[yellow]Enter question for this round:[/yellow] ")
-        
-        # Run round
-        result = run_round(state, question)
-        
-        # Build and save feedback
-        summary = build_round_summary(result, state)
-        save_feedback(summary)
-        
-        # Save round log
-        save_round_log(result.model_dump(), result.round_number)
+    console.print(f"\n[bold green]Starting Arena — {total_rounds} rounds[/bold green]\n")
+    diversity = open_diversity_index()
+    
+    rounds_to_run = total_rounds - state.current_round
+    
+    try:
+        for i in range(rounds_to_run):
+            with tracing.span("round", round=state.current_round + 1):
+                # Get question; an interrupted round resumes with its original question
+                pending_question, _, _ = read_journal(state.current_round + 1)
+                if pending_question is not None:
+                    question = pending_question
+                elif questions and i < len(questions):
+                    question = questions[i]
+                else:
+                    question = console.input("\n[yellow]Enter question for this round:[/yellow] ")
+                
+                # Run round; if eliminations are due, keep the meta-model warm and
+                # draft replacements for likely eliminations while the arena votes
+                elimination_due = (state.current_round + 1) % ELIMINATION_INTERVAL == 0
+                result = run_round(
+                    state,
+                    question,
+                    next_model=META_MODEL if elimination_due else None,
+                    speculate=elimination_due,
+                )
+                
+                if diversity is not None:
+                    result.diversity = diversity.add_round(result)
+                    show_round_diversity(result)
+                
+                # Add the round to the arena history agents see
+                record_feedback(state, build_feedback_entry(result, state))
+                
+                # Round log and metrics are written in the background
+                publish(RoundTallied(round_number=result.round_number, result=result))
+                
+                # Check eliminations every N rounds
+                if state.current_round % ELIMINATION_INTERVAL == 0:
+                    run_elimination_phase(state)
+                
+                # Save a copy of the state in the background; the round's journal
+                # entries are dropped once it is saved
+                publish(RoundCompleted(round_number=state.current_round, state=state.model_copy(deep=True)))
+            
+            console.print(f"\n[dim]Round {state.current_round} complete.[/dim]")
         
-        # Check eliminations every N rounds
-        if state.current_round % ELIMINATION_INTERVAL == 0:
-            run_elimination_phase(state)
-        
-        # Save state after each round
-        save_state(state)
-        
-        console.print(f"\n[dim]Round {state.current_round} complete. State saved.[/dim]")
+    finally:
+        # Let subscribers finish every queued write, also on Ctrl-C or an error
+        shutdown()
     
     console.print("\n[bold green]Arena complete![/bold green]")
     show_final_stats(state)
+    if diversity is not None:
+        show_diversity_drift(diversity)
+    if tracing.TRACING:
+        tracing.show_trace_summary()
+        console.print(f"[dim]Trace written to {tracing.export_trace()}[/dim]")
+    return state
+
+
+def open_diversity_index():
+    """Answer-similarity index caught up with the round log, or None without NumPy."""
+    try:
+        from .embeddings import DiversityIndex
+    except ImportError:
+        return None
+    return DiversityIndex.from_log()
+
+
+def show_round_diversity(result: RoundResult) -> None:
+    """One summary line on how alike the round's answers were."""
+    d = result.diversity
+    if d is None or d.similarity is None:
+        return
+    names = {r.agent_id: r.agent_name for r in result.responses}
+    line = (
+        f"Answer similarity: {d.similarity:.2f} (most alike: "
+        f"{' & '.join(names[a] for a in d.most_similar)} {d.max_similarity:.2f})"
+    )
+    if d.centroid_similarity is not None:
+        line += f", vs last round {d.centroid_similarity:.2f}"
+    if d.self_similarity is not None:
+        line += f", vs own last answer {d.self_similarity:.2f}"
+    console.print(f"[dim]{line}[/dim]")
+
+
+def show_diversity_drift(diversity) -> None:
+    """Whether answers grew more alike over the run."""
+    drift = diversity.drift()
+    if drift is None:
+        return
+    first, last = drift
+    console.print(
+        f"\n[bold]Answer similarity:[/bold] {first:.2f} at the start → {last:.2f} at the end "
+        f"({diversity.store.embedder.name})"
+    )
 
 
 def show_final_stats(state: ArenaState) -> None:
@@ -126,7 +172,42 @@ def show_final_stats(state: ArenaState) -> None:
     console.print(f"\n[bold]Total Eliminations:[/bold] {len(state.elimination_history)}")
     for e in state.elimination_history:
         console.print(f"  {e.agent_name} ({e.model}) — survived {e.rounds_survived} rounds")
+    
+    show_vote_analytics()
+    
+    cache = get_cache().stats()
+    console.print(
+        f"\n[bold]Response cache:[/bold] {cache['hits']} hits, {cache['misses']} misses, "
+        f"{cache['evictions']} evictions ({cache['entries']} entries)"
+    )
+
+
+def show_vote_analytics() -> None:
+    """Model fitness, ratings and voting blocs from the round log, if NumPy is installed."""
+    try:
+        from .analytics import VoteAnalytics
+    except ImportError:
+        return
+    
+    analytics = VoteAnalytics.from_log()
+    if not analytics.round_numbers:
+        return
+    names = dict(zip(analytics.agent_ids, analytics.names))
+    
+    console.print("\n[bold]Model fitness[/bold] (votes per agent-round):")
+    for model, score in sorted(analytics.model_fitness().items(), key=lambda m: m[1], reverse=True):
+        console.print(f"  {model}: {score:.2f}")
+    
+    console.print("\n[bold]Ratings[/bold] (Bradley-Terry / Elo):")
+    elo = analytics.elo_ratings()
+    ratings = sorted(analytics.bradley_terry().items(), key=lambda r: r[1], reverse=True)
+    for agent_id, rating in ratings[:10]:
+        console.print(f"  {names[agent_id]}: {rating:.0f} / {elo[agent_id]:.0f}")
+    
+    console.print(f"\n[bold]Vote reciprocity:[/bold] {analytics.reciprocity():.0%}")
+    for bloc in analytics.blocs():
+        console.print(f"  Bloc: {', '.join(names[a] for a in bloc)}")
 
 
 if __name__ == "__main__":
-    run_arena()
\ No newline at end of file
+    run_arena()
@@ -0,0 +1,98 @@
+import json
+
+from . import utils
+from .models import CallMetrics, Response, RoundMetrics, RoundResult, Vote
+from .tracing import traced
+
+PROMETHEUS_PREFIX = "llm_arena"
+
+
+def call_metrics(result: dict, wall_seconds: float, cached: bool = False) -> CallMetrics:
+    """Metrics for a single chat result as returned by ArenaClient."""
+    if cached:
+        return CallMetrics(calls=1, cache_hits=1, wall_seconds=wall_seconds)
+    return CallMetrics(
+        calls=1,
+        prompt_eval_count=result.get("prompt_eval_count") or 0,
+        eval_count=result.get("eval_count") or 0,
+        load_seconds=(result.get("load_duration") or 0) / 1e9,
+        prompt_eval_seconds=(result.get("prompt_eval_duration") or 0) / 1e9,
+        eval_seconds=(result.get("eval_duration") or 0) / 1e9,
+        wall_seconds=wall_seconds,
+    )
+
+
+def add_metrics(a: CallMetrics, b: CallMetrics) -> CallMetrics:
+    """Field-wise sum of two metrics."""
+    return CallMetrics(**{field: getattr(a, field) + getattr(b, field) for field in CallMetrics.model_fields})
+
+
+def aggregate_round(responses: list[Response], votes: list[Vote]) -> RoundMetrics:
+    """Sum a round's per-call metrics in total, by phase, by agent and by model."""
+    round_metrics = RoundMetrics()
+    calls = [("response", r.agent_id, r.model, r.metrics) for r in responses]
+    models = {r.agent_id: r.model for r in responses}
+    calls += [
+        ("digest", r.agent_id, r.digest.method, r.digest.metrics)
+        for r in responses
+        if r.digest is not None and r.digest.metrics.calls
+    ]
+    calls += [("vote", v.voter_id, models.get(v.voter_id, "unknown"), v.metrics) for v in votes]
+
+    for phase, agent_id, model, metrics in calls:
+        round_metrics.total = add_metrics(round_metrics.total, metrics)
+        for breakdown, key in (
+            (round_metrics.by_phase, phase),
+            (round_metrics.by_agent, agent_id),
+            (round_metrics.by_model, model),
+        ):
+            breakdown[key] = add_metrics(breakdown.get(key, CallMetrics()), metrics)
+
+    return round_metrics
+
+
+@traced
+def export_metrics(result: RoundResult) -> None:
+    """Append the round to logs/metrics.jsonl and rewrite logs/metrics.prom.
+
+    The .prom file holds the latest round in Prometheus text format, for a
+    node_exporter textfile collector or a quick look.
+    """
+    utils.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+    record = {
+        "round": result.round_number,
+        "timestamp": result.timestamp.isoformat(),
+        "model_loads": result.model_loads,
+        "model_load_seconds": result.model_load_seconds,
+        **result.metrics.model_dump(),
+        "diversity": result.diversity.model_dump() if result.diversity else None,
+    }
+    with open(utils.LOGS_DIR / "metrics.jsonl", "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    utils.atomic_write_text(utils.LOGS_DIR / "metrics.prom", render_prometheus(result))
+
+
+def render_prometheus(result: RoundResult) -> str:
+    """Latest-round gauges, labelled by phase and by model."""
+    lines = [
+        f"# HELP {PROMETHEUS_PREFIX}_round Round these metrics describe",
+        f"# TYPE {PROMETHEUS_PREFIX}_round gauge",
+        f"{PROMETHEUS_PREFIX}_round {result.round_number}",
+        f"# TYPE {PROMETHEUS_PREFIX}_model_loads gauge",
+        f"{PROMETHEUS_PREFIX}_model_loads {result.model_loads}",
+    ]
+    if result.diversity is not None:
+        for field in ("similarity", "centroid_similarity", "self_similarity"):
+            value = getattr(result.diversity, field)
+            if value is not None:
+                name = f"{PROMETHEUS_PREFIX}_answer_{field}"
+                lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    for field in CallMetrics.model_fields:
+        name = f"{PROMETHEUS_PREFIX}_round_{field}"
+        lines.append(f"# TYPE {name} gauge")
+        for label, breakdown in (("phase", result.metrics.by_phase), ("model", result.metrics.by_model)):
+            for key, metrics in sorted(breakdown.items()):
+                lines.append(f'{name}{{{label}="{key}"}} {getattr(metrics, field)}')
+    return "\n".join(lines) + "\n"
@@ -1,9 +1,13 @@
+from collections import deque
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+# Rounds of history kept in ArenaState.feedback and shown to agents
+FEEDBACK_ROUNDS = 5
 
 
 class Personality(BaseModel):
-    """Loaded from personality JSON files."""
+    """A persona definition, kept in the personality store (see personality_store.py)."""
     id: str
     name: str
     model: str | None = None  # Assigned at agent creation
@@ -28,6 +32,30 @@ class Agent(BaseModel):
     total_votes_received: int = 0
     rounds_without_votes: int = 0  # Reset to 0 when they get a vote
     rounds_participated: int = 0
+    normalized_votes_received: float = 0.0  # Votes scaled by how many ballots they were on
+
+
+class CallMetrics(BaseModel):
+    """Ollama-reported costs of one or more LLM calls. Durations are in seconds."""
+    calls: int = 0
+    retries: int = 0  # Calls beyond the first for the same vote
+    name_repairs: int = 0  # Votes whose name only matched after normalising or fuzzy matching
+    fallbacks: int = 0  # Votes that ended in a random choice after every retry failed
+    cache_hits: int = 0  # Served from the response cache; no tokens counted
+    history_tokens_trimmed: int = 0  # Estimated arena-history tokens cut to fit the context window
+    prompt_eval_count: int = 0  # Prompt tokens evaluated (prompt-cache misses)
+    eval_count: int = 0  # Tokens generated
+    load_seconds: float = 0.0
+    prompt_eval_seconds: float = 0.0
+    eval_seconds: float = 0.0
+    wall_seconds: float = 0.0  # Includes waiting for a concurrency slot
+
+
+class Digest(BaseModel):
+    """A length-bounded stand-in for a response, shown to voters instead of it."""
+    text: str
+    method: str  # "extractive", or the model that wrote it
+    metrics: CallMetrics = Field(default_factory=CallMetrics)
 
 
 class Response(BaseModel):
@@ -36,6 +64,10 @@ class Response(BaseModel):
     agent_name: str
     model: str
     content: str
+    truncated: bool = False  # Cut off by a token or time budget
+    truncation_reason: str | None = None  # "tokens" or "time"
+    digest: Digest | None = None  # Set when the round digests long answers
+    metrics: CallMetrics = Field(default_factory=CallMetrics)
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -46,6 +78,26 @@ class Vote(BaseModel):
     voted_for_id: str
     voted_for_name: str
     reasoning: str | None = None  # Why they voted this way
+    metrics: CallMetrics = Field(default_factory=CallMetrics)  # Summed over retries
+
+
+class RoundMetrics(BaseModel):
+    """A round's call metrics, in total and broken down three ways."""
+    total: CallMetrics = Field(default_factory=CallMetrics)
+    by_phase: dict[str, CallMetrics] = {}  # "response" / "vote"
+    by_agent: dict[str, CallMetrics] = {}  # agent_id
+    by_model: dict[str, CallMetrics] = {}
+
+
+class RoundDiversity(BaseModel):
+    """How alike a round's answers were, by cosine similarity of their embeddings."""
+    embedder: str
+    similarity: float | None = None  # Mean over every pair of answers; None with fewer than two
+    min_similarity: float | None = None
+    max_similarity: float | None = None
+    most_similar: list[str] = []  # agent_ids of the most alike pair
+    centroid_similarity: float | None = None  # This round's mean answer against the previous round's
+    self_similarity: float | None = None  # Each agent's answer against its own previous one, averaged
 
 
 class RoundResult(BaseModel):
@@ -54,15 +106,39 @@ class RoundResult(BaseModel):
     responses: list[Response]
     votes: list[Vote]
     vote_tally: dict[str, int]  # agent_id -> vote count this round
+    ballots: dict[str, list[str]] = {}  # voter_id -> candidate agent_ids they judged
+    normalized_tally: dict[str, float] = {}  # agent_id -> votes scaled by exposure
+    model_loads: int = 0  # Models Ollama had to load this round
+    model_load_seconds: float = 0.0
+    metrics: RoundMetrics = Field(default_factory=RoundMetrics)
+    diversity: RoundDiversity | None = None  # Set when NumPy is installed (see embeddings.py)
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class VoteReason(BaseModel):
+    """Why one agent voted for another, as shown in arena history."""
+    voter_name: str
+    voted_for_name: str
+    reasoning: str | None = None
+
+
+class FeedbackEntry(BaseModel):
+    """One round of arena history: vote counts and the reasons behind them."""
+    round_number: int
+    question: str
+    vote_counts: list[tuple[str, int]]  # (agent name, votes), most votes first
+    reasons: list[VoteReason]
+
+    _rendered: str | None = PrivateAttr(default=None)  # Filled once by feedback.render_entry
+
+
 class Elimination(BaseModel):
     """Record of an eliminated agent."""
     agent_id: str
     agent_name: str
     model: str
     rounds_survived: int
+    displaced_by: str | None = None  # Migrant personality that took its place, for island runs
 
 
 class ArenaState(BaseModel):
@@ -76,4 +152,20 @@ class ArenaState(BaseModel):
         "mistral:7b",
         "phi4:14b"
     ]
-    elimination_history: list[Elimination] = []
\ No newline at end of file
+    elimination_history: list[Elimination] = []
+    voting_mode: str = "full"  # "full", "subset", "pairwise" or "swiss"; see voting.py
+    ballot_size: int = 3  # Answers each voter judges in "subset" mode
+    id_prefix: str = ""  # Prepended to generated personality ids; unique per island
+    inherit_from_parent: bool = False  # Steer replacements toward their parent's approach (island runs)
+    immigrants: int = 0  # Migrants received from other islands
+    migrated_at: int = 0  # Round after which this island last exchanged migrants
+    feedback: deque[FeedbackEntry] = Field(default_factory=lambda: deque(maxlen=FEEDBACK_ROUNDS))
+
+    _feedback_text: tuple[int, str] | None = PrivateAttr(default=None)  # (round, rendered history)
+    _replacement_drafts: dict[str, dict] = PrivateAttr(default_factory=dict)  # personality_id -> persona drafted during voting
+
+    @field_validator("feedback")
+    @classmethod
+    def _bound_feedback(cls, value: deque[FeedbackEntry]) -> deque[FeedbackEntry]:
+        """Loaded state loses the deque's maxlen; restore it."""
+        return deque(value, maxlen=FEEDBACK_ROUNDS)
\ No newline at end of file
@@ -1,127 +1,424 @@
+import asyncio
+import difflib
 import json
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Callable
 
-import ollama
+from .backends import LLMBackend, make_backend
+from .cache import ResponseCache, get_cache
+from .context_budget import DEFAULT_OUTPUT_TOKENS, VOTE_OUTPUT_TOKENS, fit_prompt, preload_num_ctx
+from .metrics import add_metrics, call_metrics
+from .models import Agent, CallMetrics, FeedbackEntry, Response, Vote
+from .prompts import response_messages, vote_messages
+from .tracing import span, traced
 
-from .models import Agent, Response, Vote
+# Concurrency limits for in-flight LLM calls
+MAX_CONCURRENT_CALLS = 4
+MAX_CONCURRENT_PER_MODEL = 2
 
+# How long Ollama keeps a model resident after its last call
+KEEP_ALIVE = "10m"
 
-def generate_response(agent: Agent, question: str, feedback: str) -> Response:
-    """Generate an agent's response to the question."""
+# Response phase: stream answers live and cap runaway generations.
+# A budget of None disables that limit.
+STREAM_RESPONSES = True
+RESPONSE_MAX_TOKENS: int | None = 600  # per agent, sent as num_predict
+RESPONSE_TIME_BUDGET: float | None = 120.0  # seconds per agent, from first slot
+RESPONSE_PHASE_TIME_BUDGET: float | None = 300.0  # seconds for the whole phase
+RESPONSE_PHASE_MAX_TOKENS: int | None = 2400  # generated tokens for the whole phase, shared evenly
 
-    system_prompt = f"""You are {agent.name}, a competitor in a debate arena where agents answer questions and vote on each other's responses. Agents with zero votes for 3 consecutive rounds are eliminated.
+# Similarity (0-1) a misspelt vote needs to a valid name to be accepted
+VOTE_NAME_MATCH_CUTOFF = 0.8
 
-Your personality:
-{agent.persona}
+# Cross-process call budget, shared by batch workers (see set_shared_slots)
+_shared_slots = None
 
-Arena history:
-{feedback if feedback else "(No history yet)"}
 
-Rules:
-- Stay true to your personality
-- Be concise but distinctive
-- Your goal is to give a response that other agents will vote for
+def set_shared_slots(slots) -> None:
+    """Share a multiprocessing semaphore that caps calls across all processes."""
+    global _shared_slots
+    _shared_slots = slots
 
-Do NOT include your vote in this response. Voting happens separately."""
 
-    result = ollama.chat(
-        model=agent.model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question},
-        ],
+async def _acquire_shared(slots) -> None:
+    """Take a cross-process slot without blocking the loop.
+
+    The blocking acquire runs in a thread, which can't be interrupted. If
+    the call is cancelled meanwhile, whichever side finishes last hands the
+    slot back, so a cancelled call never keeps one.
+    """
+    lock = threading.Lock()
+    outcome = {"acquired": False, "abandoned": False}
+
+    def acquire() -> None:
+        slots.acquire()
+        with lock:
+            if outcome["abandoned"]:
+                slots.release()
+            else:
+                outcome["acquired"] = True
+
+    try:
+        await asyncio.to_thread(acquire)
+    except asyncio.CancelledError:
+        with lock:
+            if outcome["acquired"]:
+                slots.release()
+            else:
+                outcome["abandoned"] = True
+        raise
+
+
+class TokenPool:
+    """Generated tokens for a whole phase, shared out evenly among its calls.
+
+    A call claims its share when it starts: what is left, divided by the
+    calls yet to start. Tokens it doesn't use go back to the pool, so calls
+    that start late get at least the share they would have had up front.
+    """
+
+    def __init__(self, tokens: int, calls: int) -> None:
+        self.remaining = tokens
+        self.unclaimed = calls  # Calls yet to claim a share
+
+    def claim(self) -> int:
+        share = self.remaining // max(self.unclaimed, 1)
+        self.unclaimed = max(self.unclaimed - 1, 0)
+        self.remaining -= share
+        return share
+
+    def refund(self, tokens: int) -> None:
+        self.remaining += tokens
+
+
+class ArenaClient:
+    """Async LLM client with global and per-model concurrency limits.
+
+    Chat calls go through the response cache first; only misses reach the
+    backend (Ollama by default, see backends.make_backend).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_CALLS,
+        max_per_model: int = MAX_CONCURRENT_PER_MODEL,
+        cache: ResponseCache | None = None,
+        backend: LLMBackend | None = None,
+    ) -> None:
+        self.backend = backend or make_backend()
+        self.cache = cache if cache is not None else get_cache()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._max_per_model = max_per_model
+        self._per_model: dict[str, asyncio.Semaphore] = {}
+        self.keep_alive: dict[str, str | int] = {}  # model -> keep_alive override
+
+    @property
+    def offline(self) -> bool:
+        """True when every call must be served from the cache (replay mode)."""
+        return self.cache.mode == "replay"
+
+    @asynccontextmanager
+    async def _slot(self, model: str):
+        """Hold a per-model slot first, then a global one, then a cross-process one."""
+        if model not in self._per_model:
+            self._per_model[model] = asyncio.Semaphore(self._max_per_model)
+        async with self._per_model[model], self._global:
+            slots = _shared_slots
+            if slots is None:
+                yield
+                return
+            await _acquire_shared(slots)
+            try:
+                yield
+            finally:
+                slots.release()
+
+    async def chat(self, model: str, messages: list[dict], **kwargs):
+        """Issue a chat call once a slot for the model is free, unless it is cached.
+
+        Results served from the cache carry "cached": True.
+        """
+        key = ResponseCache.key(model, messages, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return {**cached, "cached": True}
+        if self.cache.mode != "off":
+            self.cache_misses += 1
+
+        kwargs.setdefault("keep_alive", self.keep_alive.get(model, KEEP_ALIVE))
+        async with self._slot(model):
+            with span("chat", model=model):
+                result = await self.backend.chat(model=model, messages=messages, **kwargs)
+
+        self.cache.put(key, model, result)
+        return result
+
+    async def chat_stream(
+        self,
+        model: str,
+        messages: list[dict],
+        on_text: Callable[[str], None] | None = None,
+        time_budget: float | None = None,
+        deadline: float | None = None,
+        token_pool: TokenPool | None = None,
+        **kwargs,
+    ) -> dict:
+        """Stream a chat call, reporting the text so far to on_text after each chunk.
+
+        Generation is cancelled once time_budget seconds have passed since the
+        call got its slot, or at the loop-time deadline, whichever is first.
+        With a token_pool, the call claims its share once it has a slot and
+        is cut off after that many streamed chunks (one token each). A
+        cancelled call returns the partial text with done_reason "timeout"
+        or "token_budget", keeps the token count and eval time gathered so
+        far, and is not cached.
+        """
+        key = ResponseCache.key(model, messages, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            if token_pool is not None:
+                token_pool.refund(token_pool.claim())  # Nothing generated: leave its share to others
+            if on_text:
+                on_text(cached["message"]["content"])
+            return {**cached, "cached": True}
+        if self.cache.mode != "off":
+            self.cache_misses += 1
+
+        kwargs.setdefault("keep_alive", self.keep_alive.get(model, KEEP_ALIVE))
+        text = ""
+        final: dict = {}
+        tokens = 0
+        first_token_ns = None
+        async with self._slot(model):
+            allowance = token_pool.claim() if token_pool is not None else None
+            loop = asyncio.get_running_loop()
+            limits = [t for t in (deadline, time_budget and loop.time() + time_budget) if t]
+            stream = self.backend.chat_stream(model=model, messages=messages, **kwargs)
+            try:
+                with span("chat_stream", model=model):
+                    async with asyncio.timeout_at(min(limits) if limits else None):
+                        async for chunk in stream:
+                            if chunk.get("done"):
+                                final = chunk
+                            else:
+                                tokens += 1
+                                first_token_ns = first_token_ns or time.perf_counter_ns()
+                            text += chunk["message"]["content"]
+                            if on_text:
+                                on_text(text)
+                            if not chunk.get("done") and allowance is not None and tokens >= allowance:
+                                break
+            except TimeoutError:
+                pass
+            finally:
+                await stream.aclose()
+                if token_pool is not None:
+                    token_pool.refund(max(allowance - tokens, 0))
+
+        if not final:
+            # Cut off: keep what was generated so far for the metrics
+            final = {
+                "model": model,
+                "done": True,
+                "done_reason": "token_budget" if allowance is not None and tokens >= allowance else "timeout",
+                "eval_count": tokens,
+                "eval_duration": time.perf_counter_ns() - first_token_ns if first_token_ns else 0,
+            }
+        result = {**final, "message": {"role": "assistant", "content": text}}
+        if final["done_reason"] not in ("timeout", "token_budget"):
+            self.cache.put(key, model, result)
+        return result
+
+    async def preload(self, model: str) -> float:
+        """Load a model without generating anything; return load seconds.
+
+        The model is loaded with the num_ctx its calls start at, so the first
+        call doesn't make Ollama load it again.
+        """
+        keep_alive = self.keep_alive.get(model, KEEP_ALIVE)
+        return await self.backend.load(model, keep_alive, preload_num_ctx(model))
+
+    async def unload(self, model: str) -> None:
+        """Ask the server to evict a model immediately."""
+        await self.backend.unload(model)
+
+    async def running_models(self) -> list[str]:
+        """Models currently resident on the server."""
+        return await self.backend.running_models()
+
+    async def model_sizes(self) -> dict[str, int]:
+        """Approximate memory footprint (bytes) of each installed model."""
+        return await self.backend.model_sizes()
+
+
+@traced
+async def generate_response(
+    client: ArenaClient,
+    agent: Agent,
+    question: str,
+    feedback: str,
+    on_text: Callable[[str], None] | None = None,
+    deadline: float | None = None,
+    history: list[FeedbackEntry] | None = None,
+    token_pool: TokenPool | None = None,
+) -> Response:
+    """Generate an agent's response to the question.
+
+    With STREAM_RESPONSES, on_text receives the text so far as it arrives and
+    the call is cut off at RESPONSE_TIME_BUDGET, the phase deadline or once
+    it has used its share of the phase's token_pool. Without streaming, the
+    tokens generated are only counted against the pool.
+    history, the entries feedback was rendered from, lets the oldest rounds
+    be trimmed if the prompt would overflow the model's context.
+    """
+
+    messages, options, trimmed = fit_prompt(
+        agent.model,
+        lambda text: response_messages(agent, question, text),
+        feedback,
+        history,
+        output_tokens=RESPONSE_MAX_TOKENS or DEFAULT_OUTPUT_TOKENS,
     )
+    if RESPONSE_MAX_TOKENS:
+        options["num_predict"] = RESPONSE_MAX_TOKENS
+    options = options or None
+    start = time.monotonic()
+
+    if STREAM_RESPONSES:
+        result = await client.chat_stream(
+            model=agent.model,
+            messages=messages,
+            on_text=on_text,
+            time_budget=RESPONSE_TIME_BUDGET,
+            deadline=deadline,
+            token_pool=token_pool,
+            options=options,
+        )
+    else:
+        result = await client.chat(model=agent.model, messages=messages, options=options)
+        if token_pool is not None:
+            used = 0 if result.get("cached") else result.get("eval_count") or 0
+            token_pool.refund(token_pool.claim() - used)
 
     content = result["message"]["content"]
+    truncation_reason = {"length": "tokens", "token_budget": "tokens", "timeout": "time"}.get(
+        result.get("done_reason")
+    )
+    metrics = call_metrics(result, time.monotonic() - start, result.get("cached", False))
+    metrics.history_tokens_trimmed = trimmed
 
     return Response(
         agent_id=agent.personality_id,
         agent_name=agent.name,
         model=agent.model,
         content=content,
+        truncated=truncation_reason is not None,
+        truncation_reason=truncation_reason,
+        metrics=metrics,
     )
 
 
-def generate_vote(
+@traced
+async def generate_vote(
+    client: ArenaClient,
     agent: Agent,
     question: str,
     responses: list[Response],
     feedback: str,
     max_retries: int = 2,
-) -> Vote:
-    """Generate an agent's vote for the best response."""
+    history: list[FeedbackEntry] | None = None,
+) -> Vote | None:
+    """Generate an agent's vote for the best response.
+
+    The JSON schema restricts `vote` to the valid names, and near misses
+    (case, punctuation, agent ids, typos) are resolved before retrying, so a
+    vote normally costs exactly one call. Returns None (the agent abstains)
+    when no one but the agent itself is on its ballot.
+    """
 
-    # Format responses for display (excluding self)
-    responses_text = ""
+    # Valid choices are everyone but self
     valid_names = []
     name_to_id = {}
     for r in responses:
         if r.agent_id != agent.personality_id:
-            responses_text += f"\n[{r.agent_name}]:\n{r.content}\n"
             valid_names.append(r.agent_name)
             name_to_id[r.agent_name] = r.agent_id
+    if not valid_names:
+        return None
 
     valid_names_str = ", ".join(valid_names)
-
-    system_prompt = f"""You are {agent.name}, voting on other agents' responses. Your vote is public.
-
-Your personality:
-{agent.persona}
-
-Your voting criteria:
-{agent.voting_criteria}
-
-Arena history:
-{feedback if feedback else "(No history yet)"}
-
-Rules:
-- You CANNOT vote for yourself
-- Vote based on your criteria
-- Valid choices: {valid_names_str}"""
-
-    user_prompt = f"""Question: {question}
-
-Responses:
-{responses_text}
-
-Vote for one agent by name. You must vote for one of: {valid_names_str}"""
+    messages, options, trimmed = fit_prompt(
+        agent.model,
+        lambda text: vote_messages(agent, question, responses, text, valid_names),
+        feedback,
+        history,
+        output_tokens=VOTE_OUTPUT_TOKENS,
+    )
+    metrics = CallMetrics(history_tokens_trimmed=trimmed)
 
     for attempt in range(max_retries):
-        result = ollama.chat(
-            model=agent.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            format={
-                "type": "object",
-                "properties": {
-                    "vote": {"type": "string"},
-                    "reasoning": {"type": "string"}
+        start = time.monotonic()
+        with span("vote_attempt", attempt=attempt):
+            result = await client.chat(
+                model=agent.model,
+                messages=messages,
+                format={
+                    "type": "object",
+                    "properties": {
+                        "vote": {"type": "string", "enum": valid_names},
+                        "reasoning": {"type": "string"}
+                    },
+                    "required": ["vote", "reasoning"]
                 },
-                "required": ["vote", "reasoning"]
-            },
+                options=options or None,
+            )
+        metrics = add_metrics(
+            metrics,
+            call_metrics(result, time.monotonic() - start, result.get("cached", False)),
         )
+        metrics.retries = attempt
 
         content = result["message"]["content"]
-        vote_data = json.loads(content)
-        voted_name = vote_data["vote"]
+        try:
+            vote_data = json.loads(content)
+            voted_name = str(vote_data["vote"])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            vote_data, voted_name = {}, content
 
-        if voted_name in valid_names:
+        resolved = resolve_vote_name(voted_name, name_to_id)
+        if resolved is not None:
+            if resolved != voted_name:
+                metrics.name_repairs += 1
             return Vote(
                 voter_id=agent.personality_id,
                 voter_name=agent.name,
-                voted_for_id=name_to_id[voted_name],
-                voted_for_name=voted_name,
+                voted_for_id=name_to_id[resolved],
+                voted_for_name=resolved,
                 reasoning=vote_data.get("reasoning"),
+                metrics=metrics,
             )
 
-        # Invalid vote, retry with stricter prompt
-        user_prompt = f"""Your previous vote "{voted_name}" was invalid. You cannot vote for yourself.
+        # Invalid vote: keep the responses in context and ask again
+        messages = messages + [
+            {"role": "assistant", "content": content},
+            {
+                "role": "user",
+                "content": f"""Your previous vote "{voted_name}" was invalid. You cannot vote for yourself.
 
-Vote again. You MUST choose one of: {valid_names_str}"""
+Vote again. You MUST choose one of: {valid_names_str}""",
+            },
+        ]
 
     # All retries failed, pick randomly
-    import random
+    metrics.fallbacks += 1
     fallback_name = random.choice(valid_names)
     return Vote(
         voter_id=agent.personality_id,
@@ -129,4 +426,36 @@ Vote again. You MUST choose one of: {valid_names_str}"""
         voted_for_id=name_to_id[fallback_name],
         voted_for_name=fallback_name,
         reasoning="(random fallback after invalid votes)",
-    )
\ No newline at end of file
+        metrics=metrics,
+    )
+
+
+def resolve_vote_name(raw: str, name_to_id: dict[str, str]) -> str | None:
+    """Map what a model wrote to a valid agent name, or None if nothing is close enough.
+
+    Tries, in order: exact match, case/whitespace/punctuation-insensitive
+    match, the agent's id, a unique name contained in the text, and a close
+    fuzzy match.
+    """
+    if raw in name_to_id:
+        return raw
+
+    def normalise(text: str) -> str:
+        return " ".join(re.sub(r"[^\w\s-]", " ", text).casefold().split())
+
+    wanted = normalise(raw)
+    by_normalised = {normalise(name): name for name in name_to_id}
+    by_normalised.update({normalise(agent_id): name for name, agent_id in name_to_id.items()})
+    if wanted in by_normalised:
+        return by_normalised[wanted]
+
+    # "I vote for Socrates" -> Socrates, if exactly one name appears
+    mentioned = {
+        name for key, name in by_normalised.items()
+        if re.search(rf"\b{re.escape(key)}\b", wanted)
+    }
+    if len(mentioned) == 1:
+        return mentioned.pop()
+
+    close = difflib.get_close_matches(wanted, list(by_normalised), n=1, cutoff=VOTE_NAME_MATCH_CUTOFF)
+    return by_normalised[close[0]] if close else None
@@ -0,0 +1,189 @@
+import json
+import os
+from pathlib import Path
+
+from . import utils
+from .models import ArenaState
+from .tracing import traced
+
+# Write a full snapshot every N saves; in between only deltas are appended
+SNAPSHOT_INTERVAL = 10
+
+_DELTAS = "deltas.jsonl"
+_SNAPSHOT_PREFIX = "snapshot-"
+
+# state dir -> (sequence number, JSON dump) of the last state saved or loaded there
+_last_saved: dict[Path, tuple[int, dict]] = {}
+
+
+@traced
+def save_state(state: ArenaState) -> None:
+    """Persist arena state: a delta against the previous save, or a periodic snapshot.
+
+    Snapshots are written atomically (temp file, fsync, rename) and deltas
+    are appended with an fsync, so a crash never leaves a half-written state.
+    """
+    state_dir = utils.STATE_DIR
+    state_dir.mkdir(parents=True, exist_ok=True)
+    data = state.model_dump(mode="json")
+
+    previous = _last_saved.get(state_dir)
+    if previous is None:
+        seq = _latest_seq(state_dir) + 1
+        _write_snapshot(state_dir, seq, data)
+    else:
+        seq = previous[0] + 1
+        if seq % SNAPSHOT_INTERVAL == 0:
+            _write_snapshot(state_dir, seq, data)
+        else:
+            _append_delta(state_dir, seq, _diff(previous[1], data))
+
+    _last_saved[state_dir] = (seq, data)
+
+
+@traced
+def load_state() -> ArenaState:
+    """Rebuild arena state from the latest snapshot plus the deltas after it.
+
+    Falls back to a legacy data/arena_state.json, or a fresh state.
+    """
+    state_dir = utils.STATE_DIR
+    snapshot = _latest_snapshot(state_dir)
+
+    if snapshot is None:
+        if utils.STATE_FILE.exists():
+            with open(utils.STATE_FILE) as f:
+                return ArenaState(**json.load(f))
+        return ArenaState()
+
+    with open(snapshot) as f:
+        record = json.load(f)
+    seq, data = record["seq"], record["state"]
+
+    for delta_seq, delta in _read_deltas(state_dir):
+        if delta_seq == seq + 1:
+            data = _apply(data, delta)
+            seq = delta_seq
+
+    _last_saved[state_dir] = (seq, data)
+    return ArenaState(**data)
+
+
+def _write_snapshot(state_dir: Path, seq: int, data: dict) -> None:
+    """Write a full snapshot, then drop deltas and snapshots it supersedes."""
+    path = state_dir / f"{_SNAPSHOT_PREFIX}{seq:08d}.json"
+    utils.atomic_write_text(path, json.dumps({"seq": seq, "state": data}))
+    # Only after the snapshot is durable may older history go
+    (state_dir / _DELTAS).unlink(missing_ok=True)
+    for old in state_dir.glob(f"{_SNAPSHOT_PREFIX}*.json"):
+        if old != path:
+            old.unlink()
+
+
+def _append_delta(state_dir: Path, seq: int, delta: dict) -> None:
+    line = json.dumps({"seq": seq, "delta": delta}) + "\n"
+    with open(state_dir / _DELTAS, "ab+") as f:
+        # Don't glue the new delta onto a line torn by a crash
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = "\n" + line
+        f.write(line.encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _latest_snapshot(state_dir: Path) -> Path | None:
+    snapshots = sorted(state_dir.glob(f"{_SNAPSHOT_PREFIX}*.json"))
+    return snapshots[-1] if snapshots else None
+
+
+def _latest_seq(state_dir: Path) -> int:
+    """Highest sequence number on disk, so a new writer never reuses one."""
+    snapshot = _latest_snapshot(state_dir)
+    seq = int(snapshot.stem.removeprefix(_SNAPSHOT_PREFIX)) if snapshot else 0
+    for delta_seq, _ in _read_deltas(state_dir):
+        seq = max(seq, delta_seq)
+    return seq
+
+
+def _read_deltas(state_dir: Path) -> list[tuple[int, dict]]:
+    """Deltas in file order; a torn final line from a crash is ignored."""
+    path = state_dir / _DELTAS
+    if not path.exists():
+        return []
+    deltas = []
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            deltas.append((record["seq"], record["delta"]))
+    return deltas
+
+
+def _diff(old: dict, new: dict) -> dict:
+    """Describe how to turn one state dump into the next.
+
+    Agents are diffed field by field, keyed on personality_id. Lists that
+    only grow at the end (or, like the feedback deque, also drop from the
+    front) are stored as drop/append. Everything else is set outright.
+    """
+    delta: dict = {"set": {}, "lists": {}}
+    for key, value in new.items():
+        if old.get(key) == value:
+            continue
+        if key == "agents":
+            delta["agents"] = _diff_agents(old.get(key, []), value)
+        elif isinstance(value, list) and isinstance(old.get(key), list):
+            delta["lists"][key] = _diff_list(old[key], value)
+        else:
+            delta["set"][key] = value
+    return delta
+
+
+def _diff_agents(old: list[dict], new: list[dict]) -> dict:
+    before = {a["personality_id"]: a for a in old}
+    changed = {}
+    added = {}
+    for agent in new:
+        pid = agent["personality_id"]
+        if pid not in before:
+            added[pid] = agent
+            continue
+        fields = {k: v for k, v in agent.items() if before[pid].get(k) != v}
+        if fields:
+            changed[pid] = fields
+    return {
+        "order": [a["personality_id"] for a in new],
+        "changed": changed,
+        "added": added,
+    }
+
+
+def _diff_list(old: list, new: list) -> dict:
+    for drop in range(len(old) + 1):
+        kept = len(old) - drop
+        if old[drop:] == new[:kept]:
+            return {"drop": drop, "append": new[kept:]}
+    return {"replace": new}
+
+
+def _apply(data: dict, delta: dict) -> dict:
+    data = {**data, **delta.get("set", {})}
+
+    for key, change in delta.get("lists", {}).items():
+        if "replace" in change:
+            data[key] = change["replace"]
+        else:
+            data[key] = data[key][change["drop"]:] + change["append"]
+
+    if "agents" in delta:
+        agents = {a["personality_id"]: a for a in data["agents"]}
+        agents.update(delta["agents"]["added"])
+        for pid, fields in delta["agents"]["changed"].items():
+            agents[pid] = {**agents[pid], **fields}
+        data["agents"] = [agents[pid] for pid in delta["agents"]["order"]]
+
+    return data
@@ -0,0 +1,187 @@
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from . import utils
+from .models import Personality
+
+_COLUMNS = ("id", "name", "model", "persona", "voting_criteria", "generation", "parent_id", "born_round", "died_round")
+
+_stores: dict[Path, "PersonalityStore"] = {}
+
+
+class PersonalityStore:
+    """Every personality ever created, in SQLite (data/personalities.sqlite).
+
+    Indexed on id, generation, birth/death round and parent, so startup and
+    lineage queries stay fast however many personas a run has generated.
+    A new store imports the JSON files in data/personalities/ (the starters,
+    plus any personas written by older versions).
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        path = path or utils.PERSONALITY_DB
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS personalities (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                model TEXT,
+                persona TEXT NOT NULL,
+                voting_criteria TEXT NOT NULL,
+                generation INTEGER NOT NULL,
+                parent_id TEXT,
+                born_round INTEGER NOT NULL,
+                died_round INTEGER
+            )
+        """)
+        for column in ("generation", "parent_id", "born_round", "died_round"):
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS idx_{column} ON personalities ({column})")
+        self._db.commit()
+
+        if len(self) == 0 and utils.PERSONALITIES_DIR.exists():
+            self.import_json(utils.PERSONALITIES_DIR)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM personalities").fetchone()[0]
+
+    def get(self, personality_id: str) -> Personality | None:
+        return self._one("SELECT * FROM personalities WHERE id = ?", (personality_id,))
+
+    def put(self, personality: Personality) -> None:
+        """Insert or replace one personality."""
+        self.put_many([personality])
+
+    def put_many(self, personalities: list[Personality], replace: bool = True) -> None:
+        """Insert or replace many personalities in one transaction.
+
+        With replace=False, personalities already in the store are left as they are.
+        """
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        conflict = "REPLACE" if replace else "IGNORE"
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR {conflict} INTO personalities ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(getattr(p, c) for c in _COLUMNS) for p in personalities],
+            )
+
+    def mark_dead(self, personality_id: str, round_num: int) -> None:
+        with self._db:
+            self._db.execute(
+                "UPDATE personalities SET died_round = ? WHERE id = ?", (round_num, personality_id)
+            )
+
+    def starters(self) -> list[Personality]:
+        """The hand-written starter-* personalities, in id order."""
+        # A range on the primary key (unlike LIKE, which SQLite won't index here)
+        return self._many(
+            "SELECT * FROM personalities WHERE id >= 'starter-' AND id < 'starter.' ORDER BY id"
+        )
+
+    def alive(self) -> list[Personality]:
+        return self._many("SELECT * FROM personalities WHERE died_round IS NULL ORDER BY born_round, id")
+
+    def by_generation(self, generation: int) -> list[Personality]:
+        return self._many("SELECT * FROM personalities WHERE generation = ? ORDER BY id", (generation,))
+
+    def born_between(self, start: int, stop: int) -> list[Personality]:
+        """Personalities born in rounds [start, stop)."""
+        return self._many(
+            "SELECT * FROM personalities WHERE born_round >= ? AND born_round < ? ORDER BY born_round, id",
+            (start, stop),
+        )
+
+    def children(self, personality_id: str) -> list[Personality]:
+        return self._many("SELECT * FROM personalities WHERE parent_id = ? ORDER BY born_round, id", (personality_id,))
+
+    def ancestors(self, personality_id: str) -> list[Personality]:
+        """Parent, grandparent, ... back to a personality with no parent."""
+        return self._many("""
+            WITH RECURSIVE line(id, parent_id, depth) AS (
+                SELECT id, parent_id, 0 FROM personalities WHERE id = ?
+                UNION
+                SELECT p.id, p.parent_id, line.depth + 1
+                FROM personalities p JOIN line ON p.id = line.parent_id
+            )
+            SELECT personalities.* FROM personalities JOIN line USING (id)
+            WHERE line.depth > 0 ORDER BY line.depth
+        """, (personality_id,))
+
+    def descendants(self, personality_id: str) -> list[Personality]:
+        """Everyone descended from a personality, nearest generations first."""
+        return self._many("""
+            WITH RECURSIVE tree(id, depth) AS (
+                SELECT id, 0 FROM personalities WHERE id = ?
+                UNION
+                SELECT p.id, tree.depth + 1
+                FROM personalities p JOIN tree ON p.parent_id = tree.id
+            )
+            SELECT personalities.* FROM personalities JOIN tree USING (id)
+            WHERE tree.depth > 0 ORDER BY tree.depth, personalities.id
+        """, (personality_id,))
+
+    def import_json(self, directory: Path) -> int:
+        """Load every *.json personality file in a directory. Returns how many were imported."""
+        personalities = []
+        for file in sorted(directory.glob("*.json")):
+            with open(file) as f:
+                personalities.append(Personality(**json.load(f)))
+        self.put_many(personalities)
+        return len(personalities)
+
+    def export_json(self, directory: Path) -> int:
+        """Write every personality as <id>.json, the layout import_json reads. Returns the count."""
+        directory.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for personality in self._many("SELECT * FROM personalities ORDER BY id"):
+            utils.atomic_write_text(directory / f"{personality.id}.json", personality.model_dump_json(indent=2))
+            count += 1
+        return count
+
+    def _one(self, query: str, params: tuple = ()) -> Personality | None:
+        row = self._db.execute(query, params).fetchone()
+        return Personality(**dict(zip(_COLUMNS, row))) if row else None
+
+    def _many(self, query: str, params: tuple = ()) -> list[Personality]:
+        return [Personality(**dict(zip(_COLUMNS, row))) for row in self._db.execute(query, params)]
+
+
+def get_store() -> PersonalityStore:
+    """Store for the current data directory, opened on first use."""
+    path = utils.PERSONALITY_DB
+    if path not in _stores:
+        _stores[path] = PersonalityStore(path)
+    return _stores[path]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the personality store.")
+    parser.add_argument("--db", type=Path, default=None, help="Store path (default: data/personalities.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import personality JSON files")
+    imp.add_argument("directory", type=Path, nargs="?", default=None)
+    exp = sub.add_parser("export", help="Export every personality as JSON files")
+    exp.add_argument("directory", type=Path)
+    lineage = sub.add_parser("lineage", help="Show a personality's ancestors and descendants")
+    lineage.add_argument("id")
+    args = parser.parse_args()
+
+    store = PersonalityStore(args.db)
+    if args.command == "import":
+        print(f"Imported {store.import_json(args.directory or utils.PERSONALITIES_DIR)} personalities")
+    elif args.command == "export":
+        print(f"Exported {store.export_json(args.directory)} personalities")
+    elif args.command == "lineage":
+        for p in reversed(store.ancestors(args.id)):
+            print(f"  {p.id} {p.name} (gen {p.generation})")
+        print(f"* {args.id}")
+        for p in store.descendants(args.id):
+            print(f"  {p.id} {p.name} (gen {p.generation}, parent {p.parent_id})")
+
+
+if __name__ == "__main__":
+    main()
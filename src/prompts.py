@@ -0,0 +1,143 @@
+from .models import Agent, Response
+
+# "stable_prefix": content shared by every call in a round comes first and
+# agent-specific parts last, so Ollama's prompt cache is reused across agents
+# on the same model. "legacy": the original agent-first layout, kept so
+# prompt_eval_count can be compared between the two.
+PROMPT_LAYOUT = "stable_prefix"
+
+
+def response_messages(
+    agent: Agent,
+    question: str,
+    feedback: str,
+    layout: str | None = None,
+) -> list[dict]:
+    """Build the chat messages for an agent's answer."""
+    history = feedback if feedback else "(No history yet)"
+
+    if (layout or PROMPT_LAYOUT) == "legacy":
+        system_prompt = f"""You are {agent.name}, a competitor in a debate arena where agents answer questions and vote on each other's responses. Agents with zero votes for 3 consecutive rounds are eliminated.
+
+Your personality:
+{agent.persona}
+
+Arena history:
+{history}
+
+Rules:
+- Stay true to your personality
+- Be concise but distinctive
+- Your goal is to give a response that other agents will vote for
+
+Do NOT include your vote in this response. Voting happens separately."""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": question},
+        ]
+
+    system_prompt = f"""You are a competitor in a debate arena where agents answer questions and vote on each other's responses. Agents with zero votes for 3 consecutive rounds are eliminated.
+
+Rules:
+- Stay true to your personality
+- Be concise but distinctive
+- Your goal is to give a response that other agents will vote for
+
+Do NOT include your vote in this response. Voting happens separately.
+
+Arena history:
+{history}"""
+
+    user_prompt = f"""Question: {question}
+
+You are {agent.name}.
+
+Your personality:
+{agent.persona}"""
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def vote_messages(
+    agent: Agent,
+    question: str,
+    responses: list[Response],
+    feedback: str,
+    valid_names: list[str],
+    layout: str | None = None,
+) -> list[dict]:
+    """Build the chat messages for an agent's vote."""
+    history = feedback if feedback else "(No history yet)"
+    valid_names_str = ", ".join(valid_names)
+
+    if (layout or PROMPT_LAYOUT) == "legacy":
+        responses_text = "".join(
+            f"\n[{r.agent_name}]:\n{r.content}\n"
+            for r in responses
+            if r.agent_id != agent.personality_id
+        )
+        system_prompt = f"""You are {agent.name}, voting on other agents' responses. Your vote is public.
+
+Your personality:
+{agent.persona}
+
+Your voting criteria:
+{agent.voting_criteria}
+
+Arena history:
+{history}
+
+Rules:
+- You CANNOT vote for yourself
+- Vote based on your criteria
+- Valid choices: {valid_names_str}"""
+
+        user_prompt = f"""Question: {question}
+
+Responses:
+{responses_text}
+
+Vote for one agent by name. You must vote for one of: {valid_names_str}"""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    # In "full" voting every voter sees the same response list, including
+    # their own answer, so the whole list stays inside the shared prefix
+    responses_text = "".join(f"\n[{r.agent_name}]:\n{r.content}\n" for r in responses)
+    own_answer = ""
+    if any(r.agent_id == agent.personality_id for r in responses):
+        own_answer = f" Your own response is listed above as [{agent.name}]."
+
+    system_prompt = f"""You are voting on other agents' responses in a debate arena. Your vote is public.
+
+Rules:
+- You CANNOT vote for yourself
+- Vote based on your criteria
+
+Arena history:
+{history}"""
+
+    user_prompt = f"""Question: {question}
+
+Responses:
+{responses_text}
+
+You are {agent.name}.{own_answer}
+
+Your personality:
+{agent.persona}
+
+Your voting criteria:
+{agent.voting_criteria}
+
+Vote for one agent by name. You must vote for one of: {valid_names_str}"""
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from pydantic import BaseModel
+from rich.console import Console
+from rich.table import Table
+
+from . import utils
+from .digest import shown_to_voters
+from .feedback import logged_feedback_entry, render_feedback
+from .metrics import add_metrics
+from .models import FEEDBACK_ROUNDS, Agent, ArenaState, CallMetrics, FeedbackEntry, Response, RoundResult, Vote
+from .ollama_client import ArenaClient, generate_vote
+from .personality_store import get_store
+from .round_log import RoundLog
+from .scheduler import ModelScheduler
+from .voting import normalize_tally
+
+console = Console()
+
+
+class Judge(BaseModel):
+    """A voter from outside the arena."""
+    name: str
+    model: str
+    persona: str
+    voting_criteria: str
+
+
+class Panel(BaseModel):
+    """Who re-judges the logged rounds. With no changes, the arena's own voters vote again."""
+    name: str = "rejudge"
+    model: str | None = None  # Every arena voter uses this model instead
+    models: dict[str, str] = {}  # Original model -> replacement
+    voting_criteria: dict[str, str] = {}  # personality_id -> replacement criteria
+    judges: list[Judge] = []  # Outside voters who replace the arena's own
+    include_history: bool = True  # Show voters the arena history as it stood at the round
+
+
+class Rejudged(BaseModel):
+    """One logged round, voted on again."""
+    round_number: int
+    question: str
+    original_tally: dict[str, int]
+    vote_tally: dict[str, int]
+    normalized_tally: dict[str, float] = {}
+    votes: list[Vote]
+    metrics: CallMetrics
+
+    @property
+    def winner_changed(self) -> bool:
+        return _winners(self.original_tally) != _winners(self.vote_tally)
+
+
+def panel_voters(panel: Panel, result: RoundResult) -> list[tuple[Agent, list[str]]]:
+    """Each voter of the panel for a logged round, with the agent ids on its ballot.
+
+    Arena voters are rebuilt from the personality store and keep their
+    logged ballots; outside judges see every answer.
+    """
+    everyone = [r.agent_id for r in result.responses]
+    if panel.judges:
+        return [
+            (
+                Agent(
+                    personality_id=f"judge-{i + 1}",
+                    name=judge.name,
+                    model=judge.model,
+                    persona=judge.persona,
+                    voting_criteria=judge.voting_criteria,
+                    generation=0,
+                ),
+                everyone,
+            )
+            for i, judge in enumerate(panel.judges)
+        ]
+
+    store = get_store()
+    voters = []
+    for response in result.responses:
+        personality = store.get(response.agent_id)
+        if personality is None:
+            console.print(
+                f"[yellow]Round {result.round_number}: {response.agent_name} "
+                f"is not in the personality store, skipped[/yellow]"
+            )
+            continue
+        model = panel.model or panel.models.get(response.model, response.model)
+        voter = Agent(
+            personality_id=personality.id,
+            name=personality.name,
+            model=model,
+            persona=personality.persona,
+            voting_criteria=panel.voting_criteria.get(personality.id, personality.voting_criteria),
+            generation=personality.generation,
+        )
+        voters.append((voter, result.ballots.get(personality.id, everyone)))
+    return voters
+
+
+async def rejudge(
+    results: list[RoundResult],
+    panel: Panel,
+    history: dict[int, FeedbackEntry] | None = None,
+) -> list[Rejudged]:
+    """Re-run only the voting phase of logged rounds, all rounds at once.
+
+    Every vote call across the rounds goes through one scheduler phase, so
+    each model is loaded once and its calls run concurrently. history maps
+    round numbers to their logged feedback entries. Each round sees the
+    arena history as originally logged, so rounds are independent of each
+    other's new votes.
+    """
+    client = ArenaClient()
+    scheduler = ModelScheduler(client)
+    await scheduler.refresh()
+
+    calls: list[tuple[Agent, RoundResult, list[Response], str]] = []
+    for result in results:
+        feedback = ""
+        if panel.include_history and history:
+            state = ArenaState()
+            for n in range(result.round_number - FEEDBACK_ROUNDS, result.round_number):
+                if n in history:
+                    state.feedback.append(history[n])
+            feedback = render_feedback(state)
+        shown = {r.agent_id: shown_to_voters(r) for r in result.responses}
+        for voter, ballot in panel_voters(panel, result):
+            calls.append((voter, result, [shown[a] for a in ballot if a in shown], feedback))
+
+    # Voter objects are per call, so they identify the call
+    by_voter = {id(call[0]): call for call in calls}
+
+    async def cast_vote(voter: Agent) -> Vote | None:
+        _, result, ballot, feedback = by_voter[id(voter)]
+        return await generate_vote(client, voter, result.question, ballot, feedback)
+
+    votes = await scheduler.run_phase([call[0] for call in calls], cast_vote)
+    console.print(
+        f"[dim]{len(votes)} votes, {scheduler.loads} model loads, "
+        f"cache: {client.cache_hits} hits, {client.cache_misses} misses[/dim]"
+    )
+
+    votes_by_round: dict[int, list[Vote]] = defaultdict(list)
+    ballots_by_round: dict[int, dict[str, list[str]]] = defaultdict(dict)
+    for (voter, result, ballot, _), vote in zip(calls, votes):
+        if vote is None:
+            continue
+        votes_by_round[result.round_number].append(vote)
+        ballots_by_round[result.round_number][voter.personality_id] = [r.agent_id for r in ballot]
+
+    rejudged = []
+    for result in results:
+        round_votes = votes_by_round[result.round_number]
+        tally: dict[str, int] = defaultdict(int)
+        metrics = CallMetrics()
+        for vote in round_votes:
+            tally[vote.voted_for_id] += 1
+            metrics = add_metrics(metrics, vote.metrics)
+        rejudged.append(Rejudged(
+            round_number=result.round_number,
+            question=result.question,
+            original_tally=result.vote_tally,
+            vote_tally=dict(tally),
+            normalized_tally=normalize_tally(tally, ballots_by_round[result.round_number]),
+            votes=round_votes,
+            metrics=metrics,
+        ))
+    return rejudged
+
+
+def _winners(tally: dict[str, int]) -> set[str]:
+    top = max(tally.values(), default=0)
+    return {agent_id for agent_id, votes in tally.items() if votes == top and top > 0}
+
+
+def write_rejudged(rejudged: list[Rejudged], panel: Panel, path: Path | None = None) -> Path:
+    """Write one JSON line per round to logs/rejudge-<panel>.jsonl. Returns the path."""
+    path = path or utils.LOGS_DIR / f"rejudge-{panel.name}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        json.dumps({"panel": panel.name, "winner_changed": r.winner_changed, **r.model_dump(mode="json")})
+        for r in rejudged
+    ]
+    utils.atomic_write_text(path, "".join(line + "\n" for line in lines))
+    return path
+
+
+def show_comparison(rejudged: list[Rejudged], results: list[RoundResult]) -> None:
+    """Original vs re-judged vote totals per agent, and how often the winner changed."""
+    names = {r.agent_id: r.agent_name for result in results for r in result.responses}
+    original: dict[str, int] = defaultdict(int)
+    again: dict[str, int] = defaultdict(int)
+    for r in rejudged:
+        for agent_id, votes in r.original_tally.items():
+            original[agent_id] += votes
+        for agent_id, votes in r.vote_tally.items():
+            again[agent_id] += votes
+
+    table = Table(title=f"Re-judged {len(rejudged)} rounds")
+    table.add_column("Agent")
+    table.add_column("Original", justify="right")
+    table.add_column("Re-judged", justify="right")
+    table.add_column("Change", justify="right")
+    for agent_id in sorted(names, key=lambda a: again[a], reverse=True):
+        table.add_row(
+            names[agent_id],
+            str(original[agent_id]),
+            str(again[agent_id]),
+            f"{again[agent_id] - original[agent_id]:+d}",
+        )
+    console.print(table)
+
+    changed = sum(1 for r in rejudged if r.winner_changed)
+    console.print(f"Winner changed in {changed} of {len(rejudged)} rounds")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run the voting phase of logged rounds with another panel.")
+    parser.add_argument("--panel", type=Path, help="Panel JSON file (default: the arena's own voters)")
+    parser.add_argument("--model", help="Model every arena voter uses instead of its own")
+    parser.add_argument("--start", type=int, help="First round (default: the first logged)")
+    parser.add_argument("--stop", type=int, help="Last round, exclusive")
+    parser.add_argument(
+        "--arena", type=Path, help="Arena directory with data/ and logs/, e.g. runs/arena-0003 (default: this project)"
+    )
+    args = parser.parse_args()
+
+    if args.arena:
+        utils.configure_paths(args.arena / "data", args.arena / "logs")
+    panel = Panel.model_validate_json(args.panel.read_text()) if args.panel else Panel()
+    if args.model:
+        panel.model = args.model
+
+    log = RoundLog.open()
+    results = list(log.rounds(args.start, args.stop))
+    if not results:
+        console.print("[red]No logged rounds to re-judge.[/red]")
+        return
+    first = results[0].round_number
+    history = {
+        r.round_number: logged_feedback_entry(r)
+        for r in log.rounds(first - FEEDBACK_ROUNDS, args.stop)
+    }
+
+    rejudged = asyncio.run(rejudge(results, panel, history))
+    show_comparison(rejudged, results)
+    console.print(f"[dim]Written to {write_rejudged(rejudged, panel)}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import gzip
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Iterator
+
+from . import utils
+from .models import Response, RoundResult, Vote
+from .tracing import traced
+
+# None: plain JSON Lines. "gzip" / "zstd": each record is its own compressed
+# member/frame, so any round can still be read without decompressing the rest.
+ROUND_LOG_COMPRESSION: str | None = None
+
+_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Index entry: round number, byte offset, byte length
+_INDEX_ENTRY = struct.Struct("<IQI")
+
+
+def _compressor(compression: str | None):
+    if compression is None:
+        return lambda data: data, lambda data: data
+    if compression == "gzip":
+        return gzip.compress, gzip.decompress
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("zstd round logs need the zstandard package: pip install 'llm-arena[zstd]'") from e
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unknown round log compression: {compression}")
+
+
+class RoundLog:
+    """Append-only log of RoundResults (logs/rounds.jsonl[.gz|.zst]) with an offset index.
+
+    The sidecar .idx file maps each round to the byte range of its record,
+    so reading one round is a single seek. A round re-run after a crash is
+    appended again; the latest record for a round wins.
+    """
+
+    def __init__(self, logs_dir: Path | None = None, compression: str | None = ROUND_LOG_COMPRESSION) -> None:
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unknown round log compression: {compression}")
+        logs_dir = logs_dir or utils.LOGS_DIR
+        self.path = logs_dir / f"rounds.jsonl{_SUFFIXES[compression]}"
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self._compress, self._decompress = _compressor(compression)
+        self._index: dict[int, tuple[int, int]] | None = None
+
+    @classmethod
+    def open(cls, logs_dir: Path | None = None) -> "RoundLog":
+        """Open whichever log exists in logs_dir, falling back to the configured compression."""
+        logs_dir = logs_dir or utils.LOGS_DIR
+        for compression, suffix in _SUFFIXES.items():
+            if (logs_dir / f"rounds.jsonl{suffix}.idx").exists():
+                return cls(logs_dir, compression)
+        return cls(logs_dir)
+
+    def append(self, result: RoundResult) -> None:
+        """Write one round durably: record first, then its index entry."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        record = self._compress((result.model_dump_json() + "\n").encode())
+
+        with open(self.path, "ab") as f:
+            # A record written before a crash but never indexed is simply skipped
+            offset = f.seek(0, os.SEEK_END)
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with open(self.index_path, "ab") as f:
+            f.write(_INDEX_ENTRY.pack(result.round_number, offset, len(record)))
+            f.flush()
+            os.fsync(f.fileno())
+
+        if self._index is not None:
+            self._index[result.round_number] = (offset, len(record))
+
+    @property
+    def index(self) -> dict[int, tuple[int, int]]:
+        """round number -> (offset, length), read once from the .idx file."""
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                data = self.index_path.read_bytes()
+                usable = len(data) - len(data) % _INDEX_ENTRY.size  # ignore a torn entry
+                for round_number, offset, length in _INDEX_ENTRY.iter_unpack(data[:usable]):
+                    self._index[round_number] = (offset, length)
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def round_numbers(self) -> list[int]:
+        return sorted(self.index)
+
+    def get(self, round_number: int) -> RoundResult:
+        """Read a single round. Raises KeyError if it was never logged."""
+        offset, length = self.index[round_number]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return self._parse(f.read(length))
+
+    def rounds(self, start: int | None = None, stop: int | None = None) -> Iterator[RoundResult]:
+        """Yield rounds in order, one record in memory at a time. stop is exclusive."""
+        wanted = [
+            r for r in self.round_numbers()
+            if (start is None or r >= start) and (stop is None or r < stop)
+        ]
+        if not wanted:
+            return  # Nothing to read, and a new arena has no log file yet
+        with open(self.path, "rb") as f:
+            for round_number in wanted:
+                offset, length = self.index[round_number]
+                f.seek(offset)
+                yield self._parse(f.read(length))
+
+    def responses(self, start: int | None = None, stop: int | None = None) -> Iterator[tuple[int, Response]]:
+        """Yield (round number, response) across rounds."""
+        for result in self.rounds(start, stop):
+            for response in result.responses:
+                yield result.round_number, response
+
+    def votes(self, start: int | None = None, stop: int | None = None) -> Iterator[tuple[int, Vote]]:
+        """Yield (round number, vote) across rounds."""
+        for result in self.rounds(start, stop):
+            for vote in result.votes:
+                yield result.round_number, vote
+
+    def _parse(self, record: bytes) -> RoundResult:
+        return RoundResult.model_validate_json(self._decompress(record))
+
+
+@traced
+def append_round(result: RoundResult) -> None:
+    """Append a finished round to the run's round log."""
+    RoundLog.open().append(result)
+
+
+def migrate_round_files(logs_dir: Path | None = None, compression: str | None = ROUND_LOG_COMPRESSION) -> int:
+    """Import legacy logs/round-XXX.json files into the round log. Returns rounds imported."""
+    logs_dir = logs_dir or utils.LOGS_DIR
+    log = RoundLog(logs_dir, compression)
+    imported = 0
+    for file in sorted(logs_dir.glob("round-*.json")):
+        with open(file) as f:
+            result = RoundResult(**json.load(f))
+        if result.round_number not in log.index:
+            log.append(result)
+            imported += 1
+    return imported
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or migrate the round log.")
+    parser.add_argument("--logs", type=Path, default=None, help="Logs directory (default: logs/)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Import legacy round-XXX.json files")
+    show = sub.add_parser("show", help="Print one round as JSON")
+    show.add_argument("round", type=int)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        print(f"Imported {migrate_round_files(args.logs)} rounds")
+    elif args.command == "show":
+        print(RoundLog.open(args.logs).get(args.round).model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
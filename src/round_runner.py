@@ -1,53 +1,183 @@
+import asyncio
 from collections import defaultdict
 
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
 
+from .digest import digest_responses, shown_to_voters
+from .elimination import draft_replacements, speculation_candidates
+from .events import PhaseCompleted, ResponseReady, VoteCast, flush, publish
+from .feedback import render_feedback
+from .journal import append_journal, read_journal
+from .metrics import aggregate_round
 from .models import Agent, ArenaState, Response, RoundResult, Vote
-from .ollama_client import generate_response, generate_vote
-from .utils import load_feedback
+from .ollama_client import (
+    RESPONSE_PHASE_MAX_TOKENS,
+    RESPONSE_PHASE_TIME_BUDGET,
+    ArenaClient,
+    TokenPool,
+    generate_response,
+    generate_vote,
+)
+from .scheduler import ModelScheduler
+from .tracing import span, traced
+from .voting import assign_ballots, normalize_tally
 
 console = Console()
 
+# Characters of each streaming answer shown in the live view
+LIVE_TAIL_CHARS = 300
 
-def run_round(state: ArenaState, question: str) -> RoundResult:
+
+@traced
+def run_round(
+    state: ArenaState,
+    question: str,
+    next_model: str | None = None,
+    speculate: bool = False,
+) -> RoundResult:
     """Run a complete round: collect responses, collect votes, update stats."""
+    return asyncio.run(run_round_async(state, question, next_model, speculate))
+
+
+async def run_round_async(
+    state: ArenaState,
+    question: str,
+    next_model: str | None = None,
+    speculate: bool = False,
+) -> RoundResult:
+    """Async round engine: each phase fans out across agents concurrently.
+
+    Calls are scheduled by model to minimise Ollama model swaps. `next_model`
+    is a model needed right after the round, scheduled last so it stays loaded.
+    With `speculate`, replacements for agents close to elimination are
+    drafted alongside the voting phase and left in state._replacement_drafts.
+
+    Every finished response and vote is journaled and published as it
+    completes. The console subscriber prints each phase in agent order once
+    it is over; meanwhile the live view shows answers as they stream. If the
+    round was interrupted, its question and finished calls are taken from
+    the journal and only the missing calls are re-issued.
+    """
+    
+    client = ArenaClient()
+    scheduler = ModelScheduler(client)
+    await scheduler.refresh()
+    # current_round only advances once the round's stats are applied
+    round_num = state.current_round + 1
+    feedback = render_feedback(state)
+    history = list(state.feedback)  # lets prompts drop the oldest rounds to fit a model's context
     
-    state.current_round += 1
-    round_num = state.current_round
-    feedback = load_feedback()
+    journaled_question, journaled_responses, journaled_votes = read_journal(round_num)
+    if journaled_question is None:
+        append_journal(round_num, "question", {"question": question})
+    else:
+        question = journaled_question
     
     console.print(f"\n[bold blue]═══ Round {round_num} ═══[/bold blue]")
     console.print(f"[yellow]Question:[/yellow] {question}\n")
+    if journaled_responses or journaled_votes:
+        console.print(
+            f"[dim]Resuming: {len(journaled_responses)} responses, "
+            f"{len(journaled_votes)} votes already recorded[/dim]"
+        )
+    
+    streaming: dict[str, str] = {}  # agent name -> text so far, for the live view (kept once finished)
+    
+    def render_live() -> Group:
+        return Group(*(
+            Panel(text[-LIVE_TAIL_CHARS:] or "…", title=name, border_style="dim")
+            for name, text in streaming.items()
+        ))
+    
+    async def respond(agent: Agent) -> Response:
+        streaming[agent.name] = ""
+        
+        def on_text(text: str) -> None:
+            streaming[agent.name] = text
+        
+        response = await generate_response(
+            client, agent, question, feedback,
+            on_text=on_text, deadline=deadline, history=history, token_pool=token_pool,
+        )
+        append_journal(round_num, "response", response.model_dump())
+        publish(ResponseReady(round_number=round_num, response=response))
+        return response
+    
+    async def cast_vote(agent: Agent) -> Vote | None:
+        # Only the answers on this agent's ballot go into its prompt
+        ballot = [by_agent[agent_id] for agent_id in ballots[agent.personality_id]]
+        vote = await generate_vote(client, agent, question, ballot, feedback, history=history)
+        if vote is None:
+            return None  # Nobody else on the ballot: the agent abstains
+        append_journal(round_num, "vote", vote.model_dump())
+        publish(VoteCast(round_number=round_num, vote=vote))
+        return vote
     
     # Phase 1: Collect responses
     console.print("[bold]Phase 1: Collecting responses...[/bold]")
-    responses: list[Response] = []
-    for agent in state.agents:
+    pending = [a for a in state.agents if a.personality_id not in journaled_responses]
+    for agent in pending:
         console.print(f"  {agent.name} ({agent.model}) thinking...")
-        response = generate_response(agent, question, feedback)
-        responses.append(response)
-        console.print(Panel(response.content, title=f"{agent.name}", border_style="green"))
+    for agent in state.agents:
+        if agent.personality_id in journaled_responses:
+            publish(ResponseReady(round_number=round_num, response=journaled_responses[agent.personality_id]))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + RESPONSE_PHASE_TIME_BUDGET if RESPONSE_PHASE_TIME_BUDGET else None
+    token_pool = TokenPool(RESPONSE_PHASE_MAX_TOKENS, len(pending)) if RESPONSE_PHASE_MAX_TOKENS else None
+    with span("responses"), Live(get_renderable=render_live, console=console, transient=True, refresh_per_second=8):
+        fresh_responses = await scheduler.run_phase(pending, respond)
+    journaled_responses.update(zip((a.personality_id for a in pending), fresh_responses))
+    responses: list[Response] = [journaled_responses[a.personality_id] for a in state.agents]
+    # The console prints the phase's answers in agent order; let it catch up before moving on
+    order = [a.personality_id for a in state.agents]
+    publish(PhaseCompleted(round_number=round_num, phase="responses", order=order))
+    with span("render"):
+        await asyncio.to_thread(flush, "console")
+    
+    # Long answers are condensed once here, and voters read the digests
+    responses = await digest_responses(client, responses)
     
     # Phase 2: Collect votes
     console.print("\n[bold]Phase 2: Collecting votes...[/bold]")
-    votes: list[Vote] = []
+    ballots = assign_ballots(state, round_num)
+    by_agent = {r.agent_id: shown_to_voters(r) for r in responses}
+    if state.voting_mode != "full":
+        console.print(f"[dim]Voting mode: {state.voting_mode}[/dim]")
     for agent in state.agents:
-        console.print(f"  {agent.name} voting...")
-        vote = generate_vote(agent, question, responses, feedback)
-        votes.append(vote)
-        console.print(f"    → {agent.name} votes for [cyan]{vote.voted_for_name}[/cyan]: {vote.reasoning}")
+        if agent.personality_id in journaled_votes:
+            publish(VoteCast(round_number=round_num, vote=journaled_votes[agent.personality_id]))
+    pending = [a for a in state.agents if a.personality_id not in journaled_votes]
+    candidates = speculation_candidates(state) if speculate else []
+    drafting = asyncio.create_task(draft_replacements(client, state, candidates)) if candidates else None
+    with span("votes"):
+        fresh_votes = await scheduler.run_phase(pending, cast_vote, last=next_model)
+        if drafting is not None:
+            state._replacement_drafts = await drafting
+    journaled_votes.update(
+        (a.personality_id, vote) for a, vote in zip(pending, fresh_votes) if vote is not None
+    )
+    votes: list[Vote] = [
+        journaled_votes[a.personality_id] for a in state.agents if a.personality_id in journaled_votes
+    ]
+    publish(PhaseCompleted(round_number=round_num, phase="votes", order=order))
+    with span("render"):
+        await asyncio.to_thread(flush, "console")
     
     # Phase 3: Tally votes
     vote_tally: dict[str, int] = defaultdict(int)
     for vote in votes:
         vote_tally[vote.voted_for_id] += 1
+    normalized_tally = normalize_tally(vote_tally, ballots)
     
     # Phase 4: Update agent stats
+    state.current_round = round_num
     for agent in state.agents:
         agent.rounds_participated += 1
         votes_received = vote_tally.get(agent.personality_id, 0)
         agent.total_votes_received += votes_received
+        agent.normalized_votes_received += normalized_tally.get(agent.personality_id, 0.0)
         
         if votes_received > 0:
             agent.rounds_without_votes = 0
@@ -60,7 +190,27 @@ def run_round(state: ArenaState, question: str) -> RoundResult:
         votes_received = vote_tally.get(agent.personality_id, 0)
         drought = agent.rounds_without_votes
         drought_warning = " [red]⚠ ELIMINATION WARNING[/red]" if drought >= 2 else ""
-        console.print(f"  {agent.name}: {votes_received} votes (drought: {drought}){drought_warning}")
+        normalized = ""
+        if state.voting_mode != "full":
+            normalized = f", {normalized_tally.get(agent.personality_id, 0.0):.2f} normalised"
+        console.print(
+            f"  {agent.name}: {votes_received} votes{normalized} (drought: {drought}){drought_warning}"
+        )
+    metrics = aggregate_round(responses, votes)
+    console.print(f"[dim]Model loads: {scheduler.loads} ({scheduler.load_seconds:.1f}s)[/dim]")
+    console.print(
+        f"[dim]Tokens: {metrics.total.prompt_eval_count} prompt, {metrics.total.eval_count} generated; "
+        f"{metrics.total.calls} calls, {metrics.total.retries} retries[/dim]"
+    )
+    if metrics.total.history_tokens_trimmed:
+        console.print(f"[dim]History trimmed to fit context: ~{metrics.total.history_tokens_trimmed} tokens[/dim]")
+    for model, model_metrics in sorted(metrics.by_model.items()):
+        if model_metrics.retries or model_metrics.name_repairs or model_metrics.fallbacks:
+            console.print(
+                f"[dim]  {model}: {model_metrics.retries} vote retries, "
+                f"{model_metrics.name_repairs} repaired names, {model_metrics.fallbacks} random fallbacks[/dim]"
+            )
+    console.print(f"[dim]Cache: {client.cache_hits} hits, {client.cache_misses} misses[/dim]")
     
     return RoundResult(
         round_number=round_num,
@@ -68,4 +218,9 @@ def run_round(state: ArenaState, question: str) -> RoundResult:
         responses=responses,
         votes=votes,
         vote_tally=dict(vote_tally),
+        ballots=ballots,
+        normalized_tally=normalized_tally,
+        model_loads=scheduler.loads,
+        model_load_seconds=scheduler.load_seconds,
+        metrics=metrics,
     )
\ No newline at end of file
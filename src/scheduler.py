@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, TypeVar
+
+from .models import Agent
+from .ollama_client import ArenaClient
+
+T = TypeVar("T")
+
+# Memory available for resident models; waves are packed to fit inside it
+MODEL_RAM_BUDGET_GB = 24.0
+
+
+class ModelScheduler:
+    """Orders a round's LLM calls by model so each model loads as few times as possible.
+
+    Calls are grouped by model and packed into "waves" whose models fit the RAM
+    budget together. Models already resident go first, so consecutive phases
+    reuse whatever the previous phase left loaded.
+    """
+
+    def __init__(self, client: ArenaClient, ram_budget_gb: float = MODEL_RAM_BUDGET_GB) -> None:
+        self.client = client
+        self.ram_budget = int(ram_budget_gb * 1e9)
+        self.resident: list[str] = []
+        self.sizes: dict[str, int] = {}
+
+        # Per-round counters
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    async def refresh(self) -> None:
+        """Sync residency and model sizes with what Ollama reports."""
+        if self.client.offline:
+            return
+        try:
+            self.resident = await self.client.running_models()
+            self.sizes = await self.client.model_sizes()
+        except Exception:
+            # Older servers without /api/ps: fall back to "nothing resident"
+            self.resident = []
+
+    def plan(self, models: list[str], last: str | None = None) -> list[list[str]]:
+        """Group models into waves that fit the RAM budget, resident models first.
+
+        `last` is a model needed right after this phase (e.g. the meta-model);
+        it is scheduled at the end so it is still loaded when needed.
+        """
+        # Stable sort keeps first-seen order within each bucket
+        ordered = sorted(
+            dict.fromkeys(models),
+            key=lambda m: (m == last, m not in self.resident),
+        )
+        waves: list[list[str]] = []
+        used = 0
+        for model in ordered:
+            size = self.sizes.get(model, 0)
+            if waves and used + size <= self.ram_budget:
+                waves[-1].append(model)
+                used += size
+            else:
+                waves.append([model])
+                used = size
+        return waves
+
+    async def run_phase(
+        self,
+        agents: list[Agent],
+        make_call: Callable[[Agent], Awaitable[T]],
+        last: str | None = None,
+    ) -> list[T]:
+        """Run make_call for every agent, wave by wave. Results stay in agent order."""
+        by_model: dict[str, list[int]] = defaultdict(list)
+        for i, agent in enumerate(agents):
+            by_model[agent.model].append(i)
+
+        results: dict[int, T] = {}
+        for wave in self.plan([a.model for a in agents], last=last):
+            if not self.client.offline:
+                await self._load(wave)
+            indices = [i for model in wave for i in by_model[model]]
+            outputs = await asyncio.gather(*(make_call(agents[i]) for i in indices))
+            results.update(zip(indices, outputs))
+
+        return [results[i] for i in range(len(agents))]
+
+    async def _load(self, wave: list[str]) -> None:
+        """Evict models outside the wave until it fits, then warm up the missing ones."""
+        needed = [m for m in wave if m not in self.resident]
+        if not needed:
+            return
+
+        def footprint(models: list[str]) -> int:
+            return sum(self.sizes.get(m, 0) for m in models)
+
+        # Evict explicitly rather than letting Ollama pick an LRU victim mid-call
+        for victim in [m for m in self.resident if m not in wave]:
+            if footprint(self.resident + needed) <= self.ram_budget:
+                break
+            await self.client.unload(victim)
+            self.resident.remove(victim)
+
+        for model in needed:
+            start = time.monotonic()
+            reported = await self.client.preload(model)
+            self.load_seconds += reported or (time.monotonic() - start)
+            self.loads += 1
+            self.resident.append(model)
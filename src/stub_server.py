@@ -0,0 +1,188 @@
+import argparse
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ollama
+
+from .backends import FakeLLM
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the subset of Ollama's HTTP API the arena uses, backed by a FakeLLM."""
+
+    server: "StubServer"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+
+    def do_GET(self) -> None:
+        llm = self.server.llm
+        if self.path == "/":
+            self._send_text("Ollama is running")
+        elif self.path == "/api/ps":
+            self._send_json({"models": [
+                {"model": m, "name": m, "size": llm.model_sizes.get(m, 0), "size_vram": 0}
+                for m in llm.resident
+            ]})
+        elif self.path == "/api/tags":
+            self._send_json({"models": [
+                {"model": m, "name": m, "size": size}
+                for m, size in llm.model_sizes.items()
+            ]})
+        else:
+            self._send_json({"error": f"not found: {self.path}"}, status=404)
+
+    def do_POST(self) -> None:
+        llm = self.server.llm
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/api/chat":
+            try:
+                response, seconds = llm.complete(
+                    request["model"],
+                    request.get("messages", []),
+                    request.get("format"),
+                    request.get("options"),
+                )
+            except ollama.ResponseError as e:
+                self._send_json({"error": e.error}, status=e.status_code)
+                return
+            if request.get("stream", True):
+                self._stream(llm.pieces(response, seconds))
+            else:
+                time.sleep(seconds)
+                self._send_json(response)
+        elif self.path == "/api/generate":
+            # Only the load/unload forms (no prompt) are supported
+            if request.get("keep_alive") == 0:
+                llm.unload(request["model"])
+                seconds = 0.0
+            else:
+                seconds = llm.load(request["model"], (request.get("options") or {}).get("num_ctx"))
+                time.sleep(seconds)
+            self._send_json({
+                "model": request["model"],
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "response": "",
+                "done": True,
+                "load_duration": int(seconds * 1e9),
+            })
+        else:
+            self._send_json({"error": f"not found: {self.path}"}, status=404)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _stream(self, pieces: list[tuple[dict, float]]) -> None:
+        """NDJSON over chunked transfer encoding, like Ollama's streaming responses."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk, delay in pieces:
+                time.sleep(delay)
+                line = json.dumps(chunk).encode() + b"\n"
+                self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the generation
+            self.close_connection = True
+
+    def _send_json(self, payload: dict, status: int = 200) -> None:
+        self._send(json.dumps(payload).encode(), "application/json", status)
+
+    def _send_text(self, text: str, status: int = 200) -> None:
+        self._send(text.encode(), "text/plain", status)
+
+    def _send(self, body: bytes, content_type: str, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local stand-in for an Ollama server; point OLLAMA_HOST at it."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        llm: FakeLLM | None = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.llm = llm or FakeLLM()
+        self.verbose = verbose
+        self.connections = 0  # accepted so far; stays low while clients keep connections alive
+        self._open: set[socket.socket] = set()
+        self._open_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """Serve from a background thread; returns self for chaining."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and drop open connections, as a server going down would."""
+        self.shutdown()
+        self.server_close()
+        with self._open_lock:
+            for request in self._open:
+                try:
+                    request.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def process_request(self, request, client_address) -> None:
+        with self._open_lock:
+            self.connections += 1
+            self._open.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request) -> None:
+        with self._open_lock:
+            self._open.discard(request)
+        super().shutdown_request(request)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed seconds per call")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--load-seconds", type=float, default=0.5, help="Cost of loading a model")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of chat calls that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    llm = FakeLLM(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        load_seconds=args.load_seconds,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    server = StubServer(args.host, args.port, llm, verbose=args.verbose)
+    print(f"Stub Ollama server listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from . import utils
+
+console = Console()
+
+# Record timing spans (ARENA_TRACE=1). Disabled spans cost one flag check.
+TRACING = os.environ.get("ARENA_TRACE", "") not in ("", "0")
+
+# Names of the enclosing spans; asyncio tasks inherit it, so concurrent calls nest under their phase
+_path: contextvars.ContextVar[tuple[str, ...]] = contextvars.ContextVar("trace_path", default=())
+_events: list[dict] = []
+_lanes: dict[int, int] = {}  # id of the asyncio task (or thread, outside one) -> trace thread id
+_origin_ns = time.perf_counter_ns()
+_NULL = nullcontext()
+
+
+def enable(on: bool = True) -> None:
+    """Turn span recording on or off for this process."""
+    global TRACING
+    TRACING = on
+
+
+def reset() -> None:
+    """Forget recorded spans, e.g. at the start of a run."""
+    global _origin_ns
+    _events.clear()
+    _lanes.clear()
+    _origin_ns = time.perf_counter_ns()
+
+
+def span(name: str, **args):
+    """Context manager timing a block as a span nested in the current one.
+
+    Keyword arguments are attached to the span in the trace.
+    """
+    if not TRACING:
+        return _NULL
+    return _span(name, args)
+
+
+def traced(fn):
+    """Decorator: time every call of a function (sync or async) as a span named after it."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if not TRACING:
+                return await fn(*args, **kwargs)
+            with _span(fn.__name__, {}):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not TRACING:
+            return fn(*args, **kwargs)
+        with _span(fn.__name__, {}):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def _span(name: str, args: dict):
+    path = _path.get() + (name,)
+    token = _path.set(path)
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        _path.reset(token)
+        _events.append({"path": path, "start": start, "duration": end - start, "lane": _lane(), "args": args})
+
+
+def _lane() -> int:
+    """A trace thread per asyncio task, so concurrent calls get their own rows.
+
+    Outside a task, each thread (e.g. an event subscriber) gets a row of its own.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    key = id(task) if task is not None else threading.get_ident()
+    if key not in _lanes:
+        _lanes[key] = len(_lanes)
+    return _lanes[key]
+
+
+def export_trace(path: Path | None = None) -> Path:
+    """Write the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+    Defaults to logs/trace.json. Returns the path written.
+    """
+    path = path or utils.LOGS_DIR / "trace.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    events = [
+        {
+            "name": event["path"][-1],
+            "cat": event["path"][0],
+            "ph": "X",
+            "ts": (event["start"] - _origin_ns) / 1000,
+            "dur": event["duration"] / 1000,
+            "pid": pid,
+            "tid": event["lane"],
+            "args": {**event["args"], "path": " > ".join(event["path"])},
+        }
+        for event in _events
+    ]
+    utils.atomic_write_text(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+    return path
+
+
+def summarize() -> list[dict]:
+    """Spans aggregated by their path, in order of first appearance.
+
+    Totals of spans that ran concurrently add up, so a phase's children
+    can exceed it.
+    """
+    rows: dict[tuple[str, ...], dict] = {}
+    for event in sorted(_events, key=lambda e: e["start"]):
+        row = rows.setdefault(event["path"], {"path": event["path"], "calls": 0, "total": 0, "max": 0})
+        row["calls"] += 1
+        row["total"] += event["duration"]
+        row["max"] = max(row["max"], event["duration"])
+    ordered = []
+
+    def add_children(parent: tuple[str, ...]) -> None:
+        for path, row in rows.items():
+            if path[:-1] == parent:
+                ordered.append(row)
+                add_children(path)
+
+    add_children(())
+    return ordered
+
+
+def show_trace_summary() -> None:
+    """Per-span table: calls, total and mean time, and share of the traced run's wall time.
+
+    Event subscribers run alongside the rounds, so top-level shares can add
+    up to more than 100%.
+    """
+    rows = summarize()
+    if not rows:
+        return
+    run_total = (
+        max(e["start"] + e["duration"] for e in _events) - min(e["start"] for e in _events)
+    ) or 1
+
+    table = Table(title="Where the time went")
+    table.add_column("Span")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Mean (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    table.add_column("Share", justify="right")
+    for row in rows:
+        table.add_row(
+            "  " * (len(row["path"]) - 1) + row["path"][-1],
+            str(row["calls"]),
+            f"{row['total'] / 1e9:.2f}",
+            f"{row['total'] / row['calls'] / 1e6:.1f}",
+            f"{row['max'] / 1e6:.1f}",
+            f"{row['total'] / run_total:.0%}",
+        )
+    console.print(table)
@@ -1,26 +1,40 @@
-import json
+import os
 import random
 from pathlib import Path
 
-from .models import Agent, ArenaState, Personality
+from .models import Agent, Personality
 
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 PERSONALITIES_DIR = DATA_DIR / "personalities"
-STATE_FILE = DATA_DIR / "arena_state.json"
+STATE_DIR = DATA_DIR / "state"
+STATE_FILE = DATA_DIR / "arena_state.json"  # legacy single-file state, still read
 FEEDBACK_FILE = DATA_DIR / "feedback.md"
+JOURNAL_FILE = DATA_DIR / "round_journal.jsonl"
+CACHE_FILE = DATA_DIR / "llm_cache.sqlite"
+PERSONALITY_DB = DATA_DIR / "personalities.sqlite"
+EMBEDDINGS_DIR = DATA_DIR / "embeddings"
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 
 
-def load_personalities() -> list[Personality]:
-    """Load all personality JSON files from data/personalities/"""
-    personalities = []
-    for file in PERSONALITIES_DIR.glob("*.json"):
-        with open(file) as f:
-            data = json.load(f)
-            personalities.append(Personality(**data))
-    return personalities
+def configure_paths(data_dir: Path, logs_dir: Path) -> None:
+    """Point every data/log path at another directory, e.g. one per batch arena.
+
+    Other modules read these as utils.X at call time, so this takes effect
+    everywhere in the current process.
+    """
+    global DATA_DIR, PERSONALITIES_DIR, STATE_DIR, STATE_FILE, FEEDBACK_FILE, JOURNAL_FILE, CACHE_FILE, PERSONALITY_DB, EMBEDDINGS_DIR, LOGS_DIR
+    DATA_DIR = data_dir
+    PERSONALITIES_DIR = data_dir / "personalities"
+    STATE_DIR = data_dir / "state"
+    STATE_FILE = data_dir / "arena_state.json"
+    FEEDBACK_FILE = data_dir / "feedback.md"
+    JOURNAL_FILE = data_dir / "round_journal.jsonl"
+    CACHE_FILE = data_dir / "llm_cache.sqlite"
+    PERSONALITY_DB = data_dir / "personalities.sqlite"
+    EMBEDDINGS_DIR = data_dir / "embeddings"
+    LOGS_DIR = logs_dir
 
 
 def create_agents(personalities: list[Personality], models: list[str]) -> list[Agent]:
@@ -43,52 +57,12 @@ def create_agents(personalities: list[Personality], models: list[str]) -> list[A
     return agents
 
 
-def save_state(state: ArenaState) -> None:
-    """Persist arena state to JSON."""
-    with open(STATE_FILE, "w") as f:
-        f.write(state.model_dump_json(indent=2))
-
-
-def load_state() -> ArenaState:
-    """Load arena state from JSON, or return fresh state if not found."""
-    if STATE_FILE.exists():
-        with open(STATE_FILE) as f:
-            data = json.load(f)
-            return ArenaState(**data)
-    return ArenaState()
-
-
-def load_feedback() -> str:
-    """Load the feedback file contents."""
-    if FEEDBACK_FILE.exists():
-        return FEEDBACK_FILE.read_text()
-    return ""
-
-
-def save_feedback(new_round_summary: str, max_rounds: int = 5) -> None:
-    """Append new round summary, keep only last N rounds."""
-    
-    # Load existing summaries
-    summaries = []
-    if FEEDBACK_FILE.exists():
-        content = FEEDBACK_FILE.read_text()
-        parts = content.split("## Round ")
-        summaries = [f"## Round {p}" for p in parts[1:] if p.strip()]
-    
-    # Append new summary
-    summaries.append(new_round_summary)
-    
-    # Keep only last N
-    summaries = summaries[-max_rounds:]
-    
-    # Write back
-    header = "# Arena Feedback\n\nRecent voting patterns and eliminations.\n\n"
-    FEEDBACK_FILE.write_text(header + "\n".join(summaries))
-
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write a file so readers see either the old or the new contents, never a mix."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
-def save_round_log(round_result: dict, round_number: int) -> None:
-    """Save a round's complete log to logs/round-XXX.json"""
-    LOGS_DIR.mkdir(exist_ok=True)
-    log_file = LOGS_DIR / f"round-{round_number:03d}.json"
-    with open(log_file, "w") as f:
-        json.dump(round_result, f, indent=2, default=str)
\ No newline at end of file
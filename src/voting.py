@@ -0,0 +1,103 @@
+import random
+
+from .models import Agent, ArenaState
+
+# "full": every voter judges every other answer (O(n²) prompt tokens per round)
+# "subset": every voter judges ballot_size others; each answer is on ballot_size ballots
+# "pairwise": answers are paired at random (a bracket); each voter judges one pair
+# "swiss": like pairwise, but answers are paired with neighbours in the standings
+VOTING_MODES = ("full", "subset", "pairwise", "swiss")
+
+
+def assign_ballots(state: ArenaState, round_num: int) -> dict[str, list[str]]:
+    """Decide which answers each agent judges this round: voter id -> candidate ids.
+
+    Ballots only depend on the round number and the agents, so a resumed
+    round gets the same ballots. In "full" mode a ballot lists everyone,
+    the voter included, as the shared vote prompt always has.
+    """
+    agents = state.agents
+    ids = [a.personality_id for a in agents]
+    mode = state.voting_mode
+    if mode not in VOTING_MODES:
+        raise ValueError(f"Unknown voting mode: {mode}")
+
+    if mode == "full" or len(agents) <= 3:
+        return {voter: list(ids) for voter in ids}
+
+    rng = random.Random(f"{round_num}:{','.join(ids)}")
+
+    if mode == "subset":
+        # Rotation over a shuffled order: each voter takes the next k agents,
+        # so every answer lands on exactly k ballots and never its own
+        k = min(state.ballot_size, len(ids) - 1)
+        order = rng.sample(ids, len(ids))
+        return {
+            voter: [order[(i + step) % len(order)] for step in range(1, k + 1)]
+            for i, voter in enumerate(order)
+        }
+
+    if mode == "pairwise":
+        order = rng.sample(ids, len(ids))
+    else:
+        order = [a.personality_id for a in _standings(agents, rng)]
+    return _pair_ballots(order)
+
+
+def average_votes(agent: Agent) -> float:
+    """Normalised votes per round played: an agent's standing, comparable across modes."""
+    return agent.normalized_votes_received / max(agent.rounds_participated, 1)
+
+
+def _standings(agents: list[Agent], rng: random.Random) -> list[Agent]:
+    """Agents by average normalised votes per round, ties broken at random."""
+    shuffled = rng.sample(agents, len(agents))
+    return sorted(shuffled, key=average_votes, reverse=True)
+
+
+def _pair_ballots(order: list[str]) -> dict[str, list[str]]:
+    """Pair neighbours in order and give every voter one pair to judge.
+
+    With an even count the pairs are disjoint, and each is judged by the
+    pair halfway round the list. With an odd count every answer is paired
+    with both its neighbours (the last with the first), and each pair is
+    judged by the agent two places on. Either way every answer is on two
+    ballots of two, so nobody is less exposed (and likelier to go voteless)
+    than the rest.
+    """
+    n = len(order)
+    if n % 2:
+        return {order[(i + 2) % n]: [order[i], order[(i + 1) % n]] for i in range(n)}
+
+    groups = [order[i:i + 2] for i in range(0, n, 2)]
+    shift = max(len(groups) // 2, 1)
+    return {
+        voter: list(groups[(g + shift) % len(groups)])
+        for g, group in enumerate(groups)
+        for voter in group
+    }
+
+
+def exposure(ballots: dict[str, list[str]]) -> dict[str, float]:
+    """Votes each agent would get if every voter picked at random from their ballot.
+
+    Every agent's exposure is 1.0 in "full" mode.
+    """
+    expected: dict[str, float] = {}
+    for voter, candidates in ballots.items():
+        others = [c for c in candidates if c != voter]
+        for candidate in others:
+            expected[candidate] = expected.get(candidate, 0.0) + 1 / len(others)
+    return expected
+
+
+def normalize_tally(vote_tally: dict[str, int], ballots: dict[str, list[str]]) -> dict[str, float]:
+    """Votes scaled by exposure, on the scale of a "full" round.
+
+    An answer shown to fewer voters (or on more crowded ballots) is not
+    penalised for it, so standings and drought stay comparable across modes.
+    """
+    return {
+        agent_id: vote_tally.get(agent_id, 0) / weight if weight else 0.0
+        for agent_id, weight in exposure(ballots).items()
+    }
@@ -0,0 +1,53 @@
+import pytest
+
+from src import backends, cache, events, utils
+from src.backends import FakeBackend, FakeLLM
+from src.batch import use_arena_dir
+from src.cache import ResponseCache
+from src.models import Agent
+from src.ollama_client import ArenaClient
+
+STARTERS_DIR = utils.PERSONALITIES_DIR
+
+_PATHS = (
+    "DATA_DIR", "PERSONALITIES_DIR", "STATE_DIR", "STATE_FILE", "FEEDBACK_FILE", "JOURNAL_FILE",
+    "CACHE_FILE", "PERSONALITY_DB", "EMBEDDINGS_DIR", "LOGS_DIR",
+)
+
+
+def fast_fake(**kwargs) -> FakeLLM:
+    """A FakeLLM with no simulated waiting."""
+    return FakeLLM(latency=0, tokens_per_second=1e9, prompt_tokens_per_second=1e9, load_seconds=0, **kwargs)
+
+
+def make_agent(pid: str, name: str, model: str = "phi4:14b") -> Agent:
+    return Agent(
+        personality_id=pid, name=name, model=model,
+        persona="Thinks carefully.", voting_criteria="Clarity.", generation=0,
+    )
+
+
+@pytest.fixture
+def starters_dir():
+    """The repo's starter personalities."""
+    return STARTERS_DIR
+
+
+@pytest.fixture
+def arena_dir(tmp_path, monkeypatch):
+    """A fresh arena directory with the starter personalities, on the fake backend."""
+    for name in _PATHS:
+        monkeypatch.setattr(utils, name, getattr(utils, name))
+    monkeypatch.setattr(backends, "BACKEND", "fake")
+    monkeypatch.setattr(backends, "_fake_llm", fast_fake())
+    monkeypatch.setattr(cache, "_caches", {})
+    use_arena_dir(tmp_path, STARTERS_DIR)
+    yield tmp_path
+    events.shutdown()
+
+
+@pytest.fixture
+def client(tmp_path):
+    """An ArenaClient on a fast fake backend, with caching off."""
+    cache = ResponseCache(tmp_path / "cache.sqlite", mode="off")
+    return ArenaClient(cache=cache, backend=FakeBackend(fast_fake()))
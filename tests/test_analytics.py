@@ -0,0 +1,91 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.analytics import ELO_K, ELO_START, VoteAnalytics
+from src.models import Response, RoundResult, Vote
+from src.round_log import RoundLog
+
+NAMES = {"a": "Ada", "b": "Bo", "c": "Cy"}
+
+
+def make_round(round_number: int, votes: list[tuple[str, str]], ballots: dict | None = None) -> RoundResult:
+    tally: dict[str, int] = {}
+    for _, votee in votes:
+        tally[votee] = tally.get(votee, 0) + 1
+    return RoundResult(
+        round_number=round_number,
+        question="What is a fair wage?",
+        responses=[
+            Response(agent_id=pid, agent_name=name, model="phi4:14b", content="An answer.")
+            for pid, name in NAMES.items()
+        ],
+        votes=[
+            Vote(voter_id=voter, voter_name=NAMES[voter], voted_for_id=votee, voted_for_name=NAMES[votee])
+            for voter, votee in votes
+        ],
+        vote_tally=tally,
+        ballots=ballots or {},
+    )
+
+
+# a beats b and c, b beats c: each vote beats every answer bar the voter's own
+TRANSITIVE = [("a", "b"), ("b", "a"), ("c", "a")]
+
+
+def test_votes_and_pairwise_wins():
+    analytics = VoteAnalytics()
+    analytics.add_round(make_round(1, TRANSITIVE))
+    assert analytics.agent_ids == ["a", "b", "c"]
+    assert analytics.votes[:3, :3].tolist() == [[0, 1, 0], [1, 0, 0], [1, 0, 0]]
+    assert analytics.wins[:3, :3].tolist() == [[0, 1, 1], [0, 0, 1], [0, 0, 0]]
+    assert analytics.fitness() == {"a": 2.0, "b": 1.0, "c": 0.0}
+    assert analytics.tensor().shape == (3, 3, 1)
+
+
+def test_ballots_limit_who_a_vote_beats():
+    analytics = VoteAnalytics()
+    analytics.add_round(make_round(1, [("a", "c")], ballots={"a": ["b", "c"]}))
+    assert analytics.wins[:3, :3].tolist() == [[0, 0, 0], [0, 0, 0], [0, 1, 0]]
+
+
+def test_elo_after_one_round():
+    analytics = VoteAnalytics()
+    analytics.add_round(make_round(1, TRANSITIVE))
+    # From equal ratings every game is expected to be a draw: a scores +1, c -1
+    elo = analytics.elo_ratings()
+    assert elo["a"] == pytest.approx(ELO_START + ELO_K / 3)
+    assert elo["b"] == pytest.approx(ELO_START)
+    assert elo["c"] == pytest.approx(ELO_START - ELO_K / 3)
+
+
+def test_bradley_terry_fits_the_win_matrix():
+    analytics = VoteAnalytics()
+    analytics.add_round(make_round(1, TRANSITIVE))
+    ratings = analytics.bradley_terry()
+    assert ratings["a"] > ratings["b"] > ratings["c"]
+    # The middle agent is at the geometric mean, the others symmetric around it
+    assert ratings["b"] == pytest.approx(ELO_START)
+    assert ratings["a"] - ELO_START == pytest.approx(ELO_START - ratings["c"])
+
+    # Maximum likelihood: each agent's expected wins equal its actual wins (prior included)
+    strength = {pid: 10 ** ((r - ELO_START) / 400) for pid, r in ratings.items()}
+    wins = {("a", "b"): 1.5, ("b", "a"): 0.5, ("a", "c"): 1.5, ("c", "a"): 0.5, ("b", "c"): 1.5, ("c", "b"): 0.5}
+    for i in strength:
+        actual = sum(w for (winner, _), w in wins.items() if winner == i)
+        expected = sum(
+            2 * strength[i] / (strength[i] + strength[j])
+            for j in strength if j != i
+        )
+        assert expected == pytest.approx(actual, rel=1e-6)
+
+
+def test_update_follows_a_growing_log(tmp_path):
+    log = RoundLog(tmp_path)
+    log.append(make_round(1, TRANSITIVE))
+    analytics = VoteAnalytics.from_log(log)
+    log.append(make_round(2, [("a", "c"), ("b", "c"), ("c", "b")]))
+    assert analytics.update(log) == 1
+    assert analytics.update(log) == 0
+    assert analytics.round_numbers == [1, 2]
+    assert analytics.received_by_round().tolist() == [[2, 1, 0], [0, 1, 2]]
@@ -0,0 +1,34 @@
+import shutil
+
+from src import cache
+from src.batch import run_single_arena
+
+QUESTIONS = ["What makes an argument persuasive?", "Should rules ever be broken?"]
+
+
+def test_arenas_in_one_process_keep_their_own_cache(arena_dir, starters_dir):
+    first = run_single_arena(1, QUESTIONS, arena_dir / "arena-1", starters_dir, total_rounds=2)
+    second = run_single_arena(1, QUESTIONS, arena_dir / "arena-2", starters_dir, total_rounds=2)
+
+    paths = sorted(cache._caches)
+    assert paths == [arena_dir / f"arena-{n}" / "data" / "llm_cache.sqlite" for n in (1, 2)]
+    for path in paths:
+        stats = cache._caches[path].stats()
+        assert stats["entries"] > 0
+        assert stats["hits"] == 0
+
+    assert first == second  # same seed and questions: same requests, so the same arena
+
+
+def test_a_rerun_in_a_fresh_process_replays_from_the_cache(arena_dir, starters_dir, monkeypatch):
+    recorded = run_single_arena(1, QUESTIONS, arena_dir / "arena-1", starters_dir, total_rounds=2)
+
+    # Same seed in a new arena directory holding the recorded cache, as a new process
+    replay_dir = arena_dir / "arena-1-replay" / "data"
+    replay_dir.mkdir(parents=True)
+    for path in (arena_dir / "arena-1" / "data").glob("llm_cache.sqlite*"):  # with its WAL
+        shutil.copy(path, replay_dir / path.name)
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setattr(cache, "CACHE_MODE", "replay")
+    replayed = run_single_arena(1, QUESTIONS, arena_dir / "arena-1-replay", starters_dir, total_rounds=2)
+    assert replayed == recorded
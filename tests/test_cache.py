@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.cache import CacheMiss, ResponseCache
+
+MESSAGES = [{"role": "user", "content": "What is justice?"}]
+RESPONSE = {"message": {"role": "assistant", "content": "Fairness."}, "eval_count": 3}
+
+
+def test_key_is_stable_and_covers_the_request():
+    key = ResponseCache.key("phi4:14b", MESSAGES, options={"num_predict": 10, "num_ctx": 4096})
+    assert key == ResponseCache.key("phi4:14b", MESSAGES, options={"num_ctx": 4096, "num_predict": 10})
+    assert len(key) == 64
+    assert key != ResponseCache.key("qwen3:8b", MESSAGES, options={"num_predict": 10, "num_ctx": 4096})
+    assert key != ResponseCache.key("phi4:14b", MESSAGES, options={"num_predict": 11, "num_ctx": 4096})
+    assert key != ResponseCache.key("phi4:14b", MESSAGES + MESSAGES, options={"num_predict": 10, "num_ctx": 4096})
+    assert key != ResponseCache.key("phi4:14b", MESSAGES, format="json", options={"num_predict": 10, "num_ctx": 4096})
+
+
+def test_keep_alive_is_not_part_of_the_key():
+    assert ResponseCache.key("phi4:14b", MESSAGES) == ResponseCache.key("phi4:14b", MESSAGES, keep_alive="10m")
+
+
+def test_read_write_stores_and_serves(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite", mode="read_write")
+    key = ResponseCache.key("phi4:14b", MESSAGES)
+    assert cache.get(key) is None
+    cache.put(key, "phi4:14b", RESPONSE)
+    assert cache.get(key) == RESPONSE
+    assert cache.stats() | {"bytes": 0} == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1, "bytes": 0}
+
+
+def test_entries_survive_reopening(tmp_path):
+    key = ResponseCache.key("phi4:14b", MESSAGES)
+    ResponseCache(tmp_path / "c.sqlite").put(key, "phi4:14b", RESPONSE)
+    assert ResponseCache(tmp_path / "c.sqlite", mode="replay").get(key) == RESPONSE
+
+
+def test_replay_raises_on_a_miss_and_stores_nothing(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite", mode="replay")
+    key = ResponseCache.key("phi4:14b", MESSAGES)
+    with pytest.raises(CacheMiss):
+        cache.get(key)
+    cache.put(key, "phi4:14b", RESPONSE)
+    assert cache.stats()["entries"] == 0
+
+
+def test_off_neither_reads_nor_writes(tmp_path):
+    key = ResponseCache.key("phi4:14b", MESSAGES)
+    ResponseCache(tmp_path / "c.sqlite").put(key, "phi4:14b", RESPONSE)
+    cache = ResponseCache(tmp_path / "c.sqlite", mode="off")
+    assert cache.get(key) is None
+    cache.put(ResponseCache.key("qwen3:8b", MESSAGES), "qwen3:8b", RESPONSE)
+    assert cache.stats()["entries"] == 1
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ResponseCache(tmp_path / "c.sqlite", mode="sometimes")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    body = {"text": "x" * 100}
+    size = len(json.dumps(body).encode())
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=3 * size)
+    keys = [ResponseCache.key(f"model-{i}", MESSAGES) for i in range(4)]
+    for key in keys[:3]:
+        cache.put(key, "m", body)
+    cache.get(keys[0])  # keys[1] is now the least recently used
+    cache.put(keys[3], "m", body)
+    assert cache.evictions == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == body
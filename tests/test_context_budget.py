@@ -0,0 +1,54 @@
+import asyncio
+
+from src import context_budget
+from src.backends import FakeBackend
+from src.cache import ResponseCache
+from src.context_budget import BASE_NUM_CTX, fit_prompt, preload_num_ctx
+from src.ollama_client import ArenaClient
+
+from .conftest import fast_fake
+
+
+def num_ctx(model: str, chars: int, output_tokens: int = 256) -> int:
+    build = lambda text: [{"role": "user", "content": "x" * chars + text}]  # noqa: E731
+    return fit_prompt(model, build, "", None, output_tokens)[1]["num_ctx"]
+
+
+def test_num_ctx_depends_only_on_the_prompt():
+    small = num_ctx("qwen3:8b", 100)
+    assert small == BASE_NUM_CTX
+    assert num_ctx("qwen3:8b", 40_000) == 16384
+    assert num_ctx("qwen3:8b", 100) == small  # a bigger prompt earlier changes nothing
+
+
+def test_num_ctx_is_capped_at_the_model_limit():
+    assert num_ctx("phi4:14b", 200_000) == 16384
+    assert num_ctx("unknown-model", 100) == 8192
+    context_budget.MODEL_CONTEXT["tiny"] = 4096
+    try:
+        assert num_ctx("tiny", 100) == preload_num_ctx("tiny") == 4096
+    finally:
+        del context_budget.MODEL_CONTEXT["tiny"]
+
+
+def test_budgeter_off_sends_no_num_ctx(monkeypatch):
+    monkeypatch.setattr(context_budget, "CONTEXT_BUDGET", False)
+    assert fit_prompt("qwen3:8b", lambda text: [{"role": "user", "content": text}], "", None, 256)[1] == {}
+    assert preload_num_ctx("qwen3:8b") is None
+
+
+def test_preloaded_model_is_not_reloaded_by_its_first_call(tmp_path):
+    llm = fast_fake()
+    llm.load_seconds = 0.01
+    client = ArenaClient(cache=ResponseCache(tmp_path / "cache.sqlite", mode="off"), backend=FakeBackend(llm))
+    messages, options, _ = fit_prompt(
+        "qwen3:8b", lambda text: [{"role": "user", "content": "Why?" + text}], "", None, 256
+    )
+
+    async def run(model: str, preload) -> dict:
+        await preload(model)
+        return await client.chat(model, messages, options=options)
+
+    assert asyncio.run(run("qwen3:8b", client.preload))["load_duration"] == 0
+    # Loaded at the server's default context, the first call has to reload it
+    assert asyncio.run(run("mistral:7b", client.backend.load))["load_duration"] > 0
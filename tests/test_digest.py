@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from src import digest
+from src.digest import digest_responses, extractive_digest, shown_to_voters
+from src.models import Response
+
+LONG = (
+    "Wages should track productivity. "
+    + " ".join(f"Point {i} is that productivity gains should reach the workers who make them." for i in range(20))
+    + " Anyway, lunch was nice."
+)
+
+
+def make_response(pid: str, content: str) -> Response:
+    return Response(agent_id=pid, agent_name=pid.title(), model="phi4:14b", content=content)
+
+
+@pytest.fixture
+def digests(monkeypatch):
+    """Extractive digests with an empty process cache."""
+    monkeypatch.setattr(digest, "DIGEST_MODE", "extractive")
+    monkeypatch.setattr(digest, "_digests", {})
+    return digest._digests
+
+
+def test_short_text_is_kept_whole():
+    assert extractive_digest("  A short answer.  ", max_chars=100) == "A short answer."
+
+
+def test_extractive_digest_keeps_the_thesis_within_the_limit():
+    result = extractive_digest(LONG, max_chars=200)
+    assert len(result) <= 200
+    assert result.startswith("Wages should track productivity.")
+    assert "lunch" not in result
+    # Kept sentences stay in their original order
+    kept = [s for s in result.split(". ") if s.startswith("Point")]
+    assert kept == sorted(kept, key=LONG.index)
+
+
+def test_an_overlong_first_sentence_is_cut_at_a_word():
+    result = extractive_digest("word " * 100 + "end.", max_chars=50)
+    assert len(result) <= 50
+    assert result.endswith("word…")
+
+
+def test_only_answers_over_the_threshold_get_a_digest(digests, client, monkeypatch):
+    monkeypatch.setattr(digest, "DIGEST_MAX_CHARS", 200)
+    short, long = make_response("a", "x" * 200), make_response("b", LONG)
+    result = asyncio.run(digest_responses(client, [short, long]))
+    assert result[0].digest is None
+    assert result[1].digest.method == "extractive"
+    assert result[1].digest.text == extractive_digest(LONG, 200)
+    assert long.digest is None  # the originals are left alone
+    assert len(digests) == 1
+
+
+def test_digests_are_off_by_default(client):
+    responses = [make_response("a", LONG)]
+    assert asyncio.run(digest_responses(client, responses)) is responses
+
+
+def test_model_digests_are_cached(digests, client, monkeypatch):
+    monkeypatch.setattr(digest, "DIGEST_MODE", "model")
+    first = asyncio.run(digest_responses(client, [make_response("a", LONG)]))[0].digest
+    again = asyncio.run(digest_responses(client, [make_response("b", LONG)]))[0].digest
+    assert first.method == again.method == digest.DIGEST_MODEL
+    assert len(first.text) <= digest.DIGEST_MAX_CHARS
+    assert first.metrics.calls == 1
+    assert again.text == first.text and again.metrics.calls == 0
+
+
+def test_voters_are_shown_the_digest(digests, client):
+    response = asyncio.run(digest_responses(client, [make_response("a", LONG)]))[0]
+    shown = shown_to_voters(response)
+    assert shown.content == response.digest.text
+    assert response.content == LONG
+    plain = make_response("b", "Short.")
+    assert shown_to_voters(plain) is plain
@@ -0,0 +1,44 @@
+import asyncio
+
+from src import elimination
+from src.elimination import draft_replacements
+from src.models import ArenaState
+
+from .conftest import make_agent
+
+
+def test_each_speculative_draft_assumes_only_its_agent_is_eliminated(client, monkeypatch):
+    prompts = {}
+
+    async def draft_persona(client, survivors, eliminated_info, feedback, replacing, parent=None, history=None, **_):
+        prompts[replacing] = ([a.name for a in survivors], [e["name"] for e in eliminated_info])
+        return {"name": f"After {replacing}"}
+
+    monkeypatch.setattr(elimination, "draft_persona", draft_persona)
+    state = ArenaState(agents=[make_agent(f"p{i}", name) for i, name in enumerate(["Ada", "Boole", "Curie", "Dirac"])])
+    candidates = state.agents[1:3]
+
+    drafts = asyncio.run(draft_replacements(client, state, candidates))
+    assert drafts == {"p1": {"name": "After Boole"}, "p2": {"name": "After Curie"}}
+    assert prompts == {
+        "Boole": (["Ada", "Curie", "Dirac"], ["Boole"]),
+        "Curie": (["Ada", "Boole", "Dirac"], ["Curie"]),
+    }
+
+
+def test_parent_steers_the_prompt_only_when_the_arena_inherits(client, monkeypatch):
+    prompts = []
+
+    async def chat(model, messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        return {"message": {"content": '{"name": "N", "persona": "P", "voting_criteria": "V", "strategy_notes": "S"}'}}
+
+    monkeypatch.setattr(client, "chat", chat)
+    parent = make_agent("p0", "Ada")
+    for inherit in (False, True):
+        draft = asyncio.run(elimination.draft_persona(
+            client, [parent], [], "", replacing="Boole", parent=parent, inherit=inherit,
+        ))
+        assert draft["parent_id"] == "p0"
+    assert "descends from Ada" not in prompts[0]
+    assert "descends from Ada" in prompts[1]
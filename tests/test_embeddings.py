@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.embeddings import DiversityIndex, EmbeddingStore, HashingEmbedder
+from src.models import Response, RoundResult
+
+
+class CountingEmbedder(HashingEmbedder):
+    """A small hashing embedder that records every text it is asked to embed."""
+
+    def __init__(self) -> None:
+        super().__init__(dim=16)
+        self.seen: list[str] = []
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        self.seen.extend(texts)
+        return super().embed(texts)
+
+
+def test_only_new_texts_are_embedded(tmp_path):
+    embedder = CountingEmbedder()
+    store = EmbeddingStore(embedder, tmp_path)
+    first = store.vectors(["fair wages", "broken promises", "fair wages"])
+    assert embedder.seen == ["fair wages", "broken promises"]
+    np.testing.assert_array_equal(first[0], first[2])
+
+    again = store.vectors(["broken promises", "open borders"])
+    assert embedder.seen[2:] == ["open borders"]
+    np.testing.assert_array_equal(again[0], first[1])
+    np.testing.assert_array_equal(again, HashingEmbedder(16).embed(["broken promises", "open borders"]))
+    assert len(store) == store.embedded == 3
+
+
+def test_a_reopened_store_reads_vectors_back_from_the_memmap(tmp_path):
+    texts = [f"answer number {i}" for i in range(1500)]  # past the first 1024-row allocation
+    written = EmbeddingStore(CountingEmbedder(), tmp_path).vectors(texts)
+
+    embedder = CountingEmbedder()
+    reopened = EmbeddingStore(embedder, tmp_path)
+    assert len(reopened) == 1500 and reopened.dim == 16
+    np.testing.assert_array_equal(reopened.vectors(texts[::-1]), written[::-1])
+    assert embedder.seen == [] and reopened.embedded == 0
+
+
+def test_keys_without_vectors_start_the_cache_over(tmp_path):
+    EmbeddingStore(CountingEmbedder(), tmp_path).vectors(["fair wages"])
+    (tmp_path / "hashing-16.f32").write_bytes(b"")
+
+    embedder = CountingEmbedder()
+    store = EmbeddingStore(embedder, tmp_path)
+    assert len(store) == 0
+    store.vectors(["fair wages"])
+    assert embedder.seen == ["fair wages"]
+
+
+def test_identical_answers_are_fully_similar(tmp_path):
+    responses = [
+        Response(agent_id=pid, agent_name=pid, model="phi4:14b", content="Pay people what they produce.")
+        for pid in ("a", "b", "c")
+    ]
+    result = RoundResult(round_number=1, question="What is a fair wage?", responses=responses, votes=[], vote_tally={})
+    index = DiversityIndex(EmbeddingStore(CountingEmbedder(), tmp_path))
+    diversity = index.add_round(result)
+    assert diversity.similarity == pytest.approx(1.0)
+    assert diversity.centroid_similarity is None
+    assert index.add_round(result.model_copy(update={"round_number": 2})).self_similarity == pytest.approx(1.0)
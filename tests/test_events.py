@@ -0,0 +1,36 @@
+from src import events
+from src.events import ConsoleView, EventBus, PhaseCompleted, ResponseReady, VoteCast
+from src.models import Response, Vote
+
+
+def response(agent_id: str) -> Response:
+    return Response(agent_id=agent_id, agent_name=agent_id.title(), model="phi4:14b", content=f"{agent_id} says")
+
+
+def vote(voter_id: str, voted_for_id: str) -> Vote:
+    return Vote(
+        voter_id=voter_id, voter_name=voter_id.title(),
+        voted_for_id=voted_for_id, voted_for_name=voted_for_id.title(), reasoning="clear",
+    )
+
+
+def test_console_prints_each_phase_in_agent_order(monkeypatch):
+    shown = []
+    monkeypatch.setattr(events, "show_response", lambda r: shown.append(("response", r.agent_id)))
+    monkeypatch.setattr(events, "show_vote", lambda v: shown.append(("vote", v.voter_id)))
+    bus = EventBus()
+    bus.subscribe("console", ConsoleView().handlers())
+
+    order = ["ada", "boole", "curie"]
+    for agent_id in ["curie", "ada", "boole"]:  # completion order
+        bus.publish(ResponseReady(round_number=1, response=response(agent_id)))
+    bus.flush()
+    assert shown == []
+
+    bus.publish(PhaseCompleted(round_number=1, phase="responses", order=order))
+    for voter, choice in [("boole", "ada"), ("curie", "ada")]:  # ada abstained
+        bus.publish(VoteCast(round_number=1, vote=vote(voter, choice)))
+    bus.publish(PhaseCompleted(round_number=1, phase="votes", order=order))
+    bus.close()
+
+    assert shown == [("response", "ada"), ("response", "boole"), ("response", "curie"), ("vote", "boole"), ("vote", "curie")]
@@ -0,0 +1,60 @@
+import json
+
+from src import backends, cache, utils
+from src.journal import append_journal, clear_journal, read_journal
+from src.main import initialize_arena
+from src.models import Response
+from src.round_runner import run_round
+
+QUESTION = "Is it ever right to break a promise?"
+
+
+def test_read_journal_skips_other_rounds_and_a_torn_line(arena_dir):
+    append_journal(1, "question", {"question": "First?"})
+    append_journal(2, "question", {"question": "Second?"})
+    response = Response(agent_id="a", agent_name="Ada", model="phi4:14b", content="Yes.")
+    append_journal(2, "response", response.model_dump())
+    with open(utils.JOURNAL_FILE, "a") as f:
+        f.write('{"round": 2, "kind": "vo')  # crash mid-write
+
+    question, responses, votes = read_journal(2)
+    assert question == "Second?"
+    assert responses == {"a": response}
+    assert votes == {}
+
+
+def test_clear_journal_keeps_later_rounds(arena_dir):
+    append_journal(1, "question", {"question": "First?"})
+    append_journal(2, "question", {"question": "Second?"})
+    clear_journal(through_round=1)
+    assert read_journal(1)[0] is None
+    assert read_journal(2)[0] == "Second?"
+    clear_journal()
+    assert not utils.JOURNAL_FILE.exists()
+
+
+def test_interrupted_round_resumes_with_only_the_missing_calls(arena_dir, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_MODE", "off")
+    state = initialize_arena()
+    crashed = state.model_copy(deep=True)
+
+    llm = backends.get_fake_llm()
+    full = run_round(state, QUESTION)
+    full_calls = llm.calls
+
+    # Keep the question, two answers and a vote, as if the run died mid-round
+    entries = [json.loads(line) for line in utils.JOURNAL_FILE.read_text().splitlines()]
+    kept = [e for e in entries if e["kind"] == "question"]
+    kept += [e for e in entries if e["kind"] == "response"][:2]
+    kept += [e for e in entries if e["kind"] == "vote"][:1]
+    utils.JOURNAL_FILE.write_text("".join(json.dumps(e) + "\n" for e in kept))
+
+    llm.calls = 0
+    resumed = run_round(crashed, "A different question")
+    assert llm.calls == full_calls - 3
+    assert resumed.question == QUESTION
+    assert [r.content for r in resumed.responses] == [r.content for r in full.responses]
+    journaled = [Response(**e["data"]) for e in kept if e["kind"] == "response"]
+    assert all(r in resumed.responses for r in journaled)
+    assert [v.voted_for_id for v in resumed.votes] == [v.voted_for_id for v in full.votes]
+    assert crashed.current_round == 1
@@ -0,0 +1,80 @@
+import json
+
+from src import persistence, utils
+from src.main import initialize_arena
+from src.models import ArenaState, Elimination, FeedbackEntry
+from src.persistence import SNAPSHOT_INTERVAL, load_state, save_state
+
+
+def play(state: ArenaState) -> None:
+    """Change the state the way a round would: votes, droughts, history, an occasional elimination."""
+    state.current_round += 1
+    state.feedback.append(FeedbackEntry(
+        round_number=state.current_round, question=f"Question {state.current_round}?",
+        vote_counts=[(a.name, i % 2) for i, a in enumerate(state.agents)], reasons=[],
+    ))
+    for i, agent in enumerate(state.agents):
+        agent.rounds_participated += 1
+        agent.total_votes_received += i % 2
+        agent.rounds_without_votes = 0 if i % 2 else agent.rounds_without_votes + 1
+    if state.current_round % 4 == 0:
+        gone = state.agents.pop(0)
+        state.elimination_history.append(Elimination(
+            agent_id=gone.personality_id, agent_name=gone.name, model=gone.model,
+            rounds_survived=gone.rounds_participated,
+        ))
+        state.agents.append(gone.model_copy(update={"personality_id": f"gen-{state.current_round}"}))
+
+
+def reload(monkeypatch) -> ArenaState:
+    """Load the state as a fresh process would."""
+    monkeypatch.setattr(persistence, "_last_saved", {})
+    return load_state()
+
+
+def test_snapshot_and_deltas_round_trip(arena_dir, monkeypatch):
+    state = initialize_arena()
+    for _ in range(SNAPSHOT_INTERVAL + 3):
+        play(state)
+        save_state(state)
+        assert persistence._last_saved[utils.STATE_DIR][1] == state.model_dump(mode="json")
+
+    assert len(list(utils.STATE_DIR.glob("snapshot-*.json"))) == 1
+    assert len((utils.STATE_DIR / "deltas.jsonl").read_text().splitlines()) == 3
+    assert reload(monkeypatch) == state
+
+
+def test_saving_after_a_reload_continues_the_sequence(arena_dir, monkeypatch):
+    state = initialize_arena()
+    play(state)
+    save_state(state)
+    play(state)
+    save_state(state)
+
+    state = reload(monkeypatch)
+    play(state)
+    save_state(state)
+    assert reload(monkeypatch) == state
+
+
+def test_a_torn_delta_is_ignored(arena_dir, monkeypatch):
+    state = initialize_arena()
+    save_state(state)
+    play(state)
+    save_state(state)
+    saved = state.model_copy(deep=True)
+    with open(utils.STATE_DIR / "deltas.jsonl", "a") as f:
+        f.write('{"seq": 3, "delta": {"curr')  # crash mid-write
+
+    assert reload(monkeypatch) == saved
+    play(saved)
+    save_state(saved)
+    assert reload(monkeypatch) == saved
+
+
+def test_legacy_state_file_is_read_without_a_snapshot(arena_dir, monkeypatch):
+    state = initialize_arena()
+    play(state)
+    utils.STATE_FILE.write_text(json.dumps(state.model_dump(mode="json")))
+    assert reload(monkeypatch) == state
+    assert not utils.STATE_DIR.exists() or not any(utils.STATE_DIR.iterdir())
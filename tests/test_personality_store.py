@@ -0,0 +1,76 @@
+import pytest
+
+from src import utils
+from src.models import Personality
+from src.personality_store import PersonalityStore, get_store
+
+
+def persona(pid: str, parent: str | None = None, generation: int = 1, born: int = 1) -> Personality:
+    return Personality(
+        id=pid, name=pid.title(), model="phi4:14b", persona="Argues from data.",
+        voting_criteria="Evidence.", generation=generation, parent_id=parent, born_round=born,
+    )
+
+
+@pytest.fixture
+def store(arena_dir):
+    """A store with a family tree: starter-1 → gen-1 → gen-2 → gen-3, and gen-4 a child of gen-1."""
+    store = PersonalityStore(arena_dir / "store.sqlite")
+    store.put_many([
+        persona("gen-1", "starter-1", 1, born=3),
+        persona("gen-2", "gen-1", 2, born=5),
+        persona("gen-3", "gen-2", 3, born=8),
+        persona("gen-4", "gen-1", 2, born=6),
+    ])
+    return store
+
+
+def ids(personalities: list[Personality]) -> list[str]:
+    return [p.id for p in personalities]
+
+
+def test_a_new_store_imports_the_starters(arena_dir):
+    store = PersonalityStore(arena_dir / "store.sqlite")
+    assert ids(store.starters()) == [f"starter-{i}" for i in range(1, 6)]
+    assert len(store) == 5
+
+
+def test_round_trip(store):
+    original = persona("gen-9", "gen-3", 4, born=12)
+    store.put(original)
+    assert store.get("gen-9") == original
+    assert store.get("missing") is None
+
+    store.put(original.model_copy(update={"name": "Renamed"}))
+    assert store.get("gen-9").name == "Renamed"
+    store.put_many([original], replace=False)
+    assert store.get("gen-9").name == "Renamed"
+
+
+def test_lineage(store):
+    assert ids(store.ancestors("gen-3")) == ["gen-2", "gen-1", "starter-1"]
+    assert store.ancestors("starter-1") == []
+    assert ids(store.children("gen-1")) == ["gen-2", "gen-4"]
+    assert ids(store.descendants("starter-1")) == ["gen-1", "gen-2", "gen-4", "gen-3"]
+    assert store.descendants("gen-3") == []
+
+
+def test_generation_and_life_queries(store):
+    store.mark_dead("gen-2", 9)
+    assert store.get("gen-2").died_round == 9
+    assert "gen-2" not in ids(store.alive())
+    assert ids(store.by_generation(2)) == ["gen-2", "gen-4"]
+    assert ids(store.born_between(5, 8)) == ["gen-2", "gen-4"]
+
+
+def test_export_and_import(store, tmp_path):
+    assert store.export_json(tmp_path / "export") == len(store) == 9
+    copy = PersonalityStore(tmp_path / "copy.sqlite")
+    assert copy.import_json(tmp_path / "export") == 9
+    assert copy.get("gen-3") == store.get("gen-3")
+    assert ids(copy.ancestors("gen-3")) == ids(store.ancestors("gen-3"))
+
+
+def test_one_store_per_data_directory(arena_dir):
+    assert get_store() is get_store()
+    assert get_store().path == utils.PERSONALITY_DB
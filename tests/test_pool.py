@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import ollama
+import pytest
+
+from src import stub_server
+from src.backends import Endpoint, FakeBackend, NoEndpointError, PoolBackend
+
+from .conftest import fast_fake
+
+MODEL = "phi4:14b"
+MESSAGES = [{"role": "user", "content": "What is a fair wage?"}]
+
+
+class StubServer:
+    """Stands in for one endpoint's OllamaBackend; raises error on every call if set."""
+
+    def __init__(self, installed: tuple[str, ...] = (MODEL,), error: Exception | None = None) -> None:
+        self.backend = FakeBackend(fast_fake())
+        self.installed = installed
+        self.error = error
+        self.calls = 0
+
+    async def model_sizes(self) -> dict[str, int]:
+        return {model: 1 for model in self.installed}
+
+    async def running_models(self) -> list[str]:
+        return []
+
+    async def chat(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return await self.backend.chat(model, messages, **kwargs)
+
+    async def chat_stream(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        async for chunk in self.backend.chat_stream(model, messages, **kwargs):
+            yield chunk
+
+
+def pool(*servers: StubServer) -> tuple[PoolBackend, list[Endpoint]]:
+    endpoints = [Endpoint(f"http://gpu{i}:11434") for i in range(len(servers))]
+    backend = PoolBackend(endpoints)
+    backend._clients = {e.url: server for e, server in zip(endpoints, servers)}
+    return backend, endpoints
+
+
+async def stream_text(backend: PoolBackend) -> str:
+    return "".join([chunk["message"]["content"] async for chunk in backend.chat_stream(MODEL, MESSAGES)])
+
+
+UNREACHABLE = [ConnectionError("refused"), httpx.ConnectError("refused")]
+
+
+@pytest.mark.parametrize("error", UNREACHABLE)
+def test_chat_fails_over_from_an_unreachable_endpoint(error):
+    down, up = StubServer(error=error), StubServer()
+    backend, (first, second) = pool(down, up)
+    result = asyncio.run(backend.chat(MODEL, MESSAGES))
+    assert result["done"]
+    assert (down.calls, up.calls) == (1, 1)
+    assert not first.healthy and first.down_until > 0
+    assert second.healthy and MODEL in second.resident
+    assert first.in_flight == second.in_flight == 0
+
+
+@pytest.mark.parametrize("error", UNREACHABLE)
+def test_stream_fails_over_before_the_first_chunk(error):
+    down, up = StubServer(error=error), StubServer()
+    backend, (first, second) = pool(down, up)
+    assert asyncio.run(stream_text(backend))
+    assert not first.healthy
+    assert first.in_flight == second.in_flight == 0
+
+
+@pytest.mark.parametrize("call", ["chat", "stream"])
+def test_missing_model_fails_over_without_marking_the_endpoint_down(call):
+    missing, up = StubServer(error=ollama.ResponseError("model not found", 404)), StubServer()
+    backend, (first, _) = pool(missing, up)
+    if call == "chat":
+        asyncio.run(backend.chat(MODEL, MESSAGES))
+    else:
+        assert asyncio.run(stream_text(backend))
+    assert first.healthy
+    assert MODEL not in first.installed
+    assert not first.serves(MODEL)
+
+
+@pytest.mark.parametrize("call", ["chat", "stream"])
+def test_other_server_errors_are_not_retried(call):
+    broken, up = StubServer(error=ollama.ResponseError("out of memory", 500)), StubServer()
+    backend, _ = pool(broken, up)
+    with pytest.raises(ollama.ResponseError):
+        if call == "chat":
+            asyncio.run(backend.chat(MODEL, MESSAGES))
+        else:
+            asyncio.run(stream_text(backend))
+    assert up.calls == 0
+
+
+def test_no_endpoint_left():
+    backend, _ = pool(StubServer(error=ConnectionError()), StubServer(error=ConnectionError()))
+    with pytest.raises(NoEndpointError):
+        asyncio.run(backend.chat(MODEL, MESSAGES))
+    with pytest.raises(NoEndpointError):
+        asyncio.run(backend.chat(MODEL, MESSAGES))  # both are down now
+
+
+def test_calls_prefer_an_endpoint_with_the_model_loaded():
+    cold, warm = StubServer(), StubServer()
+    backend, (_, second) = pool(cold, warm)
+
+    async def run():
+        await backend._candidates(MODEL)  # first health check
+        second.resident.add(MODEL)
+        await backend.chat(MODEL, MESSAGES)
+
+    asyncio.run(run())
+    assert (cold.calls, warm.calls) == (0, 1)
+
+
+def test_only_endpoints_serving_the_model_are_used():
+    other, up = StubServer(installed=("qwen3:8b",)), StubServer()
+    backend, _ = pool(other, up)
+    asyncio.run(backend.chat(MODEL, MESSAGES))
+    assert (other.calls, up.calls) == (0, 1)
+
+
+def test_real_servers_fail_over_and_reuse_connections():
+    servers = [stub_server.StubServer(llm=fast_fake(model_sizes={MODEL: 1})).start() for _ in range(2)]
+    first, second = endpoints = [Endpoint(server.url) for server in servers]
+    backend = PoolBackend(endpoints)
+
+    async def run():
+        for _ in range(3):
+            await backend.chat(MODEL, MESSAGES)
+        servers[0].stop()
+        assert await backend.chat(MODEL, MESSAGES)
+        assert await stream_text(backend)
+
+    try:
+        asyncio.run(run())
+    finally:
+        servers[1].stop()
+    assert [server.llm.calls for server in servers] == [3, 2]
+    assert not first.healthy and second.healthy
+    # Health checks and every call on an endpoint share one keep-alive connection
+    assert [server.connections for server in servers] == [1, 1]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from src import backends
+from src.feedback import logged_feedback_entry
+from src.main import initialize_arena
+from src.rejudge import Judge, Panel, panel_voters, rejudge, write_rejudged
+from src.round_log import RoundLog, append_round
+from src.round_runner import run_round
+
+CRITICS = Panel(
+    name="critics",
+    judges=[
+        Judge(name="Critic", model="qwen3:8b", persona="A strict critic.", voting_criteria="Rigour."),
+        Judge(name="Fan", model="gemma3:12b", persona="An enthusiast.", voting_criteria="Energy."),
+    ],
+)
+
+
+@pytest.fixture
+def logged_rounds(arena_dir):
+    """Two rounds played on the fake backend, logged and read back."""
+    state = initialize_arena()
+    for question in ("Is it ever right to break a promise?", "What is a fair wage?"):
+        append_round(run_round(state, question))
+    return list(RoundLog.open().rounds())
+
+
+def test_outside_judges_rejudge_every_answer(logged_rounds, tmp_path):
+    llm = backends.get_fake_llm()
+    llm.calls = 0
+    rejudged = asyncio.run(rejudge(logged_rounds, CRITICS))
+
+    assert llm.calls == 2 * len(logged_rounds)
+    assert {"qwen3:8b", "gemma3:12b"} <= set(llm.resident)
+    for result, again in zip(logged_rounds, rejudged):
+        answered = {r.agent_id for r in result.responses}
+        assert again.round_number == result.round_number
+        assert again.original_tally == result.vote_tally
+        assert [v.voter_id for v in again.votes] == ["judge-1", "judge-2"]
+        assert {v.voted_for_id for v in again.votes} <= answered
+        assert sum(again.vote_tally.values()) == 2
+        assert again.metrics.calls == 2
+
+    path = write_rejudged(rejudged, CRITICS, tmp_path / "rejudge.jsonl")
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["round_number"] for line in lines] == [1, 2]
+    assert all(line["panel"] == "critics" and "winner_changed" in line for line in lines)
+
+
+def test_arena_voters_keep_their_ballots_on_another_model(logged_rounds):
+    panel = Panel(model="qwen3:8b", voting_criteria={"starter-1": "Brevity."})
+    result = logged_rounds[-1]
+    voters = panel_voters(panel, result)
+    everyone = [r.agent_id for r in result.responses]
+    assert [voter.personality_id for voter, _ in voters] == everyone
+    assert {voter.model for voter, _ in voters} == {"qwen3:8b"}
+    for voter, ballot in voters:
+        assert ballot == result.ballots.get(voter.personality_id, everyone)
+    assert next(v for v, _ in voters if v.personality_id == "starter-1").voting_criteria == "Brevity."
+
+    history = {r.round_number: logged_feedback_entry(r) for r in logged_rounds}
+    (again,) = asyncio.run(rejudge([result], panel, history))
+    assert {v.voter_id for v in again.votes} <= set(everyone)
+    assert sum(again.vote_tally.values()) == len(again.votes) > 0
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+from src import backends, ollama_client, round_runner
+from src.backends import FakeBackend
+from src.cache import ResponseCache
+from src.main import initialize_arena
+from src.ollama_client import ArenaClient, TokenPool, generate_response
+
+from .conftest import fast_fake, make_agent
+
+MESSAGES = [{"role": "user", "content": "What is courage?"}]
+
+
+def test_stream_is_cut_off_at_its_share_of_the_pool(client):
+    pool = TokenPool(10, calls=2)
+    response = asyncio.run(generate_response(client, make_agent("a", "Ada"), "Why?", "", token_pool=pool))
+    assert response.truncation_reason == "tokens"
+    assert response.metrics.calls == 1
+    assert response.metrics.eval_count == 5
+    assert (pool.remaining, pool.unclaimed) == (5, 1)
+
+
+def test_unused_tokens_go_back_to_the_pool(client):
+    pool = TokenPool(1000, calls=2)
+    response = asyncio.run(generate_response(client, make_agent("a", "Ada"), "Why?", "", token_pool=pool))
+    assert not response.truncated
+    left = 1000 - response.metrics.eval_count
+    assert pool.remaining == left
+    assert pool.claim() == left  # the last call gets everything the first didn't use
+
+
+def test_every_agent_gets_a_share_of_the_phase_pool(arena_dir, monkeypatch):
+    monkeypatch.setattr(backends, "_fake_llm", fast_fake(response_tokens=(200, 200)))
+    monkeypatch.setattr(round_runner, "RESPONSE_PHASE_MAX_TOKENS", 500)
+    state = initialize_arena()
+    result = round_runner.run_round(state, "What do we owe strangers?")
+
+    # 500 tokens for 5 agents: even the last one scheduled gets at least 100
+    assert all(r.content and r.metrics.eval_count >= 100 for r in result.responses)
+    assert sum(r.metrics.eval_count for r in result.responses) <= 500
+    assert any(r.truncation_reason == "tokens" for r in result.responses)
+
+
+def test_timed_out_stream_keeps_partial_metrics_and_is_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    llm = fast_fake(response_tokens=(200, 200))
+    llm.tokens_per_second = 200
+    client = ArenaClient(cache=cache, backend=FakeBackend(llm))
+
+    result = asyncio.run(client.chat_stream("phi4:14b", MESSAGES, time_budget=0.1))
+    assert result["done_reason"] == "timeout"
+    assert 0 < result["eval_count"] < 200
+    assert result["eval_duration"] > 0
+    assert result["message"]["content"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_cancelled_call_gives_its_shared_slot_back(client, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(ollama_client, "_shared_slots", slots)
+
+    async def run():
+        async with client._slot("phi4:14b"):
+            waiting = asyncio.create_task(client.chat("qwen3:8b", MESSAGES))
+            await asyncio.sleep(0.05)  # blocked on the shared slot in its thread
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+    asyncio.run(run())  # waits for the acquiring thread, which takes the slot and hands it back
+    assert slots.acquire(timeout=1)
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+from src import tracing
+from src.tracing import export_trace, span, summarize, traced
+
+
+@pytest.fixture
+def trace(monkeypatch):
+    """Tracing on, with no spans recorded yet."""
+    monkeypatch.setattr(tracing, "TRACING", True)
+    tracing.reset()
+    yield
+    tracing.reset()
+
+
+@traced
+def vote():
+    pass
+
+
+@traced
+async def respond(delay: float) -> float:
+    await asyncio.sleep(delay)
+    return delay
+
+
+def paths() -> list[tuple[str, ...]]:
+    return [row["path"] for row in summarize()]
+
+
+def test_disabled_spans_record_nothing(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING", False)
+    tracing.reset()
+    with span("round"):
+        vote()
+    assert summarize() == []
+
+
+def test_spans_nest(trace):
+    with span("round", number=1):
+        with span("voting"):
+            vote()
+            vote()
+    assert paths() == [("round",), ("round", "voting"), ("round", "voting", "vote")]
+    assert [row["calls"] for row in summarize()] == [1, 1, 2]
+
+
+def test_concurrent_tasks_nest_under_their_phase_in_lanes_of_their_own(trace):
+    async def phase():
+        with span("responses"):
+            return await asyncio.gather(respond(0.01), respond(0.02))
+
+    assert asyncio.run(phase()) == [0.01, 0.02]
+    assert paths() == [("responses",), ("responses", "respond")]
+    lanes = {e["lane"] for e in tracing._events if e["path"][-1] == "respond"}
+    assert len(lanes) == 2
+
+
+def test_chrome_trace_export(trace, tmp_path):
+    with span("round", number=3):
+        vote()
+
+    path = export_trace(tmp_path / "trace.json")
+    trace_json = json.loads(path.read_text())
+    assert trace_json["displayTimeUnit"] == "ms"
+    inner, outer = trace_json["traceEvents"]  # spans are recorded as they finish
+
+    assert outer["name"] == "round" and outer["args"] == {"number": 3, "path": "round"}
+    assert inner["name"] == "vote" and inner["cat"] == "round"
+    assert inner["args"]["path"] == "round > vote"
+    assert {event["ph"] for event in (inner, outer)} == {"X"}
+    assert inner["pid"] == outer["pid"] and inner["tid"] == outer["tid"]
+    # Timestamps are microseconds from reset(); the child lies within its parent
+    assert 0 <= outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
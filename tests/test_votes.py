@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from src.models import Agent, Response
+from src.ollama_client import generate_vote, resolve_vote_name
+
+from .conftest import make_agent
+
+
+def answer(agent: Agent) -> Response:
+    return Response(agent_id=agent.personality_id, agent_name=agent.name, model=agent.model, content="An answer.")
+
+
+def test_vote_goes_to_someone_else(client):
+    voter, other = make_agent("a", "Ada"), make_agent("b", "Boole")
+    vote = asyncio.run(generate_vote(client, voter, "Why?", [answer(voter), answer(other)], ""))
+    assert vote.voter_id == "a"
+    assert vote.voted_for_id == "b"
+    assert vote.metrics.calls == 1
+
+
+def test_voter_abstains_when_only_their_own_answer_is_on_the_ballot(client):
+    voter = make_agent("a", "Ada")
+    assert asyncio.run(generate_vote(client, voter, "Why?", [answer(voter)], "")) is None
+    assert client.backend.llm.calls == 0
+
+
+NAMES = {"Socrates": "starter-1", "Axiom": "starter-2", "Devil's Advocate": "gen-3-a1"}
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Socrates", "Socrates"),
+    ("  socrates. ", "Socrates"),
+    ("AXIOM!", "Axiom"),
+    ("devils advocate", "Devil's Advocate"),
+    ("starter-2", "Axiom"),
+    ("gen-3-a1", "Devil's Advocate"),
+    ("I vote for Socrates because", "Socrates"),
+    ("Socratse", "Socrates"),
+])
+def test_vote_names_are_resolved(raw, expected):
+    assert resolve_vote_name(raw, NAMES) == expected
+
+
+@pytest.mark.parametrize("raw", ["", "Nobody", "Socrates or Axiom", "Ax"])
+def test_unclear_vote_names_are_rejected(raw):
+    assert resolve_vote_name(raw, NAMES) is None
@@ -0,0 +1,93 @@
+from collections import Counter
+
+import pytest
+
+from src.main import initialize_arena
+from src.models import ArenaState
+from src.round_runner import run_round
+from src.voting import VOTING_MODES, assign_ballots, exposure, normalize_tally
+
+from .conftest import make_agent
+
+
+def arena(n: int, mode: str, ballot_size: int = 3) -> ArenaState:
+    agents = [make_agent(f"p{i}", f"Agent {i}") for i in range(n)]
+    return ArenaState(agents=agents, voting_mode=mode, ballot_size=ballot_size)
+
+
+def test_full_mode_shows_everyone_everything():
+    ballots = assign_ballots(arena(5, "full"), 1)
+    ids = [f"p{i}" for i in range(5)]
+    assert ballots == {voter: ids for voter in ids}
+    assert exposure(ballots) == pytest.approx({agent_id: 1.0 for agent_id in ids})
+    assert normalize_tally({"p1": 3, "p2": 2}, ballots) == pytest.approx({"p0": 0, "p1": 3, "p2": 2, "p3": 0, "p4": 0})
+
+
+@pytest.mark.parametrize("mode", ["subset", "pairwise", "swiss"])
+def test_small_arenas_always_vote_in_full(mode):
+    assert assign_ballots(arena(3, mode), 1) == assign_ballots(arena(3, "full"), 1)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        assign_ballots(arena(5, "ranked"), 1)
+
+
+def test_subset_puts_every_answer_on_ballot_size_ballots():
+    ballots = assign_ballots(arena(8, "subset", ballot_size=3), 4)
+    assert all(len(candidates) == 3 and voter not in candidates for voter, candidates in ballots.items())
+    assert set(Counter(c for candidates in ballots.values() for c in candidates).values()) == {3}
+    assert exposure(ballots) == pytest.approx({f"p{i}": 1.0 for i in range(8)})
+    assert ballots == assign_ballots(arena(8, "subset", ballot_size=3), 4)
+    assert ballots != assign_ballots(arena(8, "subset", ballot_size=3), 5)
+
+
+@pytest.mark.parametrize("mode", ["pairwise", "swiss"])
+@pytest.mark.parametrize("n", [4, 5, 6, 7, 9])
+def test_paired_modes_expose_every_answer_equally(mode, n):
+    ballots = assign_ballots(arena(n, mode), 2)
+    assert set(ballots) == {f"p{i}" for i in range(n)}
+    for voter, candidates in ballots.items():
+        assert len(candidates) == 2
+        assert voter not in candidates
+    # Every answer is on two ballots of two, odd arenas included, so a
+    # voteless round means the same thing for everyone
+    assert set(Counter(c for candidates in ballots.values() for c in candidates).values()) == {2}
+    assert exposure(ballots) == pytest.approx({f"p{i}": 1.0 for i in range(n)})
+
+
+def test_swiss_pairs_the_leaders():
+    state = arena(6, "swiss")
+    for i, agent in enumerate(state.agents):
+        agent.rounds_participated = 4
+        agent.normalized_votes_received = float(i)
+    ballots = assign_ballots(state, 3)
+    assert sorted(ballots["p0"]) == ["p4", "p5"]  # the trailers judge the top pair
+
+
+def test_tally_is_scaled_by_exposure():
+    # p0 and p1 judge the trio, whose three members judge the pair
+    ballots = {"p0": ["p2", "p3", "p4"], "p1": ["p2", "p3", "p4"], "p2": ["p0", "p1"], "p3": ["p0", "p1"], "p4": ["p0", "p1"]}
+    assert exposure(ballots) == pytest.approx({"p0": 1.5, "p1": 1.5, "p2": 2 / 3, "p3": 2 / 3, "p4": 2 / 3})
+    normalized = normalize_tally({"p0": 3, "p2": 1, "p3": 1}, ballots)
+    assert normalized == pytest.approx({"p0": 2.0, "p1": 0.0, "p2": 1.5, "p3": 1.5, "p4": 0.0})
+
+
+@pytest.mark.parametrize("mode", VOTING_MODES)
+def test_round_tally_in_each_mode(arena_dir, mode):
+    state = initialize_arena()
+    state.voting_mode = mode
+    ballots = assign_ballots(state, 1)
+    result = run_round(state, "Is a lie ever kind?")
+
+    assert len(result.votes) == len(state.agents)
+    for vote in result.votes:
+        assert vote.voted_for_id in ballots[vote.voter_id]
+        assert vote.voted_for_id != vote.voter_id
+
+    tally = Counter(vote.voted_for_id for vote in result.votes)
+    normalized = normalize_tally(tally, ballots)
+    for agent in state.agents:
+        assert agent.total_votes_received == tally[agent.personality_id]
+        assert agent.normalized_votes_received == pytest.approx(normalized.get(agent.personality_id, 0.0))
+        assert agent.rounds_without_votes == (0 if tally[agent.personality_id] else 1)